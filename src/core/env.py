@@ -0,0 +1,45 @@
+"""Process-wide environment loading.
+
+Loads ~/.env.shared and then the local .env (which can override) exactly once,
+and exposes the settings other modules read at import time.
+"""
+
+import functools
+import os
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+
+@functools.cache
+def load_env() -> None:
+    """Load environment variables once: shared first, then local overrides."""
+    shared_env = Path.home() / ".env.shared"
+    if shared_env.exists():
+        load_dotenv(shared_env)
+    load_dotenv()  # Local .env can override
+
+
+load_env()
+
+ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY", "")
+GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY", "")
+# Submit build generations through the Message Batches API (cheaper, slower)
+ANTHROPIC_USE_BATCH = os.getenv("ANTHROPIC_USE_BATCH") == "1"
+# Plan new-project scaffolds (blueprint, tech stack, structure) in one Claude call
+SCAFFOLD_SINGLE_CALL = os.getenv("SCAFFOLD_SINGLE_CALL") == "1"
+# Models for scaffolding's tech stack decision and structure calls
+SCAFFOLD_TECH_STACK_MODEL = os.getenv("SCAFFOLD_TECH_STACK_MODEL", "claude-haiku-4-5-20251001")
+SCAFFOLD_STRUCTURE_MODEL = os.getenv("SCAFFOLD_STRUCTURE_MODEL", "claude-haiku-4-5-20251001")
+# Write each build's generated files as one project.tar instead of a file tree
+BUILD_OUTPUT_TAR = os.getenv("BUILD_OUTPUT_TAR") == "1"
+# Cosine similarity at which a new idea reuses a near-duplicate's enrichment from
+# the same submitter (opt-in, e.g. 0.92; the default 0 disables it)
+ENRICHMENT_SEMANTIC_CACHE_THRESHOLD = float(
+    os.getenv("ENRICHMENT_SEMANTIC_CACHE_THRESHOLD", "0")
+)
+
+RESEND_API_KEY = os.getenv("RESEND_API_KEY")
+NOTIFY_EMAIL = os.getenv("NOTIFY_EMAIL")
+FROM_EMAIL = os.getenv("FROM_EMAIL", "Idea Factory <notifications@resend.dev>")
+SLACK_WEBHOOK_URL = os.getenv("SLACK_WEBHOOK_URL")
@@ -5,6 +5,7 @@ These models define the contracts between pipeline stages.
 
 from datetime import datetime
 from enum import Enum
+from functools import cached_property
 from typing import Literal
 
 from pydantic import BaseModel, Field, model_validator
@@ -349,6 +350,15 @@ class EnrichmentResult(BaseModel):
     enriched_at: datetime
     enriched_by: str
 
+    @cached_property
+    def summary(self) -> str:
+        """Short summary for HIL gate notifications."""
+        return (
+            f"Title: {self.enhanced_title}\n"
+            f"Problem: {self.problem_statement}\n"
+            f"Description: {self.enhanced_description[:200]}..."
+        )
+
 
 class ProjectAnalysisResult(BaseModel):
     """Project analysis result record (for existing projects)."""
@@ -387,6 +397,15 @@ class EvaluationResult(BaseModel):
     evaluated_at: datetime
     evaluated_by: str
 
+    @cached_property
+    def summary(self) -> str:
+        """Short summary for HIL gate notifications."""
+        return (
+            f"Score: {self.overall_score}/100\n"
+            f"Recommendation: {self.recommendation.value.upper()}\n"
+            f"Rationale: {self.recommendation_rationale}"
+        )
+
 
 class HumanReview(BaseModel):
     """Human review record."""
@@ -415,6 +434,15 @@ class ScaffoldingResult(BaseModel):
     new_files: list[NewFileSpec] = Field(default_factory=list)
     preserved_files: list[str] = Field(default_factory=list)
 
+    @cached_property
+    def summary(self) -> str:
+        """Short summary for HIL gate notifications."""
+        return (
+            f"Tech Stack: {', '.join(self.tech_stack[:5])}\n"
+            f"Estimated Hours: {self.estimated_hours or 'N/A'}\n"
+            f"Blueprint preview: {self.blueprint_content[:200]}..."
+        )
+
 
 class BuildResult(BaseModel):
     """Build result record."""
@@ -4,6 +4,7 @@ Defines valid transitions and enforces pipeline rules.
 """
 
 from dataclasses import dataclass
+from functools import cache
 
 from .models import ProjectMode, ReviewDecision, Stage, Status
 
@@ -16,9 +17,9 @@ class StateKey:
     status: Status
 
 
-@dataclass
+@dataclass(frozen=True)
 class TransitionResult:
-    """Result of a state transition attempt."""
+    """Result of a state transition attempt (immutable, so results can be shared)."""
 
     success: bool
     new_stage: Stage | None = None
@@ -106,25 +107,72 @@ VALID_TRANSITIONS: dict[StateKey, list[StateKey]] = {
     ],
 }
 
+# Review decision -> target state (applied from HUMAN_REVIEW/AWAITING_REVIEW).
+# APPROVE maps to scaffolding; the orchestrator picks building at the second gate.
+REVIEW_DECISION_TARGETS: dict[ReviewDecision, StateKey] = {
+    ReviewDecision.APPROVE: StateKey(Stage.SCAFFOLDING, Status.PROCESSING),
+    ReviewDecision.REFINE: StateKey(Stage.ENRICHMENT, Status.PROCESSING),
+    ReviewDecision.REJECT: StateKey(Stage.ARCHIVED, Status.COMPLETED),
+    ReviewDecision.DEFER: StateKey(Stage.HUMAN_REVIEW, Status.PAUSED),
+}
+
 # Stages that require human review before advancing
 HIL_GATE_STAGES = {Stage.EVALUATION, Stage.SCAFFOLDING}
 
+# Flattened (from_stage, from_status, to_stage, to_status) set for O(1) checks
+_VALID_TRANSITION_SET: frozenset[tuple[Stage, Status, Stage, Status]] = frozenset(
+    (source.stage, source.status, target.stage, target.status)
+    for source, targets in VALID_TRANSITIONS.items()
+    for target in targets
+)
+
+
+# The transition table is fixed and the domain is a few enum tuples, so every
+# decision (including the error message) is computed once
+@cache
+def _transition_result(
+    from_stage: Stage, from_status: Status, to_stage: Stage, to_status: Status
+) -> TransitionResult:
+    """Decide a transition against VALID_TRANSITIONS."""
+    if (from_stage, from_status, to_stage, to_status) not in _VALID_TRANSITION_SET:
+        valid = VALID_TRANSITIONS.get(StateKey(from_stage, from_status), [])
+        valid_str = ", ".join(f"({s.stage.value}, {s.status.value})" for s in valid)
+        return TransitionResult(
+            success=False,
+            error=f"Invalid transition from ({from_stage.value}, {from_status.value}) "
+            f"to ({to_stage.value}, {to_status.value}). "
+            f"Valid transitions: [{valid_str}]",
+        )
+
+    return TransitionResult(success=True, new_stage=to_stage, new_status=to_status)
+
+
+@cache
+def _review_result(current_stage: Stage, decision: ReviewDecision) -> TransitionResult:
+    """Decide a review decision's transition (fixed per stage and decision, like transitions)."""
+    if current_stage != Stage.HUMAN_REVIEW:
+        return TransitionResult(
+            success=False, error=f"Cannot apply review decision in stage {current_stage.value}"
+        )
+
+    target = REVIEW_DECISION_TARGETS[decision]
+    return _transition_result(
+        Stage.HUMAN_REVIEW, Status.AWAITING_REVIEW, target.stage, target.status
+    )
+
 
 class StateMachine:
     """Pipeline state machine for managing idea progression."""
 
     def __init__(self) -> None:
         self.transitions = VALID_TRANSITIONS
+        self._valid = _VALID_TRANSITION_SET
 
     def can_transition(
         self, from_stage: Stage, from_status: Status, to_stage: Stage, to_status: Status
     ) -> bool:
         """Check if a transition is valid."""
-        from_key = StateKey(from_stage, from_status)
-        to_key = StateKey(to_stage, to_status)
-
-        valid_targets = self.transitions.get(from_key, [])
-        return to_key in valid_targets
+        return (from_stage, from_status, to_stage, to_status) in self._valid
 
     def get_valid_transitions(self, stage: Stage, status: Status) -> list[StateKey]:
         """Get all valid transitions from current state."""
@@ -135,44 +183,13 @@ class StateMachine:
         self, from_stage: Stage, from_status: Status, to_stage: Stage, to_status: Status
     ) -> TransitionResult:
         """Attempt a state transition."""
-        if not self.can_transition(from_stage, from_status, to_stage, to_status):
-            valid = self.get_valid_transitions(from_stage, from_status)
-            valid_str = ", ".join(f"({s.stage.value}, {s.status.value})" for s in valid)
-            return TransitionResult(
-                success=False,
-                error=f"Invalid transition from ({from_stage.value}, {from_status.value}) "
-                f"to ({to_stage.value}, {to_status.value}). "
-                f"Valid transitions: [{valid_str}]",
-            )
-
-        return TransitionResult(success=True, new_stage=to_stage, new_status=to_status)
+        return _transition_result(from_stage, from_status, to_stage, to_status)
 
     def apply_review_decision(
         self, current_stage: Stage, decision: ReviewDecision
     ) -> TransitionResult:
         """Apply a human review decision and return the resulting transition."""
-        if current_stage != Stage.HUMAN_REVIEW:
-            return TransitionResult(
-                success=False, error=f"Cannot apply review decision in stage {current_stage.value}"
-            )
-
-        # Map decisions to target states
-        decision_map: dict[ReviewDecision, StateKey] = {
-            ReviewDecision.APPROVE: StateKey(
-                Stage.SCAFFOLDING
-                if current_stage == Stage.HUMAN_REVIEW
-                else Stage.BUILDING,  # Context-dependent
-                Status.PROCESSING,
-            ),
-            ReviewDecision.REFINE: StateKey(Stage.ENRICHMENT, Status.PROCESSING),
-            ReviewDecision.REJECT: StateKey(Stage.ARCHIVED, Status.COMPLETED),
-            ReviewDecision.DEFER: StateKey(Stage.HUMAN_REVIEW, Status.PAUSED),
-        }
-
-        target = decision_map[decision]
-        return self.transition(
-            Stage.HUMAN_REVIEW, Status.AWAITING_REVIEW, target.stage, target.status
-        )
+        return _review_result(current_stage, decision)
 
     def requires_hil_gate(self, stage: Stage) -> bool:
         """Check if stage requires human review before advancing."""
@@ -3,13 +3,18 @@
 Provides async data access layer using aiosqlite.
 """
 
+import asyncio
 import json
-from datetime import datetime
+import sqlite3
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any
 from uuid import uuid4
 
 import aiosqlite
+import orjson
 
 from ..core.models import (
     ArchitecturePattern,
@@ -45,6 +50,327 @@ from ..core.models import (
 DB_PATH = Path(__file__).parent.parent.parent / "data" / "idea-factory.db"
 SCHEMA_PATH = Path(__file__).parent / "schema.sql"
 
+# Size of sqlite3's per-connection prepared statement cache. The SQL below is
+# kept in module-level constants so every call hands sqlite3 the same string
+# and hits that cache instead of re-preparing.
+STATEMENT_CACHE_SIZE = 256
+
+# =============================================================================
+# SQL statements
+# =============================================================================
+
+USER_COLUMNS = "id, email, name, role, terms_accepted_at, created_at, updated_at"
+
+SQL_INSERT_USER = """
+    INSERT INTO users (id, email, name, role, created_at, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+SQL_GET_USER = f"SELECT {USER_COLUMNS} FROM users WHERE id = ?"
+SQL_GET_USER_BY_EMAIL = f"SELECT {USER_COLUMNS} FROM users WHERE email = ?"
+SQL_UPDATE_USER = """
+    UPDATE users SET email = ?, name = ?, updated_at = ?
+    WHERE id = ?
+"""
+SQL_ACCEPT_TERMS = """
+    UPDATE users SET terms_accepted_at = ?, updated_at = ?
+    WHERE id = ?
+"""
+SQL_LIST_USERS = (
+    f"SELECT {USER_COLUMNS} FROM users ORDER BY created_at DESC LIMIT ? OFFSET ?"
+)
+
+IDEA_COLUMNS = (
+    "id, title, raw_content, tags, current_stage, current_status, submitted_at, "
+    "updated_at, mode, project_source, preferred_tech_stack, submitted_by"
+)
+
+SQL_INSERT_IDEA = f"""
+    INSERT INTO ideas ({IDEA_COLUMNS})
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+SQL_GET_IDEA = f"SELECT {IDEA_COLUMNS} FROM ideas WHERE id = ?"
+SQL_LIST_IDEAS = f"SELECT {IDEA_COLUMNS} FROM ideas WHERE 1=1"
+SQL_LIST_IDEAS_BY_USER = f"SELECT {IDEA_COLUMNS} FROM ideas WHERE submitted_by = ?"
+SQL_FILTER_STAGE = " AND current_stage = ?"
+SQL_FILTER_STATUS = " AND current_status = ?"
+SQL_ORDER_IDEAS = " ORDER BY submitted_at DESC LIMIT ? OFFSET ?"
+SQL_UPDATE_IDEA_STATE = """
+    UPDATE ideas SET current_stage = ?, current_status = ?, updated_at = ?
+    WHERE id = ?
+"""
+SQL_CAS_IDEA_STATE = f"""
+    UPDATE ideas SET current_stage = ?, current_status = ?, updated_at = ?
+    WHERE id = ? AND current_stage = ? AND current_status = ?
+    RETURNING {IDEA_COLUMNS}
+"""
+SQL_INSERT_TRANSITION = """
+    INSERT INTO state_transitions (id, idea_id, from_stage, from_status, to_stage, to_status, triggered_by, created_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+ENRICHMENT_COLUMNS = (
+    "idea_id, enhanced_title, enhanced_description, problem_statement, "
+    "potential_solutions, market_context, enriched_at, enriched_by"
+)
+
+SQL_SAVE_ENRICHMENT = f"""
+    INSERT OR REPLACE INTO enrichment_results ({ENRICHMENT_COLUMNS})
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+SQL_GET_ENRICHMENT = f"SELECT {ENRICHMENT_COLUMNS} FROM enrichment_results WHERE idea_id = ?"
+
+PROJECT_ANALYSIS_COLUMNS = (
+    "idea_id, project_name, detected_tech_stack, detected_patterns, total_files, "
+    "key_files, entry_points, completion_gaps, completeness_score, "
+    "enhancement_opportunities, architecture_quality_score, readme_summary, "
+    "existing_blueprint, constraints, analyzed_at, analyzed_by"
+)
+
+SQL_SAVE_PROJECT_ANALYSIS = f"""
+    INSERT OR REPLACE INTO project_analysis_results ({PROJECT_ANALYSIS_COLUMNS})
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+SQL_GET_PROJECT_ANALYSIS = (
+    f"SELECT {PROJECT_ANALYSIS_COLUMNS} FROM project_analysis_results WHERE idea_id = ?"
+)
+
+EVALUATION_COLUMNS = (
+    "idea_id, jtbd_analysis, disruption_potential, disruption_score, capabilities_fit, "
+    "recommendation, recommendation_rationale, key_risks, case_study_matches, "
+    "overall_score, evaluated_at, evaluated_by"
+)
+
+SQL_SAVE_EVALUATION = f"""
+    INSERT OR REPLACE INTO evaluation_results ({EVALUATION_COLUMNS})
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+SQL_GET_EVALUATION = f"SELECT {EVALUATION_COLUMNS} FROM evaluation_results WHERE idea_id = ?"
+
+REVIEW_COLUMNS = "id, idea_id, stage, decision, decision_rationale, reviewer, reviewed_at"
+
+SQL_SAVE_REVIEW = f"""
+    INSERT INTO human_reviews ({REVIEW_COLUMNS})
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+SQL_GET_REVIEWS = (
+    f"SELECT {REVIEW_COLUMNS} FROM human_reviews WHERE idea_id = ? ORDER BY reviewed_at"
+)
+
+SCAFFOLDING_COLUMNS = (
+    "idea_id, blueprint_content, project_structure, tech_stack, estimated_hours, "
+    "scaffolded_at, scaffolded_by, file_modifications, new_files, preserved_files"
+)
+
+SQL_SAVE_SCAFFOLDING = f"""
+    INSERT OR REPLACE INTO scaffolding_results ({SCAFFOLDING_COLUMNS})
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+SQL_GET_SCAFFOLDING = f"SELECT {SCAFFOLDING_COLUMNS} FROM scaffolding_results WHERE idea_id = ?"
+SQL_HAS_SCAFFOLDING = "SELECT 1 FROM scaffolding_results WHERE idea_id = ? LIMIT 1"
+
+SQL_SAVE_BUILD = """
+    INSERT OR REPLACE INTO build_results
+    (idea_id, github_repo, artifacts, outcome, started_at, completed_at)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+SQL_UPDATE_BUILD_STORAGE = """
+    UPDATE build_results
+    SET google_drive_url = ?, google_drive_file_id = ?
+    WHERE idea_id = ?
+"""
+# SELECT * because databases created before the google_drive_* columns lack them
+SQL_GET_BUILD = "SELECT * FROM build_results WHERE idea_id = ?"
+
+TRANSITION_COLUMNS = (
+    "id, idea_id, from_stage, from_status, to_stage, to_status, triggered_by, "
+    "metadata, created_at"
+)
+
+SQL_GET_TRANSITIONS = (
+    f"SELECT {TRANSITION_COLUMNS} FROM state_transitions WHERE idea_id = ? ORDER BY created_at"
+)
+
+SQL_REBUILD_STAGE_COUNTS = """
+    DELETE FROM stage_counts;
+    INSERT INTO stage_counts (stage, count)
+    SELECT current_stage, COUNT(*) FROM ideas GROUP BY current_stage;
+"""
+SQL_INCREMENT_STAGE_COUNT = """
+    INSERT INTO stage_counts (stage, count) VALUES (?, 1)
+    ON CONFLICT(stage) DO UPDATE SET count = count + 1
+"""
+SQL_DECREMENT_STAGE_COUNT = "UPDATE stage_counts SET count = count - 1 WHERE stage = ?"
+SQL_GET_STAGE_COUNTS = "SELECT stage, count FROM stage_counts WHERE count > 0"
+
+SQL_GET_CACHED_RESPONSE = """
+    SELECT response_content FROM llm_cache WHERE cache_key = ? AND created_at >= ?
+"""
+SQL_TOUCH_CACHED_RESPONSE = """
+    UPDATE llm_cache SET hit_count = hit_count + 1, last_hit_at = ? WHERE cache_key = ?
+"""
+SQL_SAVE_CACHED_RESPONSE = """
+    INSERT OR REPLACE INTO llm_cache
+    (cache_key, model, prompt_hash, response_content, created_at, hit_count)
+    VALUES (?, ?, ?, ?, ?, 0)
+"""
+
+
+# =============================================================================
+# Row factories
+# =============================================================================
+# sqlite3 row factories that build models straight from positional tuples.
+# Column order must match the *_COLUMNS constants above.
+
+# Value -> member maps so hydration is a plain dict hit instead of Enum.__call__
+_STAGE_MAP: dict[str, Stage] = {m.value: m for m in Stage}
+_STATUS_MAP: dict[str, Status] = {m.value: m for m in Status}
+_DECISION_MAP: dict[str, ReviewDecision] = {m.value: m for m in ReviewDecision}
+_MODE_MAP: dict[str, ProjectMode] = {m.value: m for m in ProjectMode}
+_ROLE_MAP: dict[str, UserRole] = {m.value: m for m in UserRole}
+
+
+def _user_factory(cursor: sqlite3.Cursor, row: tuple) -> User:
+    """Build a User from a USER_COLUMNS row."""
+    return User(
+        id=row[0],
+        email=row[1],
+        name=row[2],
+        role=_ROLE_MAP[row[3]] if row[3] else UserRole.COLLABORATOR,
+        terms_accepted_at=datetime.fromisoformat(row[4]) if row[4] else None,
+        created_at=datetime.fromisoformat(row[5]),
+        updated_at=datetime.fromisoformat(row[6]),
+    )
+
+
+def _idea_factory(cursor: sqlite3.Cursor, row: tuple) -> Idea:
+    """Build an Idea from an IDEA_COLUMNS row."""
+    # Parse project_source if present
+    project_source = None
+    if row[9]:
+        source_data = json.loads(row[9])
+        project_source = ProjectSource(
+            source_type=SourceType(source_data["source_type"]),
+            location=source_data["location"],
+            branch=source_data.get("branch"),
+            subdirectory=source_data.get("subdirectory"),
+        )
+
+    return Idea(
+        id=row[0],
+        title=row[1],
+        raw_content=row[2],
+        tags=orjson.loads(row[3]),
+        current_stage=_STAGE_MAP[row[4]],
+        current_status=_STATUS_MAP[row[5]],
+        submitted_at=datetime.fromisoformat(row[6]),
+        updated_at=datetime.fromisoformat(row[7]),
+        mode=_MODE_MAP[row[8]] if row[8] else ProjectMode.NEW,
+        project_source=project_source,
+        preferred_tech_stack=json.loads(row[10]) if row[10] else None,
+        submitted_by=row[11],
+    )
+
+
+def _enrichment_factory(cursor: sqlite3.Cursor, row: tuple) -> EnrichmentResult:
+    """Build an EnrichmentResult from an ENRICHMENT_COLUMNS row."""
+    return EnrichmentResult(
+        idea_id=row[0],
+        enhanced_title=row[1],
+        enhanced_description=row[2],
+        problem_statement=row[3],
+        potential_solutions=json.loads(row[4]),
+        market_context=row[5],
+        enriched_at=datetime.fromisoformat(row[6]),
+        enriched_by=row[7],
+    )
+
+
+def _project_analysis_factory(cursor: sqlite3.Cursor, row: tuple) -> ProjectAnalysisResult:
+    """Build a ProjectAnalysisResult from a PROJECT_ANALYSIS_COLUMNS row."""
+    return ProjectAnalysisResult(
+        idea_id=row[0],
+        project_name=row[1],
+        detected_tech_stack=json.loads(row[2]),
+        detected_patterns=[ArchitecturePattern(**p) for p in json.loads(row[3])],
+        total_files=row[4],
+        key_files=[FileAnalysis(**f) for f in json.loads(row[5])],
+        entry_points=json.loads(row[6]),
+        completion_gaps=[CompletionGap(**g) for g in json.loads(row[7] or "[]")],
+        completeness_score=row[8],
+        enhancement_opportunities=[
+            EnhancementOpportunity(**o) for o in json.loads(row[9] or "[]")
+        ],
+        architecture_quality_score=row[10],
+        readme_summary=row[11],
+        existing_blueprint=row[12],
+        constraints=json.loads(row[13]),
+        analyzed_at=datetime.fromisoformat(row[14]),
+        analyzed_by=row[15],
+    )
+
+
+def _evaluation_factory(cursor: sqlite3.Cursor, row: tuple) -> EvaluationResult:
+    """Build an EvaluationResult from an EVALUATION_COLUMNS row."""
+    return EvaluationResult(
+        idea_id=row[0],
+        jtbd_analysis=row[1],
+        disruption_potential=row[2],
+        disruption_score=row[3],
+        capabilities_fit=row[4],
+        recommendation=row[5],
+        recommendation_rationale=row[6],
+        key_risks=orjson.loads(row[7]),
+        case_study_matches=json.loads(row[8]),
+        overall_score=row[9],
+        evaluated_at=datetime.fromisoformat(row[10]),
+        evaluated_by=row[11],
+    )
+
+
+def _scaffolding_factory(cursor: sqlite3.Cursor, row: tuple) -> ScaffoldingResult:
+    """Build a ScaffoldingResult from a SCAFFOLDING_COLUMNS row."""
+    return ScaffoldingResult(
+        idea_id=row[0],
+        blueprint_content=row[1],
+        project_structure=json.loads(row[2]),
+        tech_stack=json.loads(row[3]),
+        estimated_hours=row[4],
+        scaffolded_at=datetime.fromisoformat(row[5]),
+        scaffolded_by=row[6],
+        # Only existing-project scaffolds have these
+        file_modifications=[FileModification(**m) for m in json.loads(row[7] or "[]")],
+        new_files=[NewFileSpec(**f) for f in json.loads(row[8] or "[]")],
+        preserved_files=json.loads(row[9] or "[]"),
+    )
+
+
+def _review_factory(cursor: sqlite3.Cursor, row: tuple) -> HumanReview:
+    """Build a HumanReview from a REVIEW_COLUMNS row."""
+    return HumanReview(
+        id=row[0],
+        idea_id=row[1],
+        stage=_STAGE_MAP[row[2]],
+        decision=_DECISION_MAP[row[3]],
+        decision_rationale=row[4],
+        reviewer=row[5],
+        reviewed_at=datetime.fromisoformat(row[6]),
+    )
+
+
+def _transition_factory(cursor: sqlite3.Cursor, row: tuple) -> StateTransition:
+    """Build a StateTransition from a TRANSITION_COLUMNS row."""
+    return StateTransition(
+        id=row[0],
+        idea_id=row[1],
+        from_stage=_STAGE_MAP[row[2]],
+        from_status=_STATUS_MAP[row[3]],
+        to_stage=_STAGE_MAP[row[4]],
+        to_status=_STATUS_MAP[row[5]],
+        triggered_by=row[6],
+        metadata=json.loads(row[7]) if row[7] else None,
+        created_at=datetime.fromisoformat(row[8]),
+    )
+
 
 class Repository:
     """Async database repository."""
@@ -52,16 +378,25 @@ class Repository:
     def __init__(self, db_path: Path = DB_PATH) -> None:
         self.db_path = db_path
         self._db: aiosqlite.Connection | None = None
+        # All tasks share one connection, so writes take turns: each write
+        # method or transaction() block commits before the next one starts
+        self._write_lock = asyncio.Lock()
+        self._transaction_task: asyncio.Task[Any] | None = None
 
     async def connect(self) -> None:
         """Connect to database and initialize schema."""
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        self._db = await aiosqlite.connect(self.db_path)
+        self._db = await aiosqlite.connect(
+            self.db_path, cached_statements=STATEMENT_CACHE_SIZE
+        )
         self._db.row_factory = aiosqlite.Row
 
         # Initialize schema
         schema_sql = SCHEMA_PATH.read_text()
         await self._db.executescript(schema_sql)
+
+        # Resync stage counts once per connect; kept incrementally after that
+        await self._db.executescript(SQL_REBUILD_STAGE_COUNTS)
         await self._db.commit()
 
     async def close(self) -> None:
@@ -77,6 +412,49 @@ class Repository:
             raise RuntimeError("Database not connected. Call connect() first.")
         return self._db
 
+    @asynccontextmanager
+    async def _write(self) -> AsyncIterator[None]:
+        """Run one write method's statements under the write lock and commit them.
+
+        Inside transaction() the statements join the open transaction instead.
+        """
+        if self._transaction_task is asyncio.current_task():
+            yield
+            return
+        async with self._write_lock:
+            try:
+                yield
+            except BaseException:
+                await self.db.rollback()
+                raise
+            await self.db.commit()
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[None]:
+        """Run a group of writes as one SQLite transaction.
+
+        Usage:
+            async with repo.transaction():
+                await repo.save_enrichment(...)
+                await repo.update_idea_state(...)
+
+        Everything commits together on exit, or rolls back if the block
+        raises. Other tasks' writes wait until it finishes, so issue the writes
+        from this task (not through gather) and keep slow work outside it.
+        """
+        async with self._write_lock:
+            self._transaction_task = asyncio.current_task()
+            try:
+                await self.db.execute("BEGIN")
+                yield
+            except BaseException:
+                await self.db.rollback()
+                raise
+            else:
+                await self.db.commit()
+            finally:
+                self._transaction_task = None
+
     # =========================================================================
     # Users
     # =========================================================================
@@ -91,20 +469,17 @@ class Repository:
         """Create a new user."""
         now = datetime.utcnow().isoformat()
 
-        await self.db.execute(
-            """
-            INSERT INTO users (id, email, name, role, created_at, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?)
-            """,
-            (user_id, email, name, role, now, now),
-        )
-        await self.db.commit()
+        async with self._write():
+            await self.db.execute(
+                SQL_INSERT_USER,
+                (user_id, email, name, role, now, now),
+            )
 
         return User(
             id=user_id,
             email=email,
             name=name,
-            role=UserRole(role),
+            role=_ROLE_MAP[role],
             terms_accepted_at=None,
             created_at=datetime.fromisoformat(now),
             updated_at=datetime.fromisoformat(now),
@@ -112,23 +487,15 @@ class Repository:
 
     async def get_user(self, user_id: str) -> User | None:
         """Get user by ID."""
-        async with self.db.execute(
-            "SELECT * FROM users WHERE id = ?", (user_id,)
-        ) as cursor:
-            row = await cursor.fetchone()
-            if not row:
-                return None
-            return self._row_to_user(row)
+        async with self.db.execute(SQL_GET_USER, (user_id,)) as cursor:
+            cursor.row_factory = _user_factory
+            return await cursor.fetchone()
 
     async def get_user_by_email(self, email: str) -> User | None:
         """Get user by email."""
-        async with self.db.execute(
-            "SELECT * FROM users WHERE email = ?", (email,)
-        ) as cursor:
-            row = await cursor.fetchone()
-            if not row:
-                return None
-            return self._row_to_user(row)
+        async with self.db.execute(SQL_GET_USER_BY_EMAIL, (email,)) as cursor:
+            cursor.row_factory = _user_factory
+            return await cursor.fetchone()
 
     async def update_user(
         self,
@@ -145,14 +512,11 @@ class Repository:
         new_email = email if email is not None else user.email
         new_name = name if name is not None else user.name
 
-        await self.db.execute(
-            """
-            UPDATE users SET email = ?, name = ?, updated_at = ?
-            WHERE id = ?
-            """,
-            (new_email, new_name, now, user_id),
-        )
-        await self.db.commit()
+        async with self._write():
+            await self.db.execute(
+                SQL_UPDATE_USER,
+                (new_email, new_name, now, user_id),
+            )
 
         return await self.get_user(user_id)
 
@@ -164,37 +528,16 @@ class Repository:
 
         now = datetime.utcnow().isoformat()
 
-        await self.db.execute(
-            """
-            UPDATE users SET terms_accepted_at = ?, updated_at = ?
-            WHERE id = ?
-            """,
-            (now, now, user_id),
-        )
-        await self.db.commit()
+        async with self._write():
+            await self.db.execute(SQL_ACCEPT_TERMS, (now, now, user_id))
 
         return await self.get_user(user_id)
 
     async def list_users(self, limit: int = 100, offset: int = 0) -> list[User]:
         """List all users."""
-        async with self.db.execute(
-            "SELECT * FROM users ORDER BY created_at DESC LIMIT ? OFFSET ?",
-            (limit, offset),
-        ) as cursor:
-            rows = await cursor.fetchall()
-            return [self._row_to_user(row) for row in rows]
-
-    def _row_to_user(self, row: aiosqlite.Row) -> User:
-        """Convert database row to User model."""
-        return User(
-            id=row["id"],
-            email=row["email"],
-            name=row["name"],
-            role=UserRole(row["role"]) if row["role"] else UserRole.COLLABORATOR,
-            terms_accepted_at=datetime.fromisoformat(row["terms_accepted_at"]) if row["terms_accepted_at"] else None,
-            created_at=datetime.fromisoformat(row["created_at"]),
-            updated_at=datetime.fromisoformat(row["updated_at"]),
-        )
+        async with self.db.execute(SQL_LIST_USERS, (limit, offset)) as cursor:
+            cursor.row_factory = _user_factory
+            return list(await cursor.fetchall())
 
     # =========================================================================
     # Ideas
@@ -215,27 +558,25 @@ class Repository:
         if input_data.preferred_tech_stack:
             preferred_tech_stack_json = json.dumps(input_data.preferred_tech_stack)
 
-        await self.db.execute(
-            """
-            INSERT INTO ideas (id, title, raw_content, tags, current_stage, current_status, submitted_at, updated_at, mode, project_source, preferred_tech_stack, submitted_by)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                idea_id,
-                input_data.title,
-                input_data.raw_content,
-                json.dumps(input_data.tags),
-                Stage.INPUT.value,
-                Status.PENDING.value,
-                now,
-                now,
-                input_data.mode.value,
-                project_source_json,
-                preferred_tech_stack_json,
-                submitted_by,
-            ),
-        )
-        await self.db.commit()
+        async with self._write():
+            await self.db.execute(
+                SQL_INSERT_IDEA,
+                (
+                    idea_id,
+                    input_data.title,
+                    input_data.raw_content,
+                    orjson.dumps(input_data.tags),
+                    Stage.INPUT.value,
+                    Status.PENDING.value,
+                    now,
+                    now,
+                    input_data.mode.value,
+                    project_source_json,
+                    preferred_tech_stack_json,
+                    submitted_by,
+                ),
+            )
+            await self.db.execute(SQL_INCREMENT_STAGE_COUNT, (Stage.INPUT.value,))
 
         return Idea(
             id=idea_id,
@@ -254,11 +595,9 @@ class Repository:
 
     async def get_idea(self, idea_id: str) -> Idea | None:
         """Get idea by ID."""
-        async with self.db.execute("SELECT * FROM ideas WHERE id = ?", (idea_id,)) as cursor:
-            row = await cursor.fetchone()
-            if not row:
-                return None
-            return self._row_to_idea(row)
+        async with self.db.execute(SQL_GET_IDEA, (idea_id,)) as cursor:
+            cursor.row_factory = _idea_factory
+            return await cursor.fetchone()
 
     async def list_ideas(
         self,
@@ -268,22 +607,22 @@ class Repository:
         offset: int = 0,
     ) -> list[Idea]:
         """List ideas with optional filtering."""
-        query = "SELECT * FROM ideas WHERE 1=1"
+        query = SQL_LIST_IDEAS
         params: list[Any] = []
 
         if stage:
-            query += " AND current_stage = ?"
+            query += SQL_FILTER_STAGE
             params.append(stage.value)
         if status:
-            query += " AND current_status = ?"
+            query += SQL_FILTER_STATUS
             params.append(status.value)
 
-        query += " ORDER BY submitted_at DESC LIMIT ? OFFSET ?"
+        query += SQL_ORDER_IDEAS
         params.extend([limit, offset])
 
         async with self.db.execute(query, params) as cursor:
-            rows = await cursor.fetchall()
-            return [self._row_to_idea(row) for row in rows]
+            cursor.row_factory = _idea_factory
+            return list(await cursor.fetchall())
 
     async def update_idea_state(
         self, idea_id: str, stage: Stage, status: Status, triggered_by: str = "system"
@@ -295,68 +634,91 @@ class Repository:
 
         now = datetime.utcnow().isoformat()
 
-        # Update idea
-        await self.db.execute(
-            """
-            UPDATE ideas SET current_stage = ?, current_status = ?, updated_at = ?
-            WHERE id = ?
-            """,
-            (stage.value, status.value, now, idea_id),
-        )
+        async with self._write():
+            # Update idea
+            await self.db.execute(
+                SQL_UPDATE_IDEA_STATE, (stage.value, status.value, now, idea_id)
+            )
 
-        # Record transition
-        await self.db.execute(
-            """
-            INSERT INTO state_transitions (id, idea_id, from_stage, from_status, to_stage, to_status, triggered_by, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                str(uuid4()),
-                idea_id,
-                idea.current_stage.value,
-                idea.current_status.value,
-                stage.value,
-                status.value,
-                triggered_by,
-                now,
-            ),
-        )
-        await self.db.commit()
+            # Record transition
+            await self.db.execute(
+                SQL_INSERT_TRANSITION,
+                (
+                    str(uuid4()),
+                    idea_id,
+                    idea.current_stage.value,
+                    idea.current_status.value,
+                    stage.value,
+                    status.value,
+                    triggered_by,
+                    now,
+                ),
+            )
+
+            # Move the idea between stage buckets
+            if idea.current_stage != stage:
+                await self.db.execute(SQL_DECREMENT_STAGE_COUNT, (idea.current_stage.value,))
+                await self.db.execute(SQL_INCREMENT_STAGE_COUNT, (stage.value,))
 
         return await self.get_idea(idea_id)
 
-    def _row_to_idea(self, row: aiosqlite.Row) -> Idea:
-        """Convert database row to Idea model."""
-        # Parse project_source if present
-        project_source = None
-        if row["project_source"]:
-            source_data = json.loads(row["project_source"])
-            project_source = ProjectSource(
-                source_type=SourceType(source_data["source_type"]),
-                location=source_data["location"],
-                branch=source_data.get("branch"),
-                subdirectory=source_data.get("subdirectory"),
+    async def cas_update_stage(
+        self,
+        idea_id: str,
+        expected_stage: Stage,
+        expected_status: Status,
+        stage: Stage,
+        status: Status,
+        triggered_by: str = "system",
+    ) -> Idea | None:
+        """Move an idea to a new state only if it is still in the expected one.
+
+        The check and the update are a single UPDATE ... RETURNING, so there is
+        no read beforehand and no window for a concurrent transition.
+
+        Returns:
+            The updated idea, or None if it doesn't exist or has moved on
+        """
+        now = datetime.utcnow().isoformat()
+
+        async with self._write():
+            async with self.db.execute(
+                SQL_CAS_IDEA_STATE,
+                (
+                    stage.value,
+                    status.value,
+                    now,
+                    idea_id,
+                    expected_stage.value,
+                    expected_status.value,
+                ),
+            ) as cursor:
+                cursor.row_factory = _idea_factory
+                idea = await cursor.fetchone()
+            if idea is None:
+                return None
+
+            # Record transition
+            await self.db.execute(
+                SQL_INSERT_TRANSITION,
+                (
+                    str(uuid4()),
+                    idea_id,
+                    expected_stage.value,
+                    expected_status.value,
+                    stage.value,
+                    status.value,
+                    triggered_by,
+                    now,
+                ),
             )
 
-        # Parse preferred_tech_stack if present
-        preferred_tech_stack = None
-        if row["preferred_tech_stack"]:
-            preferred_tech_stack = json.loads(row["preferred_tech_stack"])
+            # Move the idea between stage buckets
+            if expected_stage != stage:
+                await self.db.execute(SQL_DECREMENT_STAGE_COUNT, (expected_stage.value,))
+                await self.db.execute(SQL_INCREMENT_STAGE_COUNT, (stage.value,))
 
-        return Idea(
-            id=row["id"],
-            title=row["title"],
-            raw_content=row["raw_content"],
-            tags=json.loads(row["tags"]),
-            current_stage=Stage(row["current_stage"]),
-            current_status=Status(row["current_status"]),
-            submitted_at=datetime.fromisoformat(row["submitted_at"]),
-            updated_at=datetime.fromisoformat(row["updated_at"]),
-            mode=ProjectMode(row["mode"]) if row["mode"] else ProjectMode.NEW,
-            project_source=project_source,
-            preferred_tech_stack=preferred_tech_stack,
-            submitted_by=row["submitted_by"],
-        )
+        return idea
 
     async def list_ideas_by_user(
         self,
@@ -367,22 +729,22 @@ class Repository:
         offset: int = 0,
     ) -> list[Idea]:
         """List ideas submitted by a specific user."""
-        query = "SELECT * FROM ideas WHERE submitted_by = ?"
+        query = SQL_LIST_IDEAS_BY_USER
         params: list[Any] = [user_id]
 
         if stage:
-            query += " AND current_stage = ?"
+            query += SQL_FILTER_STAGE
             params.append(stage.value)
         if status:
-            query += " AND current_status = ?"
+            query += SQL_FILTER_STATUS
             params.append(status.value)
 
-        query += " ORDER BY submitted_at DESC LIMIT ? OFFSET ?"
+        query += SQL_ORDER_IDEAS
         params.extend([limit, offset])
 
         async with self.db.execute(query, params) as cursor:
-            rows = await cursor.fetchall()
-            return [self._row_to_idea(row) for row in rows]
+            cursor.row_factory = _idea_factory
+            return list(await cursor.fetchall())
 
     # =========================================================================
     # Enrichment Results
@@ -392,24 +754,20 @@ class Repository:
         """Save enrichment result."""
         now = datetime.utcnow().isoformat()
 
-        await self.db.execute(
-            """
-            INSERT OR REPLACE INTO enrichment_results
-            (idea_id, enhanced_title, enhanced_description, problem_statement, potential_solutions, market_context, enriched_at, enriched_by)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                idea_id,
-                output.enhanced_title,
-                output.enhanced_description,
-                output.problem_statement,
-                json.dumps(output.potential_solutions),
-                output.market_context,
-                now,
-                "gemini-1.5-flash",
-            ),
-        )
-        await self.db.commit()
+        async with self._write():
+            await self.db.execute(
+                SQL_SAVE_ENRICHMENT,
+                (
+                    idea_id,
+                    output.enhanced_title,
+                    output.enhanced_description,
+                    output.problem_statement,
+                    json.dumps(output.potential_solutions),
+                    output.market_context,
+                    now,
+                    "gemini-1.5-flash",
+                ),
+            )
 
         return EnrichmentResult(
             idea_id=idea_id,
@@ -424,22 +782,9 @@ class Repository:
 
     async def get_enrichment(self, idea_id: str) -> EnrichmentResult | None:
         """Get enrichment result for an idea."""
-        async with self.db.execute(
-            "SELECT * FROM enrichment_results WHERE idea_id = ?", (idea_id,)
-        ) as cursor:
-            row = await cursor.fetchone()
-            if not row:
-                return None
-            return EnrichmentResult(
-                idea_id=row["idea_id"],
-                enhanced_title=row["enhanced_title"],
-                enhanced_description=row["enhanced_description"],
-                problem_statement=row["problem_statement"],
-                potential_solutions=json.loads(row["potential_solutions"]),
-                market_context=row["market_context"],
-                enriched_at=datetime.fromisoformat(row["enriched_at"]),
-                enriched_by=row["enriched_by"],
-            )
+        async with self.db.execute(SQL_GET_ENRICHMENT, (idea_id,)) as cursor:
+            cursor.row_factory = _enrichment_factory
+            return await cursor.fetchone()
 
     # =========================================================================
     # Project Analysis Results (for existing projects)
@@ -451,35 +796,28 @@ class Repository:
         """Save project analysis result."""
         now = datetime.utcnow().isoformat()
 
-        await self.db.execute(
-            """
-            INSERT OR REPLACE INTO project_analysis_results
-            (idea_id, project_name, detected_tech_stack, detected_patterns, total_files,
-             key_files, entry_points, completion_gaps, completeness_score,
-             enhancement_opportunities, architecture_quality_score, readme_summary,
-             existing_blueprint, constraints, analyzed_at, analyzed_by)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                idea_id,
-                output.project_name,
-                json.dumps(output.detected_tech_stack),
-                json.dumps([p.model_dump() for p in output.detected_patterns]),
-                output.total_files,
-                json.dumps([f.model_dump() for f in output.key_files]),
-                json.dumps(output.entry_points),
-                json.dumps([g.model_dump() for g in output.completion_gaps]),
-                output.completeness_score,
-                json.dumps([o.model_dump() for o in output.enhancement_opportunities]),
-                output.architecture_quality_score,
-                output.readme_summary,
-                output.existing_blueprint,
-                json.dumps(output.constraints),
-                now,
-                "claude-sonnet-4",
-            ),
-        )
-        await self.db.commit()
+        async with self._write():
+            await self.db.execute(
+                SQL_SAVE_PROJECT_ANALYSIS,
+                (
+                    idea_id,
+                    output.project_name,
+                    json.dumps(output.detected_tech_stack),
+                    json.dumps([p.model_dump() for p in output.detected_patterns]),
+                    output.total_files,
+                    json.dumps([f.model_dump() for f in output.key_files]),
+                    json.dumps(output.entry_points),
+                    json.dumps([g.model_dump() for g in output.completion_gaps]),
+                    output.completeness_score,
+                    json.dumps([o.model_dump() for o in output.enhancement_opportunities]),
+                    output.architecture_quality_score,
+                    output.readme_summary,
+                    output.existing_blueprint,
+                    json.dumps(output.constraints),
+                    now,
+                    "claude-sonnet-4",
+                ),
+            )
 
         return ProjectAnalysisResult(
             idea_id=idea_id,
@@ -502,44 +840,9 @@ class Repository:
 
     async def get_project_analysis(self, idea_id: str) -> ProjectAnalysisResult | None:
         """Get project analysis result for an idea."""
-        async with self.db.execute(
-            "SELECT * FROM project_analysis_results WHERE idea_id = ?", (idea_id,)
-        ) as cursor:
-            row = await cursor.fetchone()
-            if not row:
-                return None
-
-            # Parse JSON fields back to models
-            patterns_data = json.loads(row["detected_patterns"])
-            patterns = [ArchitecturePattern(**p) for p in patterns_data]
-
-            key_files_data = json.loads(row["key_files"])
-            key_files = [FileAnalysis(**f) for f in key_files_data]
-
-            gaps_data = json.loads(row["completion_gaps"]) if row["completion_gaps"] else []
-            gaps = [CompletionGap(**g) for g in gaps_data]
-
-            opps_data = json.loads(row["enhancement_opportunities"]) if row["enhancement_opportunities"] else []
-            opportunities = [EnhancementOpportunity(**o) for o in opps_data]
-
-            return ProjectAnalysisResult(
-                idea_id=row["idea_id"],
-                project_name=row["project_name"],
-                detected_tech_stack=json.loads(row["detected_tech_stack"]),
-                detected_patterns=patterns,
-                total_files=row["total_files"],
-                key_files=key_files,
-                entry_points=json.loads(row["entry_points"]),
-                completion_gaps=gaps,
-                completeness_score=row["completeness_score"],
-                enhancement_opportunities=opportunities,
-                architecture_quality_score=row["architecture_quality_score"],
-                readme_summary=row["readme_summary"],
-                existing_blueprint=row["existing_blueprint"],
-                constraints=json.loads(row["constraints"]),
-                analyzed_at=datetime.fromisoformat(row["analyzed_at"]),
-                analyzed_by=row["analyzed_by"],
-            )
+        async with self.db.execute(SQL_GET_PROJECT_ANALYSIS, (idea_id,)) as cursor:
+            cursor.row_factory = _project_analysis_factory
+            return await cursor.fetchone()
 
     # =========================================================================
     # Evaluation Results
@@ -549,30 +852,24 @@ class Repository:
         """Save evaluation result."""
         now = datetime.utcnow().isoformat()
 
-        await self.db.execute(
-            """
-            INSERT OR REPLACE INTO evaluation_results
-            (idea_id, jtbd_analysis, disruption_potential, disruption_score, capabilities_fit,
-             recommendation, recommendation_rationale, key_risks, case_study_matches, overall_score,
-             evaluated_at, evaluated_by)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                idea_id,
-                output.jtbd_analysis,
-                output.disruption_potential,
-                output.scores.disruption_score,
-                output.capabilities_fit.value,
-                output.recommendation.value,
-                output.recommendation_rationale,
-                json.dumps(output.key_risks),
-                json.dumps(output.case_study_matches),
-                output.scores.overall_score,
-                now,
-                "christensen-mcp",
-            ),
-        )
-        await self.db.commit()
+        async with self._write():
+            await self.db.execute(
+                SQL_SAVE_EVALUATION,
+                (
+                    idea_id,
+                    output.jtbd_analysis,
+                    output.disruption_potential,
+                    output.scores.disruption_score,
+                    output.capabilities_fit.value,
+                    output.recommendation.value,
+                    output.recommendation_rationale,
+                    orjson.dumps(output.key_risks),
+                    json.dumps(output.case_study_matches),
+                    output.scores.overall_score,
+                    now,
+                    "christensen-mcp",
+                ),
+            )
 
         return EvaluationResult(
             idea_id=idea_id,
@@ -591,26 +888,9 @@ class Repository:
 
     async def get_evaluation(self, idea_id: str) -> EvaluationResult | None:
         """Get evaluation result for an idea."""
-        async with self.db.execute(
-            "SELECT * FROM evaluation_results WHERE idea_id = ?", (idea_id,)
-        ) as cursor:
-            row = await cursor.fetchone()
-            if not row:
-                return None
-            return EvaluationResult(
-                idea_id=row["idea_id"],
-                jtbd_analysis=row["jtbd_analysis"],
-                disruption_potential=row["disruption_potential"],
-                disruption_score=row["disruption_score"],
-                capabilities_fit=row["capabilities_fit"],
-                recommendation=row["recommendation"],
-                recommendation_rationale=row["recommendation_rationale"],
-                key_risks=json.loads(row["key_risks"]),
-                case_study_matches=json.loads(row["case_study_matches"]),
-                overall_score=row["overall_score"],
-                evaluated_at=datetime.fromisoformat(row["evaluated_at"]),
-                evaluated_by=row["evaluated_by"],
-            )
+        async with self.db.execute(SQL_GET_EVALUATION, (idea_id,)) as cursor:
+            cursor.row_factory = _evaluation_factory
+            return await cursor.fetchone()
 
     # =========================================================================
     # Human Reviews
@@ -628,14 +908,11 @@ class Repository:
         review_id = str(uuid4())
         now = datetime.utcnow().isoformat()
 
-        await self.db.execute(
-            """
-            INSERT INTO human_reviews (id, idea_id, stage, decision, decision_rationale, reviewer, reviewed_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
-            (review_id, idea_id, stage.value, decision.value, rationale, reviewer, now),
-        )
-        await self.db.commit()
+        async with self._write():
+            await self.db.execute(
+                SQL_SAVE_REVIEW,
+                (review_id, idea_id, stage.value, decision.value, rationale, reviewer, now),
+            )
 
         return HumanReview(
             id=review_id,
@@ -647,24 +924,34 @@ class Repository:
             reviewed_at=datetime.fromisoformat(now),
         )
 
+    async def apply_review_atomic(
+        self,
+        idea_id: str,
+        stage: Stage,
+        decision: ReviewDecision,
+        rationale: str | None = None,
+        reviewer: str = "human",
+        new_stage: Stage | None = None,
+        new_status: Status | None = None,
+    ) -> Idea | None:
+        """Save a review and, if given, the state it moves the idea to, in one transaction.
+
+        Returns:
+            The idea after the review (updated when new_stage/new_status are given)
+        """
+        async with self.transaction():
+            await self.save_review(idea_id, stage, decision, rationale, reviewer)
+            if new_stage is not None and new_status is not None:
+                return await self.update_idea_state(
+                    idea_id, new_stage, new_status, triggered_by=reviewer
+                )
+        return await self.get_idea(idea_id)
+
     async def get_reviews(self, idea_id: str) -> list[HumanReview]:
         """Get all reviews for an idea."""
-        async with self.db.execute(
-            "SELECT * FROM human_reviews WHERE idea_id = ? ORDER BY reviewed_at", (idea_id,)
-        ) as cursor:
-            rows = await cursor.fetchall()
-            return [
-                HumanReview(
-                    id=row["id"],
-                    idea_id=row["idea_id"],
-                    stage=Stage(row["stage"]),
-                    decision=ReviewDecision(row["decision"]),
-                    decision_rationale=row["decision_rationale"],
-                    reviewer=row["reviewer"],
-                    reviewed_at=datetime.fromisoformat(row["reviewed_at"]),
-                )
-                for row in rows
-            ]
+        async with self.db.execute(SQL_GET_REVIEWS, (idea_id,)) as cursor:
+            cursor.row_factory = _review_factory
+            return list(await cursor.fetchall())
 
     # =========================================================================
     # Scaffolding Results
@@ -681,27 +968,22 @@ class Repository:
         new_files_json = json.dumps([f.model_dump() for f in output.new_files]) if output.new_files else None
         preserved_json = json.dumps(output.preserved_files) if output.preserved_files else None
 
-        await self.db.execute(
-            """
-            INSERT OR REPLACE INTO scaffolding_results
-            (idea_id, blueprint_content, project_structure, tech_stack, estimated_hours,
-             scaffolded_at, scaffolded_by, file_modifications, new_files, preserved_files)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                idea_id,
-                output.blueprint_content,
-                json.dumps(output.project_structure),
-                json.dumps(output.tech_stack),
-                output.estimated_hours,
-                now,
-                "claude-sonnet-4",
-                file_mods_json,
-                new_files_json,
-                preserved_json,
-            ),
-        )
-        await self.db.commit()
+        async with self._write():
+            await self.db.execute(
+                SQL_SAVE_SCAFFOLDING,
+                (
+                    idea_id,
+                    output.blueprint_content,
+                    json.dumps(output.project_structure),
+                    json.dumps(output.tech_stack),
+                    output.estimated_hours,
+                    now,
+                    "claude-sonnet-4",
+                    file_mods_json,
+                    new_files_json,
+                    preserved_json,
+                ),
+            )
 
         return ScaffoldingResult(
             idea_id=idea_id,
@@ -716,42 +998,16 @@ class Repository:
             preserved_files=output.preserved_files,
         )
 
+    async def has_scaffolding(self, idea_id: str) -> bool:
+        """Check whether an idea has a scaffolding result without loading it."""
+        async with self.db.execute(SQL_HAS_SCAFFOLDING, (idea_id,)) as cursor:
+            return await cursor.fetchone() is not None
+
     async def get_scaffolding(self, idea_id: str) -> ScaffoldingResult | None:
         """Get scaffolding result for an idea."""
-        async with self.db.execute(
-            "SELECT * FROM scaffolding_results WHERE idea_id = ?", (idea_id,)
-        ) as cursor:
-            row = await cursor.fetchone()
-            if not row:
-                return None
-
-            # Parse existing project fields if present
-            file_modifications = []
-            if row["file_modifications"]:
-                mods_data = json.loads(row["file_modifications"])
-                file_modifications = [FileModification(**m) for m in mods_data]
-
-            new_files = []
-            if row["new_files"]:
-                files_data = json.loads(row["new_files"])
-                new_files = [NewFileSpec(**f) for f in files_data]
-
-            preserved_files = []
-            if row["preserved_files"]:
-                preserved_files = json.loads(row["preserved_files"])
-
-            return ScaffoldingResult(
-                idea_id=row["idea_id"],
-                blueprint_content=row["blueprint_content"],
-                project_structure=json.loads(row["project_structure"]),
-                tech_stack=json.loads(row["tech_stack"]),
-                estimated_hours=row["estimated_hours"],
-                scaffolded_at=datetime.fromisoformat(row["scaffolded_at"]),
-                scaffolded_by=row["scaffolded_by"],
-                file_modifications=file_modifications,
-                new_files=new_files,
-                preserved_files=preserved_files,
-            )
+        async with self.db.execute(SQL_GET_SCAFFOLDING, (idea_id,)) as cursor:
+            cursor.row_factory = _scaffolding_factory
+            return await cursor.fetchone()
 
     # =========================================================================
     # Build Results
@@ -763,22 +1019,18 @@ class Repository:
         """Save build result."""
         now = datetime.utcnow().isoformat()
 
-        await self.db.execute(
-            """
-            INSERT OR REPLACE INTO build_results
-            (idea_id, github_repo, artifacts, outcome, started_at, completed_at)
-            VALUES (?, ?, ?, ?, ?, ?)
-            """,
-            (
-                idea_id,
-                output.github_repo,
-                json.dumps(output.artifacts),
-                output.outcome,
-                started_at.isoformat(),
-                now,
-            ),
-        )
-        await self.db.commit()
+        async with self._write():
+            await self.db.execute(
+                SQL_SAVE_BUILD,
+                (
+                    idea_id,
+                    output.github_repo,
+                    orjson.dumps(output.artifacts),
+                    output.outcome,
+                    started_at.isoformat(),
+                    now,
+                ),
+            )
 
         return BuildResult(
             idea_id=idea_id,
@@ -793,15 +1045,10 @@ class Repository:
         self, idea_id: str, drive_url: str, drive_file_id: str
     ) -> BuildResult | None:
         """Update build result with Google Drive info (legacy)."""
-        await self.db.execute(
-            """
-            UPDATE build_results
-            SET google_drive_url = ?, google_drive_file_id = ?
-            WHERE idea_id = ?
-            """,
-            (drive_url, drive_file_id, idea_id),
-        )
-        await self.db.commit()
+        async with self._write():
+            await self.db.execute(
+                SQL_UPDATE_BUILD_STORAGE, (drive_url, drive_file_id, idea_id)
+            )
         return await self.get_build(idea_id)
 
     async def update_build_storage_info(
@@ -811,29 +1058,22 @@ class Repository:
 
         Reuses the google_drive_* columns for backward compatibility.
         """
-        await self.db.execute(
-            """
-            UPDATE build_results
-            SET google_drive_url = ?, google_drive_file_id = ?
-            WHERE idea_id = ?
-            """,
-            (download_url, storage_key, idea_id),
-        )
-        await self.db.commit()
+        async with self._write():
+            await self.db.execute(
+                SQL_UPDATE_BUILD_STORAGE, (download_url, storage_key, idea_id)
+            )
         return await self.get_build(idea_id)
 
     async def get_build(self, idea_id: str) -> BuildResult | None:
         """Get build result for an idea."""
-        async with self.db.execute(
-            "SELECT * FROM build_results WHERE idea_id = ?", (idea_id,)
-        ) as cursor:
+        async with self.db.execute(SQL_GET_BUILD, (idea_id,)) as cursor:
             row = await cursor.fetchone()
             if not row:
                 return None
             return BuildResult(
                 idea_id=row["idea_id"],
                 github_repo=row["github_repo"],
-                artifacts=json.loads(row["artifacts"]) if row["artifacts"] else [],
+                artifacts=orjson.loads(row["artifacts"]) if row["artifacts"] else [],
                 outcome=row["outcome"],
                 started_at=datetime.fromisoformat(row["started_at"]),
                 completed_at=datetime.fromisoformat(row["completed_at"]) if row["completed_at"] else None,
@@ -847,36 +1087,47 @@ class Repository:
 
     async def get_transitions(self, idea_id: str) -> list[StateTransition]:
         """Get state transition history for an idea."""
-        async with self.db.execute(
-            "SELECT * FROM state_transitions WHERE idea_id = ? ORDER BY created_at", (idea_id,)
-        ) as cursor:
-            rows = await cursor.fetchall()
-            return [
-                StateTransition(
-                    id=row["id"],
-                    idea_id=row["idea_id"],
-                    from_stage=Stage(row["from_stage"]),
-                    from_status=Status(row["from_status"]),
-                    to_stage=Stage(row["to_stage"]),
-                    to_status=Status(row["to_status"]),
-                    triggered_by=row["triggered_by"],
-                    metadata=json.loads(row["metadata"]) if row["metadata"] else None,
-                    created_at=datetime.fromisoformat(row["created_at"]),
-                )
-                for row in rows
-            ]
+        async with self.db.execute(SQL_GET_TRANSITIONS, (idea_id,)) as cursor:
+            cursor.row_factory = _transition_factory
+            return list(await cursor.fetchall())
 
     # =========================================================================
     # Statistics
     # =========================================================================
 
     async def get_stage_counts(self) -> dict[str, int]:
-        """Get count of ideas by stage."""
+        """Get count of ideas by stage (from the stage_counts sidecar table)."""
+        async with self.db.execute(SQL_GET_STAGE_COUNTS) as cursor:
+            rows = await cursor.fetchall()
+            return {row["stage"]: row["count"] for row in rows}
+
+    # =========================================================================
+    # LLM Response Cache
+    # =========================================================================
+
+    async def get_cached_response(self, cache_key: str, max_age: timedelta) -> str | None:
+        """Get a cached LLM response no older than max_age, recording the hit."""
+        now = datetime.utcnow()
         async with self.db.execute(
-            "SELECT current_stage, COUNT(*) as count FROM ideas GROUP BY current_stage"
+            SQL_GET_CACHED_RESPONSE, (cache_key, (now - max_age).isoformat())
         ) as cursor:
-            rows = await cursor.fetchall()
-            return {row["current_stage"]: row["count"] for row in rows}
+            row = await cursor.fetchone()
+        if not row:
+            return None
+
+        async with self._write():
+            await self.db.execute(SQL_TOUCH_CACHED_RESPONSE, (now.isoformat(), cache_key))
+        return row["response_content"]
+
+    async def save_cached_response(
+        self, cache_key: str, model: str, prompt_hash: str, content: str
+    ) -> None:
+        """Store (or refresh) a cached LLM response."""
+        async with self._write():
+            await self.db.execute(
+                SQL_SAVE_CACHED_RESPONSE,
+                (cache_key, model, prompt_hash, content, datetime.utcnow().isoformat()),
+            )
 
 
 # Singleton instance
@@ -19,7 +19,7 @@ CREATE TABLE IF NOT EXISTS ideas (
     id TEXT PRIMARY KEY,
     title TEXT NOT NULL,
     raw_content TEXT NOT NULL,
-    tags TEXT DEFAULT '[]',  -- JSON array
+    tags BLOB DEFAULT '[]',  -- JSON array (UTF-8 bytes)
     current_stage TEXT NOT NULL DEFAULT 'input',
     current_status TEXT NOT NULL DEFAULT 'pending',
     submitted_at TEXT NOT NULL,
@@ -73,7 +73,7 @@ CREATE TABLE IF NOT EXISTS evaluation_results (
     capabilities_fit TEXT NOT NULL,  -- 'strong', 'developing', 'missing'
     recommendation TEXT NOT NULL,     -- 'develop', 'refine', 'reject', 'defer'
     recommendation_rationale TEXT NOT NULL,
-    key_risks TEXT NOT NULL,          -- JSON array
+    key_risks BLOB NOT NULL,          -- JSON array (UTF-8 bytes)
     case_study_matches TEXT NOT NULL, -- JSON array
     overall_score REAL NOT NULL,
     evaluated_at TEXT NOT NULL,
@@ -113,7 +113,7 @@ CREATE TABLE IF NOT EXISTS scaffolding_results (
 CREATE TABLE IF NOT EXISTS build_results (
     idea_id TEXT PRIMARY KEY,
     github_repo TEXT,
-    artifacts TEXT,                   -- JSON array of artifact paths
+    artifacts BLOB,                   -- JSON array of artifact paths (UTF-8 bytes)
     outcome TEXT,                     -- 'success', 'partial', 'failed'
     started_at TEXT NOT NULL,
     completed_at TEXT,
@@ -136,6 +136,12 @@ CREATE TABLE IF NOT EXISTS state_transitions (
     FOREIGN KEY (idea_id) REFERENCES ideas(id) ON DELETE CASCADE
 );
 
+-- Idea counts per stage (maintained by the repository on create/transition)
+CREATE TABLE IF NOT EXISTS stage_counts (
+    stage TEXT PRIMARY KEY,
+    count INTEGER NOT NULL DEFAULT 0
+);
+
 -- LLM response cache
 CREATE TABLE IF NOT EXISTS llm_cache (
     cache_key TEXT PRIMARY KEY,
@@ -153,5 +159,8 @@ CREATE INDEX IF NOT EXISTS idx_ideas_status ON ideas(current_status);
 CREATE INDEX IF NOT EXISTS idx_ideas_submitted_by ON ideas(submitted_by);
 CREATE INDEX IF NOT EXISTS idx_transitions_idea ON state_transitions(idea_id);
 CREATE INDEX IF NOT EXISTS idx_reviews_idea ON human_reviews(idea_id);
+-- Briefly created for a score-only read that had no callers; drop it so
+-- databases that have it stop paying for it on every evaluation write
+DROP INDEX IF EXISTS idx_evaluation_scores;
 CREATE INDEX IF NOT EXISTS idx_cache_model ON llm_cache(model);
 CREATE INDEX IF NOT EXISTS idx_users_email ON users(email);
@@ -3,14 +3,24 @@
 Uploads completed builds to S3 and generates presigned download URLs.
 """
 
+import asyncio
+import functools
 import io
 import logging
 import os
+import shutil
+import threading
+import time
 import zipfile
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import timedelta
 from pathlib import Path
 
 import boto3
+import botocore.session
+from boto3.s3.transfer import TransferConfig
 from botocore.config import Config
 from botocore.exceptions import ClientError
 
@@ -19,6 +29,121 @@ logger = logging.getLogger(__name__)
 # Default presigned URL expiration (7 days)
 DEFAULT_URL_EXPIRATION = timedelta(days=7)
 
+# Multipart transfer defaults (S3 requires >= 5 MiB for all but the last part)
+DEFAULT_MULTIPART_THRESHOLD = 8 * 1024 * 1024
+DEFAULT_PART_SIZE = 16 * 1024 * 1024
+DEFAULT_MAX_CONCURRENCY = 10
+
+# Keep-alive pool size for the shared client; should cover max_concurrency
+DEFAULT_POOL_CONNECTIONS = 20
+
+# Deflate level for build zips; level 1 is far faster than zlib's default 6 for a similar ratio
+DEFAULT_ZIP_LEVEL = 1
+
+# Presigned URLs are reused until half their lifetime has passed
+PRESIGNED_URL_CACHE_SIZE = 4096
+
+# Read/copy buffer for streamed zip entries (zipfile's default copy buffer is 8 KiB)
+ZIP_COPY_BUFFER_SIZE = 1024 * 1024
+
+
+@dataclass(frozen=True, slots=True)
+class _S3Config:
+    """S3 settings resolved from the environment."""
+
+    bucket_name: str | None
+    region: str
+    url_expiration_days: int
+    multipart_threshold: int
+    part_size: int
+    max_concurrency: int
+    pool_connections: int
+    zip_level: int
+
+
+@functools.cache
+def _load_s3_config() -> _S3Config:
+    """Read S3 settings from the environment once per process."""
+    env = os.environ
+    return _S3Config(
+        bucket_name=env.get("S3_BUCKET_NAME"),
+        region=env.get("AWS_REGION", "us-east-1"),
+        url_expiration_days=int(env.get("S3_URL_EXPIRATION_DAYS", "7")),
+        multipart_threshold=int(env.get("S3_MULTIPART_THRESHOLD", DEFAULT_MULTIPART_THRESHOLD)),
+        part_size=int(env.get("S3_PART_SIZE", DEFAULT_PART_SIZE)),
+        max_concurrency=int(env.get("S3_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY)),
+        pool_connections=int(env.get("S3_POOL", DEFAULT_POOL_CONNECTIONS)),
+        zip_level=int(env.get("ZIP_LEVEL", DEFAULT_ZIP_LEVEL)),
+    )
+
+
+def _read_file(path: str) -> bytes:
+    """Read one file for the archive (run in a worker thread)."""
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def _write_streamed(zf: zipfile.ZipFile, path: str, arcname: str, level: int) -> None:
+    """Stream a large file into the archive through a 1 MiB read/copy buffer."""
+    zinfo = zipfile.ZipInfo.from_file(path, arcname, strict_timestamps=False)
+    zinfo.compress_type = zipfile.ZIP_DEFLATED
+    # Public since Python 3.13; older versions deflate this entry at zlib's default level
+    if hasattr(zipfile.ZipInfo, "compress_level"):
+        zinfo.compress_level = level
+    with (
+        open(path, "rb", buffering=ZIP_COPY_BUFFER_SIZE) as src,
+        zf.open(zinfo, "w", force_zip64=True) as dst,
+    ):
+        shutil.copyfileobj(src, dst, ZIP_COPY_BUFFER_SIZE)
+
+
+class _PartUploader(io.RawIOBase):
+    """Writable stream that ships buffered bytes to S3 as multipart parts.
+
+    Memory stays at roughly one part regardless of the total archive size.
+    """
+
+    def __init__(self, client, bucket: str, key: str, upload_id: str, part_size: int):
+        self._client = client
+        self._bucket = bucket
+        self._key = key
+        self._upload_id = upload_id
+        self._part_size = part_size
+        self._buffer = bytearray()
+        self._position = 0
+        self.parts: list[dict] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def write(self, data) -> int:
+        self._buffer += data
+        self._position += len(data)
+        while len(self._buffer) >= self._part_size:
+            self._upload_part(bytes(self._buffer[: self._part_size]))
+            del self._buffer[: self._part_size]
+        return len(data)
+
+    def flush_final(self) -> None:
+        """Upload whatever is left in the buffer as the last part."""
+        if self._buffer or not self.parts:
+            self._upload_part(bytes(self._buffer))
+            self._buffer.clear()
+
+    def _upload_part(self, body: bytes) -> None:
+        part_number = len(self.parts) + 1
+        response = self._client.upload_part(
+            Bucket=self._bucket,
+            Key=self._key,
+            PartNumber=part_number,
+            UploadId=self._upload_id,
+            Body=body,
+        )
+        self.parts.append({"PartNumber": part_number, "ETag": response["ETag"]})
+
 
 class S3StorageService:
     """Service for uploading builds to S3."""
@@ -26,11 +151,17 @@ class S3StorageService:
     def __init__(self):
         """Initialize S3 service."""
         self._client = None
-        self._bucket_name = os.environ.get("S3_BUCKET_NAME")
-        self._region = os.environ.get("AWS_REGION", "us-east-1")
-        self._url_expiration = int(
-            os.environ.get("S3_URL_EXPIRATION_DAYS", "7")
+        self._config = _load_s3_config()
+        self._transfer_config = TransferConfig(
+            multipart_threshold=self._config.multipart_threshold,
+            multipart_chunksize=self._config.part_size,
+            max_concurrency=self._config.max_concurrency,
+            use_threads=True,
         )
+        # (key, expiration_seconds) -> (epoch_bucket, url). The async variants run
+        # on worker threads, so every access holds _url_cache_lock.
+        self._url_cache: dict[tuple[str, int], tuple[int, str]] = {}
+        self._url_cache_lock = threading.Lock()
 
     @property
     def client(self):
@@ -42,12 +173,12 @@ class S3StorageService:
     @property
     def bucket_name(self) -> str:
         """Get the configured bucket name."""
-        if not self._bucket_name:
+        if not self._config.bucket_name:
             raise RuntimeError(
                 "S3_BUCKET_NAME environment variable not set. "
                 "Configure it in your .env file."
             )
-        return self._bucket_name
+        return self._config.bucket_name
 
     def _authenticate(self):
         """Initialize S3 client with credentials."""
@@ -56,12 +187,21 @@ class S3StorageService:
         # 2. ~/.aws/credentials file
         # 3. IAM role (if running on EC2)
         config = Config(
-            region_name=self._region,
+            region_name=self._config.region,
             signature_version="s3v4",
             retries={"max_attempts": 3, "mode": "standard"},
+            max_pool_connections=self._config.pool_connections,
+            tcp_keepalive=True,
+            connect_timeout=3,
+            read_timeout=30,
+        )
+        # Resolve the credential chain once on an explicit botocore session, then reuse it
+        botocore_session = botocore.session.Session()
+        botocore_session.get_credentials()
+        self._client = boto3.Session(botocore_session=botocore_session).client(
+            "s3", config=config
         )
-        self._client = boto3.client("s3", config=config)
-        logger.info(f"S3 client initialized for region: {self._region}")
+        logger.info(f"S3 client initialized for region: {self._config.region}")
 
     def upload_file(
         self,
@@ -89,12 +229,25 @@ class S3StorageService:
         if content_type:
             extra_args["ContentType"] = content_type
 
-        self.client.upload_file(
-            str(file_path),
-            self.bucket_name,
-            object_key,
-            ExtraArgs=extra_args if extra_args else None,
-        )
+        # Small files go straight through put_object, skipping TransferManager overhead
+        size = file_path.stat().st_size
+        if size < self._transfer_config.multipart_threshold:
+            with open(file_path, "rb", buffering=1 << 20) as f:
+                self.client.put_object(
+                    Bucket=self.bucket_name,
+                    Key=object_key,
+                    Body=f,
+                    ContentLength=size,
+                    **extra_args,
+                )
+        else:
+            self.client.upload_file(
+                str(file_path),
+                self.bucket_name,
+                object_key,
+                ExtraArgs=extra_args if extra_args else None,
+                Config=self._transfer_config,
+            )
 
         download_url = self.get_download_url(object_key)
         logger.info(f"Uploaded file: {file_path.name} -> s3://{self.bucket_name}/{object_key}")
@@ -111,7 +264,7 @@ class S3StorageService:
         zip_name: str,
         prefix: str = "builds",
     ) -> dict:
-        """Zip a directory and upload to S3.
+        """Zip a directory and stream it to S3 as a multipart upload.
 
         Args:
             directory_path: Path to directory to zip
@@ -125,26 +278,51 @@ class S3StorageService:
         if not directory_path.is_dir():
             raise NotADirectoryError(f"Not a directory: {directory_path}")
 
-        # Create zip in memory
-        zip_buffer = io.BytesIO()
-        with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zf:
-            for file_path in directory_path.rglob("*"):
-                if file_path.is_file():
-                    arcname = file_path.relative_to(directory_path)
-                    zf.write(file_path, arcname)
-
-        zip_buffer.seek(0)
-        zip_size = zip_buffer.getbuffer().nbytes
-        logger.info(f"Created zip archive: {zip_name}.zip ({zip_size / 1024:.1f} KB)")
-
-        # Upload zip
         object_key = f"{prefix}/{zip_name}.zip"
 
-        self.client.upload_fileobj(
-            zip_buffer,
+        # Stream the zip straight into multipart parts instead of building it in memory
+        upload = self.client.create_multipart_upload(
+            Bucket=self.bucket_name,
+            Key=object_key,
+            ContentType="application/zip",
+        )
+        upload_id = upload["UploadId"]
+        uploader = _PartUploader(
+            self.client,
             self.bucket_name,
             object_key,
-            ExtraArgs={"ContentType": "application/zip"},
+            upload_id,
+            self._transfer_config.multipart_chunksize,
+        )
+
+        try:
+            with zipfile.ZipFile(
+                uploader,
+                "w",
+                zipfile.ZIP_DEFLATED,
+                allowZip64=True,
+                compresslevel=self._config.zip_level,
+                strict_timestamps=False,
+            ) as zf:
+                self._write_tree(zf, directory_path)
+            uploader.flush_final()
+
+            self.client.complete_multipart_upload(
+                Bucket=self.bucket_name,
+                Key=object_key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": uploader.parts},
+            )
+        except Exception:
+            self.client.abort_multipart_upload(
+                Bucket=self.bucket_name, Key=object_key, UploadId=upload_id
+            )
+            raise
+
+        zip_size = uploader.tell()
+        logger.info(
+            f"Streamed zip archive: {zip_name}.zip ({zip_size / 1024:.1f} KB, "
+            f"{len(uploader.parts)} parts)"
         )
 
         download_url = self.get_download_url(object_key)
@@ -156,6 +334,68 @@ class S3StorageService:
             "download_url": download_url,
         }
 
+    async def upload_file_async(
+        self,
+        file_path: str | Path,
+        key: str | None = None,
+        content_type: str | None = None,
+    ) -> dict:
+        """Async variant of upload_file that runs off the event loop."""
+        return await asyncio.to_thread(self.upload_file, file_path, key, content_type)
+
+    async def upload_directory_as_zip_async(
+        self,
+        directory_path: str | Path,
+        zip_name: str,
+        prefix: str = "builds",
+    ) -> dict:
+        """Async variant of upload_directory_as_zip that runs off the event loop."""
+        return await asyncio.to_thread(
+            self.upload_directory_as_zip, directory_path, zip_name, prefix
+        )
+
+    def _write_tree(self, zf: zipfile.ZipFile, directory_path: Path) -> None:
+        """Append files to the archive in walk order, reading small ones ahead in threads.
+
+        Read-ahead holds at most one multipart part's worth of file data, so
+        memory stays O(part size) like the upload itself. Files bigger than
+        that are streamed. Deflate runs on this thread: zipfile's public API
+        has no way to append an entry compressed elsewhere.
+        """
+        budget = self._transfer_config.multipart_chunksize
+        workers = os.cpu_count() or 1
+        pending: deque[tuple[str, str, int, Future[bytes]]] = deque()
+        pending_bytes = 0
+
+        def drain(max_bytes: int) -> None:
+            nonlocal pending_bytes
+            while pending and (pending_bytes > max_bytes or len(pending) > workers * 2):
+                full_path, arcname, size, future = pending.popleft()
+                pending_bytes -= size
+                zinfo = zipfile.ZipInfo.from_file(full_path, arcname, strict_timestamps=False)
+                zf.writestr(
+                    zinfo,
+                    future.result(),
+                    compress_type=zipfile.ZIP_DEFLATED,
+                    compresslevel=self._config.zip_level,
+                )
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for root, _dirs, files in os.walk(directory_path):
+                for name in files:
+                    full_path = os.path.join(root, name)
+                    arcname = os.path.relpath(full_path, directory_path)
+                    size = os.path.getsize(full_path)
+                    if size > budget:
+                        drain(-1)
+                        _write_streamed(zf, full_path, arcname, self._config.zip_level)
+                        continue
+                    drain(budget - size)
+                    future = executor.submit(_read_file, full_path)
+                    pending.append((full_path, arcname, size, future))
+                    pending_bytes += size
+            drain(-1)
+
     def get_download_url(self, key: str, expiration_days: int | None = None) -> str:
         """Generate a presigned download URL for an object.
 
@@ -166,15 +406,29 @@ class S3StorageService:
         Returns:
             Presigned download URL
         """
-        days = expiration_days or self._url_expiration
+        days = expiration_days or self._config.url_expiration_days
         expiration_seconds = days * 24 * 60 * 60
 
+        # Signing is CPU-heavy; reuse a URL until it is halfway to expiry
+        epoch_bucket = int(time.time() // max(expiration_seconds // 2, 1))
+        cache_key = (key, expiration_seconds)
+        with self._url_cache_lock:
+            cached = self._url_cache.get(cache_key)
+        if cached and cached[0] == epoch_bucket:
+            return cached[1]
+
         url = self.client.generate_presigned_url(
             "get_object",
             Params={"Bucket": self.bucket_name, "Key": key},
             ExpiresIn=expiration_seconds,
         )
 
+        with self._url_cache_lock:
+            self._url_cache.pop(cache_key, None)
+            if len(self._url_cache) >= PRESIGNED_URL_CACHE_SIZE:
+                self._url_cache.pop(next(iter(self._url_cache)))
+            self._url_cache[cache_key] = (epoch_bucket, url)
+
         return url
 
     def delete_file(self, key: str) -> bool:
@@ -188,6 +442,9 @@ class S3StorageService:
         """
         try:
             self.client.delete_object(Bucket=self.bucket_name, Key=key)
+            with self._url_cache_lock:
+                for cache_key in [k for k in self._url_cache if k[0] == key]:
+                    del self._url_cache[cache_key]
             logger.info(f"Deleted file: s3://{self.bucket_name}/{key}")
             return True
         except ClientError as e:
@@ -215,7 +472,11 @@ _s3_service: S3StorageService | None = None
 
 
 def get_s3_service() -> S3StorageService:
-    """Get singleton S3 service instance."""
+    """Get singleton S3 service instance.
+
+    Always go through this rather than constructing S3StorageService directly,
+    so every caller shares one client and its connection pool.
+    """
     global _s3_service
     if _s3_service is None:
         _s3_service = S3StorageService()
@@ -2,21 +2,23 @@
 
 import logging
 import os
+import sys
 from contextlib import asynccontextmanager
-from pathlib import Path
 
-from dotenv import load_dotenv
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-# Load environment variables: shared first, then local overrides
-shared_env = Path.home() / ".env.shared"
-if shared_env.exists():
-    load_dotenv(shared_env)
-load_dotenv()  # Local .env can override
+from .core.env import load_env
 
-from .api import chat, ideas, reviews, status, users
-from .db.repository import repository
+# Load environment variables before importing modules that read them
+load_env()
+
+from .api import chat, ideas, reviews, status, users  # noqa: E402
+from .db.repository import repository  # noqa: E402
+from .mcp.bridge import close_bridge_pool  # noqa: E402
+from .notifications.email import close_resend_client  # noqa: E402
+from .notifications.slack import close_slack_client  # noqa: E402
+from .pipeline._anthropic import close_anthropic_client  # noqa: E402
 
 # Configure logging
 logging.basicConfig(
@@ -38,6 +40,10 @@ async def lifespan(app: FastAPI):
     logger.info("Shutting down...")
     await repository.close()
     logger.info("Database disconnected")
+    await close_resend_client()
+    await close_slack_client()
+    await close_bridge_pool()
+    await close_anthropic_client()
 
 
 app = FastAPI(
@@ -48,16 +54,16 @@ app = FastAPI(
 )
 
 # CORS middleware - configured for Netlify dashboard
-CORS_ORIGINS = [
+CORS_ORIGINS: tuple[str, ...] = (
     "https://idea-factory.netlify.app",
     "https://idea-factory-dashboard.netlify.app",
     "http://localhost:3000",  # Local development
     "http://localhost:5173",  # Vite dev server
-]
+)
 
 # Allow all origins in development
 if os.environ.get("ENVIRONMENT", "development") == "development":
-    CORS_ORIGINS = ["*"]
+    CORS_ORIGINS = ("*",)
 
 app.add_middleware(
     CORSMiddleware,
@@ -120,4 +126,13 @@ async def root() -> dict:
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    workers = int(os.environ.get("WEB_CONCURRENCY", "1"))
+    uvicorn.run(
+        # Multiple workers need an import string rather than the app object
+        "src.main:app" if workers > 1 else app,
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop" if sys.platform != "win32" else "auto",
+        http="httptools",
+        workers=workers,
+    )
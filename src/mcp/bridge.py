@@ -6,14 +6,29 @@ communicate via stdio JSON-RPC. Same persona works both interactively
 """
 
 import asyncio
-import json
 import logging
+import re
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
+import orjson
+
 logger = logging.getLogger(__name__)
 
+# Lookahead for a JSON object without copying the (possibly large) text via strip()
+_JSON_OBJECT_START = re.compile(r"\s*\{")
+
+# Longest response line the reader buffers (asyncio's default is 64 KiB, less than
+# a large tool result)
+MCP_STREAM_LIMIT = 16 * 1024 * 1024
+
+# Request id of an oversized response, found in the top-level keys at either end
+# of the line (servers write "id" before or after "result")
+_HEAD_ID = re.compile(rb'^\s*\{[^{\[]*?"id"\s*:\s*(\d+)')
+_TAIL_ID = re.compile(rb'"id"\s*:\s*(\d+)\s*\}\s*$')
+_ID_SCAN_BYTES = 512
+
 
 @dataclass
 class MCPToolResult:
@@ -43,7 +58,10 @@ class MCPToolBridge:
         self.node_command = node_command
         self.process: asyncio.subprocess.Process | None = None
         self._request_id = 0
-        self._lock = asyncio.Lock()
+        self._write_lock = asyncio.Lock()
+        self._pending: dict[int, asyncio.Future[dict[str, Any]]] = {}
+        self._reader_task: asyncio.Task[None] | None = None
+        self._stderr_task: asyncio.Task[None] | None = None
 
     async def __aenter__(self) -> "MCPToolBridge":
         """Start the MCP server process and initialize."""
@@ -71,7 +89,10 @@ class MCPToolBridge:
             stdin=asyncio.subprocess.PIPE,
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE,
+            limit=MCP_STREAM_LIMIT,
         )
+        self._reader_task = asyncio.create_task(self._read_loop())
+        self._stderr_task = asyncio.create_task(self._drain_stderr())
 
         # Initialize the MCP connection
         await self._initialize()
@@ -79,6 +100,14 @@ class MCPToolBridge:
 
     async def stop(self) -> None:
         """Stop the MCP server subprocess."""
+        if self._reader_task:
+            self._reader_task.cancel()
+            self._reader_task = None
+        if self._stderr_task:
+            self._stderr_task.cancel()
+            self._stderr_task = None
+        self._fail_pending(RuntimeError("MCP server stopped"))
+
         if self.process:
             try:
                 self.process.terminate()
@@ -86,10 +115,98 @@ class MCPToolBridge:
             except asyncio.TimeoutError:
                 self.process.kill()
                 await self.process.wait()
+            except ProcessLookupError:
+                pass  # Already exited
             finally:
                 self.process = None
                 logger.info("MCP server stopped")
 
+    @property
+    def is_alive(self) -> bool:
+        """Whether the server is running and its responses are still being read."""
+        return (
+            self.process is not None
+            and self.process.returncode is None
+            and self._reader_task is not None
+            and not self._reader_task.done()
+        )
+
+    async def _read_loop(self) -> None:
+        """Dispatch responses from the server to waiting requests by id."""
+        assert self.process and self.process.stdout
+        stdout = self.process.stdout
+        try:
+            while True:
+                # MCP uses newline-delimited JSON
+                try:
+                    line = await stdout.readuntil(b"\n")
+                except asyncio.IncompleteReadError as e:
+                    if not e.partial:
+                        break  # Server closed stdout
+                    line = e.partial
+                except asyncio.LimitOverrunError:
+                    await self._skip_oversized_line(stdout)
+                    continue
+                try:
+                    response = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    response = None
+                if not isinstance(response, dict):
+                    logger.warning(f"Ignoring non-JSON-RPC line from MCP server: {line[:200]!r}")
+                    continue
+
+                future = self._pending.pop(response.get("id"), None)
+                if future and not future.done():
+                    future.set_result(response)
+        except Exception as e:
+            logger.error(f"MCP response reader failed: {e}")
+        finally:
+            # The bridge is dead once nothing reads responses (is_alive turns False)
+            self._fail_pending(RuntimeError("No response from MCP server"))
+
+    async def _drain_stderr(self) -> None:
+        """Log the server's stderr so a full pipe never blocks its writes."""
+        assert self.process and self.process.stderr
+        # read() rather than readline(), so a long log line can't overrun the limit
+        while chunk := await self.process.stderr.read(65536):
+            for line in chunk.decode(errors="replace").splitlines():
+                logger.debug(f"[{self.mcp_path.name}] {line}")
+
+    async def _skip_oversized_line(self, stdout: asyncio.StreamReader) -> None:
+        """Discard a response line over MCP_STREAM_LIMIT and fail the request it answers."""
+        head = tail = b""
+        while True:
+            try:
+                chunk = await stdout.readuntil(b"\n")
+                done = True
+            except asyncio.LimitOverrunError as e:
+                chunk = await stdout.readexactly(e.consumed)
+                done = False
+            except asyncio.IncompleteReadError as e:
+                chunk, done = e.partial, True
+            head = head or chunk[:_ID_SCAN_BYTES]
+            tail = (tail + chunk)[-_ID_SCAN_BYTES:]
+            if done:
+                break
+
+        match = _TAIL_ID.search(tail) or _HEAD_ID.match(head)
+        future = self._pending.pop(int(match.group(1)), None) if match else None
+        logger.warning(
+            f"Dropped MCP response over {MCP_STREAM_LIMIT} bytes "
+            f"(request id {match.group(1).decode() if match else 'unknown'})"
+        )
+        if future and not future.done():
+            future.set_exception(
+                RuntimeError(f"MCP response exceeded {MCP_STREAM_LIMIT} bytes")
+            )
+
+    def _fail_pending(self, error: Exception) -> None:
+        """Fail every in-flight request (server exited or bridge stopped)."""
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(error)
+
     async def _initialize(self) -> dict[str, Any]:
         """Send MCP initialize request."""
         return await self._send_request(
@@ -130,10 +247,10 @@ class MCPToolBridge:
                 )
                 if text_content:
                     # Try to parse as JSON if it looks like JSON
-                    if text_content.strip().startswith("{"):
+                    if _JSON_OBJECT_START.match(text_content):
                         try:
-                            return MCPToolResult(success=True, content=json.loads(text_content))
-                        except json.JSONDecodeError:
+                            return MCPToolResult(success=True, content=orjson.loads(text_content))
+                        except orjson.JSONDecodeError:
                             pass
                     return MCPToolResult(success=True, content=text_content)
 
@@ -145,50 +262,75 @@ class MCPToolBridge:
 
     async def _send_request(self, method: str, params: dict[str, Any]) -> dict[str, Any]:
         """Send a JSON-RPC request and wait for response."""
-        if not self.process or not self.process.stdin or not self.process.stdout:
+        if not self.process or not self.process.stdin or not self.is_alive:
             raise RuntimeError("MCP server not running")
 
-        async with self._lock:
-            self._request_id += 1
-            request = {
-                "jsonrpc": "2.0",
-                "id": self._request_id,
-                "method": method,
-                "params": params,
-            }
-
-            # Send request
-            request_bytes = json.dumps(request).encode() + b"\n"
-            self.process.stdin.write(request_bytes)
-            await self.process.stdin.drain()
-
-            # Read response (MCP uses newline-delimited JSON)
-            response_line = await asyncio.wait_for(
-                self.process.stdout.readline(), timeout=30.0
-            )
+        self._request_id += 1
+        request_id = self._request_id
+        request = {
+            "jsonrpc": "2.0",
+            "id": request_id,
+            "method": method,
+            "params": params,
+        }
 
-            if not response_line:
-                raise RuntimeError("No response from MCP server")
+        # Register before writing so the reader can never miss the response
+        future: asyncio.Future[dict[str, Any]] = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
 
-            response = json.loads(response_line.decode())
+        try:
+            # Only writes are serialized; responses are matched by id in _read_loop
+            request_bytes = orjson.dumps(request) + b"\n"
+            async with self._write_lock:
+                self.process.stdin.write(request_bytes)
+                await self.process.stdin.drain()
+
+            response = await asyncio.wait_for(future, timeout=30.0)
+        finally:
+            self._pending.pop(request_id, None)
 
-            # Check for errors
-            if "error" in response:
-                error = response["error"]
-                raise RuntimeError(f"MCP error: {error.get('message', error)}")
+        # Check for errors
+        if "error" in response:
+            error = response["error"]
+            raise RuntimeError(f"MCP error: {error.get('message', error)}")
 
-            return response.get("result", {})
+        return response.get("result", {})
 
 
 # Pre-configured bridges for known MCP servers
 CHRISTENSEN_MCP_PATH = Path.home() / "projects" / "christensen-mcp"
 
 
+# Warm bridges keyed by MCP path, so each server is spawned and initialized once
+_bridge_pool: dict[Path, MCPToolBridge] = {}
+_pool_lock = asyncio.Lock()
+
+
+async def get_bridge(mcp_path: str | Path) -> MCPToolBridge:
+    """Get a pooled, running bridge for an MCP server (restarted if it died)."""
+    mcp_path = Path(mcp_path)
+    async with _pool_lock:
+        bridge = _bridge_pool.get(mcp_path)
+        if bridge is None or not bridge.is_alive:
+            if bridge is not None:
+                await bridge.stop()
+            bridge = MCPToolBridge(mcp_path)
+            await bridge.start()
+            _bridge_pool[mcp_path] = bridge
+        return bridge
+
+
+async def close_bridge_pool() -> None:
+    """Stop all pooled MCP server processes (called on app shutdown)."""
+    async with _pool_lock:
+        for bridge in _bridge_pool.values():
+            await bridge.stop()
+        _bridge_pool.clear()
+
+
 async def get_christensen_bridge() -> MCPToolBridge:
     """Get a bridge to the Christensen MCP server."""
-    bridge = MCPToolBridge(CHRISTENSEN_MCP_PATH)
-    await bridge.start()
-    return bridge
+    return await get_bridge(CHRISTENSEN_MCP_PATH)
 
 
 # Context manager for convenient usage
@@ -198,19 +340,20 @@ class ChristensenAnalyzer:
     Usage:
         async with ChristensenAnalyzer() as analyzer:
             result = await analyzer.analyze_decision("Should we build X?")
+
+    The underlying bridge comes from the shared pool and stays running on exit.
     """
 
     def __init__(self) -> None:
         self.bridge: MCPToolBridge | None = None
 
     async def __aenter__(self) -> "ChristensenAnalyzer":
-        self.bridge = MCPToolBridge(CHRISTENSEN_MCP_PATH)
-        await self.bridge.start()
+        self.bridge = await get_christensen_bridge()
         return self
 
     async def __aexit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
-        if self.bridge:
-            await self.bridge.stop()
+        # Pooled bridge is reused by later analyzers; close_bridge_pool() stops it
+        self.bridge = None
 
     async def analyze_decision(
         self,
@@ -1,72 +1,69 @@
 """Email notifications via Resend API."""
 
+import html
 import logging
-import os
+import string
+from dataclasses import dataclass
 from datetime import datetime
 
 import httpx
-from dotenv import load_dotenv
+import orjson
+
+from ..core.env import FROM_EMAIL, NOTIFY_EMAIL, RESEND_API_KEY
 
-load_dotenv()
 logger = logging.getLogger(__name__)
 
-RESEND_API_KEY = os.getenv("RESEND_API_KEY")
-NOTIFY_EMAIL = os.getenv("NOTIFY_EMAIL")
-FROM_EMAIL = os.getenv("FROM_EMAIL", "Idea Factory <notifications@resend.dev>")
 
+@dataclass(frozen=True, slots=True)
+class _EmailConfig:
+    """Resend settings resolved from the environment."""
 
-def generate_hil_email_html(
-    idea_id: str,
-    title: str,
-    stage: str,
-    enrichment_summary: str | None = None,
-    evaluation_summary: str | None = None,
-    scaffolding_summary: str | None = None,
-    api_base_url: str = "http://localhost:8000",
-) -> str:
-    """Generate HTML email for HIL gate notification."""
+    resend_api_key: str | None
+    notify_email: str | None
+    from_email: str
 
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-    # Determine which HIL gate this is
-    if stage == "evaluation":
-        gate_name = "First Review Gate"
-        gate_description = "Review enrichment and evaluation results before scaffolding."
-        next_action = "Approve to generate project blueprint"
-    else:
-        gate_name = "Second Review Gate"
-        gate_description = "Review scaffolding blueprint before building."
-        next_action = "Approve to generate project files"
-
-    sections = []
-
-    if enrichment_summary:
-        sections.append(f"""
-        <div style="margin-bottom: 20px; padding: 15px; background: #f8f9fa; border-radius: 8px;">
-            <h3 style="margin: 0 0 10px 0; color: #495057;">📝 Enrichment</h3>
-            <p style="margin: 0; color: #212529; white-space: pre-wrap;">{enrichment_summary}</p>
-        </div>
-        """)
+_config = _EmailConfig(
+    resend_api_key=RESEND_API_KEY,
+    notify_email=NOTIFY_EMAIL,
+    from_email=FROM_EMAIL,
+)
+
+# Shared client so HIL notifications reuse the pooled TLS connection to Resend
+_resend_client: httpx.AsyncClient | None = None
+
+
+def get_resend_client() -> httpx.AsyncClient:
+    """Get the shared Resend HTTP client (lazy initialization)."""
+    global _resend_client
+    if _resend_client is None or _resend_client.is_closed:
+        _resend_client = httpx.AsyncClient(
+            base_url="https://api.resend.com",
+            headers={
+                "Authorization": f"Bearer {_config.resend_api_key}",
+                "Content-Type": "application/json",
+            },
+            timeout=30.0,
+        )
+    return _resend_client
 
-    if evaluation_summary:
-        sections.append(f"""
-        <div style="margin-bottom: 20px; padding: 15px; background: #f8f9fa; border-radius: 8px;">
-            <h3 style="margin: 0 0 10px 0; color: #495057;">🎯 Evaluation</h3>
-            <p style="margin: 0; color: #212529; white-space: pre-wrap;">{evaluation_summary}</p>
-        </div>
-        """)
 
-    if scaffolding_summary:
-        sections.append(f"""
+async def close_resend_client() -> None:
+    """Close the shared Resend HTTP client (called on app shutdown)."""
+    global _resend_client
+    if _resend_client is not None:
+        await _resend_client.aclose()
+        _resend_client = None
+
+
+_SECTION_TMPL = string.Template("""
         <div style="margin-bottom: 20px; padding: 15px; background: #f8f9fa; border-radius: 8px;">
-            <h3 style="margin: 0 0 10px 0; color: #495057;">🏗️ Scaffolding</h3>
-            <p style="margin: 0; color: #212529; white-space: pre-wrap;">{scaffolding_summary}</p>
+            <h3 style="margin: 0 0 10px 0; color: #495057;">$heading</h3>
+            <p style="margin: 0; color: #212529; white-space: pre-wrap;">$body</p>
         </div>
         """)
 
-    sections_html = "\n".join(sections)
-
-    return f"""
+_PAGE_TMPL = string.Template("""
 <!DOCTYPE html>
 <html>
 <head>
@@ -76,47 +73,104 @@ def generate_hil_email_html(
 <body style="font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, sans-serif; line-height: 1.6; color: #333; max-width: 600px; margin: 0 auto; padding: 20px;">
     <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 30px; border-radius: 12px 12px 0 0; text-align: center;">
         <h1 style="color: white; margin: 0; font-size: 24px;">🏭 Idea Factory</h1>
-        <p style="color: rgba(255,255,255,0.9); margin: 10px 0 0 0; font-size: 14px;">{gate_name}</p>
+        <p style="color: rgba(255,255,255,0.9); margin: 10px 0 0 0; font-size: 14px;">$gate_name</p>
     </div>
 
     <div style="background: white; padding: 30px; border: 1px solid #e9ecef; border-top: none;">
-        <h2 style="margin: 0 0 10px 0; color: #212529;">{title}</h2>
+        <h2 style="margin: 0 0 10px 0; color: #212529;">$title</h2>
         <p style="color: #6c757d; margin: 0 0 20px 0; font-size: 14px;">
-            ID: <code style="background: #f1f3f4; padding: 2px 6px; border-radius: 4px;">{idea_id[:8]}...</code>
+            ID: <code style="background: #f1f3f4; padding: 2px 6px; border-radius: 4px;">$short_id...</code>
         </p>
 
         <div style="background: #fff3cd; border-left: 4px solid #ffc107; padding: 15px; margin-bottom: 20px;">
             <strong style="color: #856404;">⏳ Awaiting Review</strong>
-            <p style="margin: 5px 0 0 0; color: #856404;">{gate_description}</p>
+            <p style="margin: 5px 0 0 0; color: #856404;">$gate_description</p>
         </div>
 
-        {sections_html}
+        $sections_html
 
         <div style="margin-top: 30px; padding-top: 20px; border-top: 1px solid #e9ecef;">
-            <p style="margin: 0 0 15px 0; color: #495057;"><strong>Next Action:</strong> {next_action}</p>
+            <p style="margin: 0 0 15px 0; color: #495057;"><strong>Next Action:</strong> $next_action</p>
 
             <div style="background: #f8f9fa; padding: 15px; border-radius: 8px; font-family: monospace; font-size: 13px;">
                 <p style="margin: 0 0 10px 0; color: #6c757d;"># Approve</p>
-                <code style="color: #28a745;">curl -X POST {api_base_url}/api/reviews/{idea_id} \\<br>
+                <code style="color: #28a745;">curl -X POST $review_url \\<br>
                 &nbsp;&nbsp;-H "Content-Type: application/json" \\<br>
-                &nbsp;&nbsp;-d '{{"decision": "approve"}}'</code>
+                &nbsp;&nbsp;-d '{"decision": "approve"}'</code>
 
                 <p style="margin: 20px 0 10px 0; color: #6c757d;"># Reject</p>
-                <code style="color: #dc3545;">curl -X POST {api_base_url}/api/reviews/{idea_id} \\<br>
+                <code style="color: #dc3545;">curl -X POST $review_url \\<br>
                 &nbsp;&nbsp;-H "Content-Type: application/json" \\<br>
-                &nbsp;&nbsp;-d '{{"decision": "reject", "notes": "reason"}}'</code>
+                &nbsp;&nbsp;-d '{"decision": "reject", "notes": "reason"}'</code>
             </div>
         </div>
     </div>
 
     <div style="background: #f8f9fa; padding: 20px; border-radius: 0 0 12px 12px; text-align: center; border: 1px solid #e9ecef; border-top: none;">
         <p style="margin: 0; color: #6c757d; font-size: 12px;">
-            Sent by Idea Factory at {timestamp}
+            Sent by Idea Factory at $timestamp
         </p>
     </div>
 </body>
 </html>
-"""
+""")
+
+# Gate-specific copy is static, so bake it into one page template per gate at import
+_GATE_PAGE_TMPLS = {
+    gate: string.Template(
+        _PAGE_TMPL.safe_substitute(
+            gate_name=gate_name, gate_description=gate_description, next_action=next_action
+        )
+    )
+    for gate, (gate_name, gate_description, next_action) in {
+        "evaluation": (
+            "First Review Gate",
+            "Review enrichment and evaluation results before scaffolding.",
+            "Approve to generate project blueprint",
+        ),
+        "scaffolding": (
+            "Second Review Gate",
+            "Review scaffolding blueprint before building.",
+            "Approve to generate project files",
+        ),
+    }.items()
+}
+
+
+def generate_hil_email_html(
+    idea_id: str,
+    title: str,
+    stage: str,
+    enrichment_summary: str | None = None,
+    evaluation_summary: str | None = None,
+    scaffolding_summary: str | None = None,
+    api_base_url: str = "http://localhost:8000",
+) -> str:
+    """Generate HTML email for HIL gate notification."""
+
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    # Determine which HIL gate this is
+    page_tmpl = _GATE_PAGE_TMPLS["evaluation" if stage == "evaluation" else "scaffolding"]
+
+    sections = (
+        ("📝 Enrichment", enrichment_summary),
+        ("🎯 Evaluation", evaluation_summary),
+        ("🏗️ Scaffolding", scaffolding_summary),
+    )
+    sections_html = "\n".join(
+        _SECTION_TMPL.substitute(heading=heading, body=html.escape(summary))
+        for heading, summary in sections
+        if summary
+    )
+
+    return page_tmpl.substitute(
+        title=html.escape(title),
+        short_id=html.escape(idea_id[:8]),
+        sections_html=sections_html,
+        review_url=html.escape(f"{api_base_url}/api/reviews/{idea_id}"),
+        timestamp=timestamp,
+    )
 
 
 async def send_email_notification(
@@ -140,12 +194,12 @@ async def send_email_notification(
     Returns:
         True if email sent successfully, False otherwise
     """
-    if not RESEND_API_KEY or not NOTIFY_EMAIL:
+    if not _config.resend_api_key or not _config.notify_email:
         logger.warning("Email notifications disabled: missing RESEND_API_KEY or NOTIFY_EMAIL")
         return False
 
     try:
-        html = generate_hil_email_html(
+        html_body = generate_hil_email_html(
             idea_id=idea_id,
             title=title,
             stage=stage,
@@ -161,30 +215,22 @@ async def send_email_notification(
             subject = f"🏭 Review Required: {title} (Gate 2)"
 
         payload = {
-            "from": FROM_EMAIL,
-            "to": [NOTIFY_EMAIL],
+            "from": _config.from_email,
+            "to": [_config.notify_email],
             "subject": subject,
-            "html": html,
+            "html": html_body,
         }
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "https://api.resend.com/emails",
-                headers={
-                    "Authorization": f"Bearer {RESEND_API_KEY}",
-                    "Content-Type": "application/json",
-                },
-                json=payload,
-                timeout=30.0,
-            )
-
-            if response.status_code == 200:
-                result = response.json()
-                logger.info(f"Email sent successfully: {result.get('id')}")
-                return True
-            else:
-                logger.error(f"Failed to send email: {response.status_code} - {response.text}")
-                return False
+        # Content-Type is set on the shared client
+        response = await get_resend_client().post("/emails", content=orjson.dumps(payload))
+
+        if response.status_code == 200:
+            result = response.json()
+            logger.info(f"Email sent successfully: {result.get('id')}")
+            return True
+        else:
+            logger.error(f"Failed to send email: {response.status_code} - {response.text}")
+            return False
 
     except Exception as e:
         logger.error(f"Email notification error: {e}")
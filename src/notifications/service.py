@@ -1,17 +1,21 @@
 """Unified notification service for HIL gates."""
 
+import hashlib
 import logging
-import os
+import time
 from dataclasses import dataclass
 
-from dotenv import load_dotenv
-
+from ..core.env import NOTIFY_EMAIL, RESEND_API_KEY, SLACK_WEBHOOK_URL
 from .email import send_email_notification
 from .slack import send_slack_notification
 
-load_dotenv()
 logger = logging.getLogger(__name__)
 
+# A gate notification already delivered on a channel within this window is not
+# re-sent, so a retried pipeline run doesn't post the same review request twice.
+# Only identical content counts as a duplicate.
+NOTIFICATION_DEDUP_TTL = 3600.0
+
 
 @dataclass
 class NotificationContext:
@@ -43,8 +47,10 @@ class NotificationService:
     """Service for sending HIL gate notifications via multiple channels."""
 
     def __init__(self):
-        self.email_enabled = bool(os.getenv("RESEND_API_KEY") and os.getenv("NOTIFY_EMAIL"))
-        self.slack_enabled = bool(os.getenv("SLACK_WEBHOOK_URL"))
+        self.email_enabled = bool(RESEND_API_KEY and NOTIFY_EMAIL)
+        self.slack_enabled = bool(SLACK_WEBHOOK_URL)
+        # (idea_id, stage, channel, content digest) -> monotonic time of last successful send
+        self._sent_at: dict[tuple[str, str, str, str], float] = {}
 
         if self.email_enabled:
             logger.info("Email notifications enabled (Resend)")
@@ -71,7 +77,9 @@ class NotificationService:
         logger.info(f"Sending HIL Gate {gate_num} notifications for: {context.title}")
 
         # Send email notification
-        if self.email_enabled:
+        if self.email_enabled and self._already_sent(context, "email"):
+            result.email_sent = True
+        elif self.email_enabled:
             try:
                 result.email_sent = await send_email_notification(
                     idea_id=context.idea_id,
@@ -82,13 +90,16 @@ class NotificationService:
                     scaffolding_summary=context.scaffolding_summary,
                 )
                 if result.email_sent:
+                    self._mark_sent(context, "email")
                     logger.info(f"Email notification sent for idea: {context.idea_id[:8]}")
             except Exception as e:
                 result.email_error = str(e)
                 logger.error(f"Email notification failed: {e}")
 
         # Send Slack notification
-        if self.slack_enabled:
+        if self.slack_enabled and self._already_sent(context, "slack"):
+            result.slack_sent = True
+        elif self.slack_enabled:
             try:
                 result.slack_sent = await send_slack_notification(
                     idea_id=context.idea_id,
@@ -99,6 +110,7 @@ class NotificationService:
                     scaffolding_summary=context.scaffolding_summary,
                 )
                 if result.slack_sent:
+                    self._mark_sent(context, "slack")
                     logger.info(f"Slack notification sent for idea: {context.idea_id[:8]}")
             except Exception as e:
                 result.slack_error = str(e)
@@ -117,6 +129,47 @@ class NotificationService:
 
         return result
 
+    def forget(self, idea_id: str) -> None:
+        """Drop an idea's delivery records, so its next gate notification is always sent."""
+        self._sent_at = {
+            key: sent_at for key, sent_at in self._sent_at.items() if key[0] != idea_id
+        }
+
+    @staticmethod
+    def _dedup_key(context: NotificationContext, channel: str) -> tuple[str, str, str, str]:
+        """Key a delivery by idea, gate, channel and the notification's content."""
+        content = "\0".join(
+            field or ""
+            for field in (
+                context.title,
+                context.enrichment_summary,
+                context.evaluation_summary,
+                context.scaffolding_summary,
+            )
+        )
+        digest = hashlib.sha256(content.encode()).hexdigest()
+        return (context.idea_id, context.stage, channel, digest)
+
+    def _already_sent(self, context: NotificationContext, channel: str) -> bool:
+        """Check whether this gate notification was recently delivered on a channel."""
+        sent_at = self._sent_at.get(self._dedup_key(context, channel))
+        if sent_at is not None and time.monotonic() - sent_at < NOTIFICATION_DEDUP_TTL:
+            logger.info(
+                f"Skipping duplicate {channel} notification for idea: {context.idea_id[:8]}"
+            )
+            return True
+        return False
+
+    def _mark_sent(self, context: NotificationContext, channel: str) -> None:
+        """Record a successful delivery, dropping entries past the dedup window."""
+        now = time.monotonic()
+        self._sent_at = {
+            key: sent_at
+            for key, sent_at in self._sent_at.items()
+            if now - sent_at < NOTIFICATION_DEDUP_TTL
+        }
+        self._sent_at[self._dedup_key(context, channel)] = now
+
 
 # Singleton instance
 _notification_service: NotificationService | None = None
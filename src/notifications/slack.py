@@ -1,41 +1,56 @@
 """Slack notifications via Webhook URL."""
 
 import logging
-import os
 from datetime import datetime
 
 import httpx
-from dotenv import load_dotenv
 
-load_dotenv()
-logger = logging.getLogger(__name__)
+from ..core.env import SLACK_WEBHOOK_URL
 
-SLACK_WEBHOOK_URL = os.getenv("SLACK_WEBHOOK_URL")
+logger = logging.getLogger(__name__)
 
+# Shared client so Slack notifications reuse the pooled TLS connection to the webhook host
+_slack_client: httpx.AsyncClient | None = None
 
-def build_slack_blocks(
-    idea_id: str,
-    title: str,
-    stage: str,
-    enrichment_summary: str | None = None,
-    evaluation_summary: str | None = None,
-    scaffolding_summary: str | None = None,
-) -> list[dict]:
-    """Build Slack Block Kit message for HIL gate notification."""
-
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-    # Determine which HIL gate
-    if stage == "evaluation":
-        gate_emoji = "1️⃣"
-        gate_name = "First Review Gate"
-        gate_description = "Enrichment & evaluation complete. Review before scaffolding."
-    else:
-        gate_emoji = "2️⃣"
-        gate_name = "Second Review Gate"
-        gate_description = "Scaffolding complete. Review blueprint before building."
-
-    blocks = [
+def get_slack_client() -> httpx.AsyncClient:
+    """Get the shared Slack HTTP client (lazy initialization)."""
+    global _slack_client
+    if _slack_client is None or _slack_client.is_closed:
+        _slack_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(30.0),
+            limits=httpx.Limits(max_keepalive_connections=10, max_connections=20),
+        )
+    return _slack_client
+
+
+async def close_slack_client() -> None:
+    """Close the shared Slack HTTP client (called on app shutdown)."""
+    global _slack_client
+    if _slack_client is not None:
+        await _slack_client.aclose()
+        _slack_client = None
+
+
+# Static Block Kit pieces, built once. Blocks are only serialized, never mutated.
+_DIVIDER = {"type": "divider"}
+
+# stage -> (gate emoji, gate name, gate description)
+_GATE_META: dict[str, tuple[str, str, str]] = {
+    "evaluation": (
+        "1️⃣",
+        "First Review Gate",
+        "Enrichment & evaluation complete. Review before scaffolding.",
+    ),
+    "scaffolding": (
+        "2️⃣",
+        "Second Review Gate",
+        "Scaffolding complete. Review blueprint before building.",
+    ),
+}
+
+_GATE_BLOCKS: dict[str, tuple[dict, dict]] = {
+    stage: (
         {
             "type": "header",
             "text": {
@@ -44,13 +59,6 @@ def build_slack_blocks(
                 "emoji": True,
             },
         },
-        {
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": f"*{title}*\n`{idea_id[:8]}...`",
-            },
-        },
         {
             "type": "context",
             "elements": [
@@ -60,74 +68,68 @@ def build_slack_blocks(
                 }
             ],
         },
-        {"type": "divider"},
-    ]
+    )
+    for stage, (gate_emoji, gate_name, gate_description) in _GATE_META.items()
+}
+
+_ACTIONS_TEXT = (
+    "*Actions*\n```"
+    "# Approve\n"
+    "curl -X POST http://localhost:8000/api/reviews/{idea_id} \\\n"
+    "  -H 'Content-Type: application/json' \\\n"
+    "  -d '{{\"decision\": \"approve\"}}'\n\n"
+    "# Reject\n"
+    "curl -X POST http://localhost:8000/api/reviews/{idea_id} \\\n"
+    "  -H 'Content-Type: application/json' \\\n"
+    "  -d '{{\"decision\": \"reject\", \"notes\": \"reason\"}}'```"
+)
+
+
+def _summary_block(heading: str, summary: str) -> dict:
+    """Section block for a stage summary, truncated to fit Slack."""
+    if len(summary) > 500:
+        summary = summary[:500] + "..."
+    return {"type": "section", "text": {"type": "mrkdwn", "text": f"*{heading}*\n{summary}"}}
 
-    # Add enrichment section if available
-    if enrichment_summary:
-        # Truncate if too long for Slack
-        summary = enrichment_summary[:500] + "..." if len(enrichment_summary) > 500 else enrichment_summary
-        blocks.append({
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": f"*📝 Enrichment*\n{summary}",
-            },
-        })
 
-    # Add evaluation section if available
-    if evaluation_summary:
-        summary = evaluation_summary[:500] + "..." if len(evaluation_summary) > 500 else evaluation_summary
-        blocks.append({
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": f"*🎯 Evaluation*\n{summary}",
-            },
-        })
+def build_slack_blocks(
+    idea_id: str,
+    title: str,
+    stage: str,
+    enrichment_summary: str | None = None,
+    evaluation_summary: str | None = None,
+    scaffolding_summary: str | None = None,
+) -> list[dict]:
+    """Build Slack Block Kit message for HIL gate notification."""
 
-    # Add scaffolding section if available (Gate 2)
-    if scaffolding_summary:
-        summary = scaffolding_summary[:500] + "..." if len(scaffolding_summary) > 500 else scaffolding_summary
-        blocks.append({
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": f"*🏗️ Scaffolding*\n{summary}",
-            },
-        })
-
-    blocks.append({"type": "divider"})
-
-    # Add action hints
-    blocks.append({
-        "type": "section",
-        "text": {
-            "type": "mrkdwn",
-            "text": "*Actions*\n```"
-                    f"# Approve\n"
-                    f"curl -X POST http://localhost:8000/api/reviews/{idea_id} \\\n"
-                    f"  -H 'Content-Type: application/json' \\\n"
-                    f"  -d '{{\"decision\": \"approve\"}}'\n\n"
-                    f"# Reject\n"
-                    f"curl -X POST http://localhost:8000/api/reviews/{idea_id} \\\n"
-                    f"  -H 'Content-Type: application/json' \\\n"
-                    f"  -d '{{\"decision\": \"reject\", \"notes\": \"reason\"}}'```",
-        },
-    })
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-    # Footer
-    blocks.append({
-        "type": "context",
-        "elements": [
-            {
-                "type": "mrkdwn",
-                "text": f"⏰ {timestamp}",
-            }
-        ],
-    })
+    # Determine which HIL gate
+    header, gate_context = _GATE_BLOCKS["evaluation" if stage == "evaluation" else "scaffolding"]
+
+    summaries = [
+        _summary_block(heading, summary)
+        for heading, summary in (
+            ("📝 Enrichment", enrichment_summary),
+            ("🎯 Evaluation", evaluation_summary),
+            ("🏗️ Scaffolding", scaffolding_summary),
+        )
+        if summary
+    ]
 
-    return blocks
+    return [
+        header,
+        {"type": "section", "text": {"type": "mrkdwn", "text": f"*{title}*\n`{idea_id[:8]}...`"}},
+        gate_context,
+        _DIVIDER,
+        *summaries,
+        _DIVIDER,
+        {
+            "type": "section",
+            "text": {"type": "mrkdwn", "text": _ACTIONS_TEXT.format(idea_id=idea_id)},
+        },
+        {"type": "context", "elements": [{"type": "mrkdwn", "text": f"⏰ {timestamp}"}]},
+    ]
 
 
 async def send_slack_notification(
@@ -170,19 +172,14 @@ async def send_slack_notification(
             "text": f"🏭 Idea Factory: Review required for '{title}'",  # Fallback
         }
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                SLACK_WEBHOOK_URL,
-                json=payload,
-                timeout=30.0,
-            )
-
-            if response.status_code == 200:
-                logger.info(f"Slack notification sent for idea: {idea_id[:8]}")
-                return True
-            else:
-                logger.error(f"Failed to send Slack notification: {response.status_code} - {response.text}")
-                return False
+        response = await get_slack_client().post(SLACK_WEBHOOK_URL, json=payload)
+
+        if response.status_code == 200:
+            logger.info(f"Slack notification sent for idea: {idea_id[:8]}")
+            return True
+        else:
+            logger.error(f"Failed to send Slack notification: {response.status_code} - {response.text}")
+            return False
 
     except Exception as e:
         logger.error(f"Slack notification error: {e}")
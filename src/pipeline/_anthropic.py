@@ -0,0 +1,162 @@
+"""Shared Anthropic client for the pipeline stages.
+
+Every stage talks to the API through one AsyncAnthropic and one HTTP
+connection pool, so concurrent ideas reuse warm connections instead of each
+stage opening its own. Stages that need different retry or timeout settings
+take a with_options() copy, which shares the same pool.
+
+Pooled connections belong to the event loop that opened them, so there is one
+client per running loop (normally just the app's).
+
+Also home to the request helpers the stages share: streaming a reply's text
+and running a Message Batch to completion.
+"""
+
+import asyncio
+import importlib.util
+import logging
+from typing import Any
+
+import anthropic
+
+from ..core.env import ANTHROPIC_API_KEY
+from ._ratelimit import get_anthropic_limiter
+
+logger = logging.getLogger(__name__)
+
+# Keep idle API connections around between requests. The SDK default expires
+# them after 5s, shorter than the gap between a build's request waves, so each
+# wave would otherwise pay a fresh TCP + TLS handshake.
+ANTHROPIC_KEEPALIVE_EXPIRY = 90.0
+
+# Multiplex concurrent requests over one connection when HTTP/2 support
+# (the optional h2 package, i.e. httpx[http2]) is installed
+ANTHROPIC_HTTP2 = importlib.util.find_spec("h2") is not None
+
+_clients: dict[asyncio.AbstractEventLoop, anthropic.AsyncAnthropic] = {}
+
+# with_options() copies of the shared client, keyed by (max_retries, timeout,
+# connect timeout) and cached with the shared client they were made from
+_client_views: dict[
+    tuple[int, float, float], tuple[anthropic.AsyncAnthropic, anthropic.AsyncAnthropic]
+] = {}
+
+
+def get_anthropic_client() -> anthropic.AsyncAnthropic:
+    """Get the shared Anthropic client for the running event loop (lazy initialization)."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        # Clients of loops that have since closed can't be reused (or closed)
+        for stale in [other for other in _clients if other.is_closed()]:
+            del _clients[stale]
+        client = _clients[loop] = anthropic.AsyncAnthropic(
+            api_key=ANTHROPIC_API_KEY,
+            http_client=anthropic.DefaultAsyncHttpxClient(
+                http2=ANTHROPIC_HTTP2,
+                # Built from the SDK's own Limits type so it matches the bundled httpx
+                limits=type(anthropic.DEFAULT_CONNECTION_LIMITS)(
+                    max_connections=100,
+                    max_keepalive_connections=20,
+                    keepalive_expiry=ANTHROPIC_KEEPALIVE_EXPIRY,
+                ),
+            ),
+        )
+    return client
+
+
+async def close_anthropic_client() -> None:
+    """Close the running loop's Anthropic client and its pool (called on app shutdown)."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.close()
+
+
+def get_anthropic_client_view(
+    max_retries: int, timeout: float, connect: float
+) -> anthropic.AsyncAnthropic:
+    """Get the shared client with a stage's retry and timeout settings.
+
+    The copy shares the shared client's connection pool, and is rebuilt when
+    the shared client changes (e.g. under a new event loop).
+    """
+    shared = get_anthropic_client()
+    settings = (max_retries, timeout, connect)
+    view = _client_views.get(settings)
+    if view is None or view[0] is not shared:
+        view = _client_views[settings] = (
+            shared,
+            shared.with_options(
+                max_retries=max_retries, timeout=anthropic.Timeout(timeout, connect=connect)
+            ),
+        )
+    return view[1]
+
+
+async def stream_text(client: anthropic.AsyncAnthropic, **params: Any) -> str:
+    """Stream a Messages request through the adaptive rate limiter and return its text.
+
+    Used for long replies, so output starts flowing at once instead of the
+    connection idling until the whole response is ready.
+    """
+    return await get_anthropic_limiter().call(_read_stream, client, params)
+
+
+async def _read_stream(client: anthropic.AsyncAnthropic, params: dict) -> str:
+    async with client.messages.stream(**params) as stream:
+        get_anthropic_limiter().observe_headers(stream.response.headers)
+        chunks = [text async for text in stream.text_stream]
+    return "".join(chunks)
+
+
+async def run_message_batch(
+    client: anthropic.AsyncAnthropic,
+    requests: list[dict],
+    poll_interval: float,
+    max_wait: float,
+) -> dict[str, str]:
+    """Submit requests as one Message Batch and wait for the results.
+
+    Args:
+        requests: {"custom_id": ..., "params": Messages API parameters} per request
+        poll_interval: Seconds between status checks
+        max_wait: Seconds to wait before cancelling the batch
+
+    Returns:
+        custom_id -> response text for every request that succeeded. Anything
+        missing (errors, expiry, or a batch that outlives max_wait) is left to
+        the caller's fallback.
+    """
+    if not requests:
+        return {}
+
+    try:
+        batch = await get_anthropic_limiter().call(
+            client.messages.batches.create, requests=requests
+        )
+        logger.info(f"Submitted message batch {batch.id} ({len(requests)} requests)")
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max_wait
+        while batch.processing_status != "ended":
+            if loop.time() >= deadline:
+                logger.warning(f"Message batch {batch.id} timed out; cancelling")
+                await client.messages.batches.cancel(batch.id)
+                return {}
+            await asyncio.sleep(poll_interval)
+            batch = await client.messages.batches.retrieve(batch.id)
+
+        responses: dict[str, str] = {}
+        async for entry in await client.messages.batches.results(batch.id):
+            if entry.result.type != "succeeded":
+                logger.warning(f"Batch request {entry.custom_id} {entry.result.type}")
+                continue
+            responses[entry.custom_id] = entry.result.message.content[0].text
+        return responses
+
+    except anthropic.APIError as e:
+        logger.error(f"Anthropic API error for message batch: {e}")
+        return {}
+    except Exception as e:
+        logger.error(f"Message batch failed: {e}")
+        return {}
@@ -0,0 +1,14 @@
+"""Markdown code-fence stripping for LLM responses."""
+
+import re
+
+# Optional surrounding whitespace, an opening fence with optional info string
+# ("```json"), the body, then an optional closing fence (it's missing when the
+# response was cut off at max_tokens)
+_FENCE_RE = re.compile(r"\A\s*```[^\n]*\n(.*?)(?:```)?\s*\Z", re.DOTALL)
+
+
+def strip_codefence(text: str) -> str:
+    """Strip a markdown code fence (```lang ... ```) wrapped around a response."""
+    match = _FENCE_RE.match(text)
+    return (match.group(1) if match else text).strip()
@@ -0,0 +1,59 @@
+"""Exact-match LLM response cache.
+
+Responses are stored in the llm_cache table keyed by a hash of the model,
+prompt and generation parameters, so re-running a stage with identical input
+(retries after a partial build, dev iteration) costs nothing. Only use it for
+default-temperature calls; sampled output shouldn't be replayed.
+"""
+
+import hashlib
+import logging
+from datetime import timedelta
+from typing import Any
+
+import orjson
+
+from ..db.repository import repository
+
+logger = logging.getLogger(__name__)
+
+# How long a cached response can be replayed for an identical request
+LLM_CACHE_TTL = timedelta(days=1)
+
+# Process-wide hit/miss counters (for logging)
+stats = {"hits": 0, "misses": 0}
+
+
+def cache_key(model: str, prompt: str, **params: Any) -> tuple[str, str]:
+    """Return (cache_key, prompt_hash) for a request."""
+    prompt_hash = hashlib.sha256(prompt.encode()).hexdigest()
+    payload = orjson.dumps(
+        {"model": model, "prompt_hash": prompt_hash, **params},
+        option=orjson.OPT_SORT_KEYS,
+    )
+    return hashlib.sha256(payload).hexdigest(), prompt_hash
+
+
+async def get_cached(key: str) -> str | None:
+    """Get a cached response, or None on a miss or if the cache is unavailable."""
+    try:
+        cached = await repository.get_cached_response(key, LLM_CACHE_TTL)
+    except Exception as e:
+        logger.debug(f"LLM cache lookup skipped: {e}")
+        cached = None
+
+    if cached is None:
+        stats["misses"] += 1
+        return None
+
+    stats["hits"] += 1
+    logger.debug(f"LLM cache hit: {key[:12]}")
+    return cached
+
+
+async def set_cached(key: str, model: str, prompt_hash: str, content: str) -> None:
+    """Store a response; failures are logged and ignored."""
+    try:
+        await repository.save_cached_response(key, model, prompt_hash, content)
+    except Exception as e:
+        logger.debug(f"LLM cache write skipped: {e}")
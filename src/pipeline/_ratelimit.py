@@ -0,0 +1,152 @@
+"""Adaptive (AIMD) concurrency limiting for Anthropic API calls.
+
+The limit grows additively while calls come back fast and halves on
+throttling (429 / overload / 5xx / timeout), so parallel pipeline stages
+settle near the provider's rate limit instead of tripping it repeatedly.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from datetime import datetime
+from typing import Any, TypeVar
+
+import anthropic
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Errors that mean "back off" rather than "this request is bad"
+THROTTLE_ERRORS = (
+    anthropic.RateLimitError,
+    anthropic.InternalServerError,
+    anthropic.APITimeoutError,
+)
+
+
+class AdaptiveSemaphore:
+    """Concurrency limiter with additive-increase / multiplicative-decrease.
+
+    Usage:
+        limiter = get_anthropic_limiter()
+        raw = await limiter.call(client.messages.with_raw_response.create, ...)
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 32,
+        target_latency: float = 30.0,
+        decrease_factor: float = 0.5,
+    ) -> None:
+        self._limit = float(initial_limit)
+        self._min_limit = min_limit
+        self._max_limit = max_limit
+        self._target_latency = target_latency
+        self._decrease_factor = decrease_factor
+        self._in_flight = 0
+        self._paused_until = 0.0
+        self._condition: asyncio.Condition | None = None
+
+    @property
+    def limit(self) -> int:
+        """Current concurrency limit."""
+        return int(self._limit)
+
+    async def call(self, fn: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any) -> T:
+        """Run an API call inside a slot, adjusting the limit from its outcome."""
+        await self._acquire()
+        started = time.monotonic()
+        try:
+            result = await fn(*args, **kwargs)
+        except THROTTLE_ERRORS as e:
+            self._on_throttle(_retry_after(e))
+            raise
+        finally:
+            await self._release()
+
+        self._on_success(time.monotonic() - started)
+        headers = getattr(result, "headers", None)
+        if headers is not None:
+            self.observe_headers(headers)
+        return result
+
+    def observe_headers(self, headers: Any) -> None:
+        """Pause new calls until the window resets when few requests remain."""
+        remaining = _int_header(headers, "anthropic-ratelimit-requests-remaining")
+        limit = _int_header(headers, "anthropic-ratelimit-requests-limit")
+        if remaining is None:
+            return
+        if remaining <= 2 or (limit and remaining < limit * 0.1):
+            reset = headers.get("anthropic-ratelimit-requests-reset")
+            if reset:
+                try:
+                    delay = datetime.fromisoformat(reset).timestamp() - time.time()
+                except ValueError:
+                    return
+                self._pause(delay)
+
+    async def _acquire(self) -> None:
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+
+        delay = self._paused_until - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def _release(self) -> None:
+        assert self._condition is not None
+        async with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+    def _on_success(self, latency: float) -> None:
+        # +1 per "window" of successful calls, like TCP congestion avoidance
+        if latency <= self._target_latency and self._limit < self._max_limit:
+            self._limit = min(self._max_limit, self._limit + 1 / self._limit)
+
+    def _on_throttle(self, retry_after: float | None) -> None:
+        self._limit = max(self._min_limit, self._limit * self._decrease_factor)
+        logger.warning(f"Anthropic throttled; concurrency limit now {self.limit}")
+        if retry_after:
+            self._pause(retry_after)
+
+    def _pause(self, seconds: float) -> None:
+        if seconds > 0:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+def _int_header(headers: Any, name: str) -> int | None:
+    value = headers.get(name)
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _retry_after(error: Exception) -> float | None:
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    try:
+        return float(response.headers.get("retry-after", ""))
+    except ValueError:
+        return None
+
+
+# Singleton instance shared by every stage that calls Anthropic
+_anthropic_limiter: AdaptiveSemaphore | None = None
+
+
+def get_anthropic_limiter() -> AdaptiveSemaphore:
+    """Get the singleton Anthropic concurrency limiter."""
+    global _anthropic_limiter
+    if _anthropic_limiter is None:
+        _anthropic_limiter = AdaptiveSemaphore()
+    return _anthropic_limiter
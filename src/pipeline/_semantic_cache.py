@@ -0,0 +1,103 @@
+"""Semantic (near-duplicate) cache for enrichment results.
+
+Sits behind the exact-match llm_cache: ideas that are rephrasings of one
+already enriched in this process reuse that enrichment when their Gemini
+embeddings are close enough, trading a cheap embedding call for a full
+generation. Matches are scoped to the submitter, so one user's enrichment
+never shows up on another user's idea. Off unless
+ENRICHMENT_SEMANTIC_CACHE_THRESHOLD is set.
+"""
+
+import asyncio
+import logging
+import math
+from collections import deque
+
+import google.generativeai as genai
+
+from ..core.env import ENRICHMENT_SEMANTIC_CACHE_THRESHOLD
+from ..core.models import EnrichmentOutput
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_MODEL = "models/text-embedding-004"
+
+# Oldest entries are evicted first; a linear scan over this many vectors is cheap
+MAX_ENTRIES = 512
+
+
+class SemanticCache:
+    """In-process nearest-neighbour cache of EnrichmentOutput by embedding."""
+
+    def __init__(self, threshold: float, max_entries: int = MAX_ENTRIES) -> None:
+        self.threshold = threshold
+        # (submitter scope, unit-normalized embedding, output)
+        self._entries: deque[tuple[str | None, list[float], EnrichmentOutput]] = deque(
+            maxlen=max_entries
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return 0.0 < self.threshold <= 1.0
+
+    async def lookup(
+        self, text: str, scope: str | None
+    ) -> tuple[EnrichmentOutput | None, list[float] | None]:
+        """Find a cached output for similar text from the same scope (submitter).
+
+        Returns (match or None, the text's embedding for a later add()). The
+        embedding is None if the cache is disabled or embedding failed.
+        """
+        if not self.enabled:
+            return None, None
+
+        vector = await _embed(text)
+        if vector is None:
+            return None, None
+
+        best_score, best_output = 0.0, None
+        for cached_scope, cached_vector, output in self._entries:
+            if cached_scope != scope:
+                continue
+            score = sum(a * b for a, b in zip(vector, cached_vector))
+            if score > best_score:
+                best_score, best_output = score, output
+
+        if best_output is not None and best_score >= self.threshold:
+            logger.info(f"Semantic cache hit (similarity {best_score:.3f})")
+            return best_output.model_copy(deep=True), vector
+        return None, vector
+
+    def add(self, vector: list[float], output: EnrichmentOutput, scope: str | None) -> None:
+        """Remember an output under its text's embedding and scope (submitter)."""
+        self._entries.append((scope, vector, output.model_copy(deep=True)))
+
+
+async def _embed(text: str) -> list[float] | None:
+    """Embed text with Gemini and unit-normalize it (None on failure)."""
+    try:
+        result = await asyncio.to_thread(
+            genai.embed_content,
+            model=EMBEDDING_MODEL,
+            content=text,
+            task_type="semantic_similarity",
+        )
+        vector = result["embedding"]
+    except Exception as e:
+        logger.warning(f"Embedding failed, skipping semantic cache: {e}")
+        return None
+
+    norm = math.sqrt(sum(x * x for x in vector))
+    return [x / norm for x in vector] if norm else None
+
+
+# Singleton instance
+_semantic_cache: SemanticCache | None = None
+
+
+def get_semantic_cache() -> SemanticCache:
+    """Get the singleton enrichment semantic cache."""
+    global _semantic_cache
+    if _semantic_cache is None:
+        _semantic_cache = SemanticCache(ENRICHMENT_SEMANTIC_CACHE_THRESHOLD)
+    return _semantic_cache
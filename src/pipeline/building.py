@@ -7,14 +7,19 @@ For existing projects, generates patches and targeted new files
 that integrate with the existing codebase.
 """
 
-import json
+import asyncio
+import functools
+import inspect
+import io
 import logging
-import os
+import tarfile
+import time
 from pathlib import Path
 
 import anthropic
-from dotenv import load_dotenv
+import orjson
 
+from ..core.env import ANTHROPIC_USE_BATCH, BUILD_OUTPUT_TAR
 from ..core.models import (
     BuildOutput,
     EnrichmentResult,
@@ -24,45 +29,90 @@ from ..core.models import (
     ProjectMode,
     ScaffoldingResult,
 )
+from . import _llm_cache
+from ._anthropic import get_anthropic_client_view, run_message_batch, stream_text
+from ._codefence import strip_codefence
+from ._ratelimit import get_anthropic_limiter
 
-# Load shared env first, then local can override
-shared_env = Path.home() / ".env.shared"
-if shared_env.exists():
-    load_dotenv(shared_env)
-load_dotenv()
 logger = logging.getLogger(__name__)
 
-# Initialize Anthropic client
-client = anthropic.Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY", ""))
+
+def _client() -> anthropic.AsyncAnthropic:
+    """Get the build stage's view of the shared Anthropic client.
+
+    Build requests share the pipeline's connection pool, with more retries
+    and a tighter timeout than the defaults.
+    """
+    return get_anthropic_client_view(max_retries=5, timeout=60.0, connect=5.0)
+
 
 # Output directory for generated projects
 BUILD_OUTPUT_DIR = Path(__file__).parent.parent.parent / "output" / "projects"
 
-SINGLE_FILE_PROMPT = """You are an expert software engineer. Generate code for a single file.
+# Archive name used when BUILD_OUTPUT_TAR is set
+BUILD_TAR_NAME = "project.tar"
 
-## PROJECT: {title}
+# Max Claude file generations in flight per build
+MAX_CONCURRENT_GENERATIONS = 8
+
+# Model used for all build generations (part of the LLM cache key)
+BUILD_MODEL = "claude-sonnet-4-20250514"
+
+# Output token ceilings per file category; config files are short, so a
+# smaller ceiling keeps their requests cheap and quick
+TOKEN_BUDGETS = {"config": 1024, "src": 4096, "docs": 2048}
+
+# Message Batches polling: how often to check, and how long to wait before
+# cancelling and falling back to live requests
+BATCH_POLL_INTERVAL = 10.0
+BATCH_MAX_WAIT = 3600.0
+
+# New-project file prompts are split into system blocks (static instructions,
+# then per-build project context) and a per-file user message. The shared
+# prefix is a few hundred tokens, below the API's minimum cacheable prompt
+# (1024 tokens), so the blocks carry no cache_control breakpoints.
+SINGLE_FILE_INSTRUCTIONS = """You are an expert software engineer. Generate production-quality \
+code for the requested file: tech-stack best practices, proper imports, consistent with the \
+project architecture.
+
+Return ONLY the raw file content - no JSON wrapper, no markdown code blocks.
+"""
+
+SINGLE_FILE_CONTEXT = """## PROJECT: {title}
 {description}
 
 ## TECH STACK: {tech_stack}
+"""
 
-## FILE TO GENERATE: {file_path}
+SINGLE_FILE_PROMPT = """## FILE TO GENERATE: {file_path}
+"""
 
-Generate production-quality code for this file. The code should:
-1. Follow best practices for the tech stack
-2. Include proper imports
-3. Be consistent with the project architecture
+CONFIG_FILE_INSTRUCTIONS = """Generate the requested config file with production settings for the \
+project below.
 
-Return ONLY the file content - no JSON wrapper, no markdown code blocks, just the raw file content.
+Return ONLY the raw file content - no JSON wrapper, no markdown code blocks.
+"""
+
+CONFIG_FILE_CONTEXT = """## PROJECT: {title}
+## PRIMARY STACK: {tech_stack_primary}
+## TECH STACK: {tech_stack}
+"""
+
+CONFIG_FILE_PROMPT = """## FILE: {file_path}
 """
 
-CONFIG_FILE_PROMPT = """Generate a config file for a {tech_stack_primary} project.
+CONFIG_BATCH_PROMPT = """Generate config files for a {tech_stack_primary} project.
 
 ## PROJECT: {title}
-## FILE: {file_path}
 ## TECH STACK: {tech_stack}
 
+## FILES:
+{file_list}
+
 Generate appropriate settings for a production project.
-Return ONLY the file content - no JSON wrapper, no markdown code blocks, just the raw config file content.
+Return ONLY a JSON object mapping each file path above to its complete raw file content, like:
+{{"<file path>": "<file content>"}}
+No markdown code blocks, no commentary.
 """
 
 EXISTING_PROJECT_NEW_FILE_PROMPT = """You are an expert software engineer. Generate a NEW file that integrates with an existing project.
@@ -143,12 +193,20 @@ async def build_project(
         ValueError: If building fails
     """
     logger.info(f"Starting build for idea: {idea_id}")
+    hits, misses = _llm_cache.stats["hits"], _llm_cache.stats["misses"]
 
     # Determine mode
-    if idea and idea.mode != ProjectMode.NEW:
-        return await _build_existing_project(idea_id, enrichment, scaffolding, idea)
-    else:
-        return await _build_new_project(idea_id, enrichment, scaffolding)
+    try:
+        if idea and idea.mode != ProjectMode.NEW:
+            return await _build_existing_project(idea_id, enrichment, scaffolding, idea)
+        else:
+            return await _build_new_project(idea_id, enrichment, scaffolding)
+    finally:
+        logger.info(
+            f"LLM cache for build {idea_id}: "
+            f"{_llm_cache.stats['hits'] - hits} hits, "
+            f"{_llm_cache.stats['misses'] - misses} misses"
+        )
 
 
 async def _build_new_project(
@@ -161,8 +219,6 @@ async def _build_new_project(
     project_dir = BUILD_OUTPUT_DIR / idea_id
     project_dir.mkdir(parents=True, exist_ok=True)
 
-    artifacts: list[str] = []
-
     try:
         # Prioritize essential files to generate (limit to avoid long builds)
         essential_files = _select_essential_files(
@@ -170,30 +226,76 @@ async def _build_new_project(
             scaffolding.tech_stack,
         )
 
-        # Generate essential files one at a time
-        for category, file_path in essential_files:
-            is_config = category == "config"
-            content = await _generate_single_file(
-                enrichment.enhanced_title,
-                enrichment.enhanced_description,
-                scaffolding.tech_stack,
-                file_path,
-                is_config=is_config,
+        # Generate essential files concurrently (bounded), then write them in order
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_GENERATIONS)
+
+        async def generate(category: str, file_path: str) -> str | None:
+            async with semaphore:
+                return await _generate_single_file(
+                    enrichment.enhanced_title,
+                    enrichment.enhanced_description,
+                    scaffolding.tech_stack,
+                    file_path,
+                    category,
+                )
+
+        generated: dict[str, str | None]
+        if ANTHROPIC_USE_BATCH:
+            # One Message Batch for every file: half the token cost, no latency guarantee
+            generated = dict(
+                await _generate_files_via_batch_api(
+                    {
+                        file_path: (
+                            *_single_file_prompt(
+                                enrichment.enhanced_title,
+                                enrichment.enhanced_description,
+                                scaffolding.tech_stack,
+                                file_path,
+                                category,
+                            ),
+                            _token_budget(category),
+                        )
+                        for category, file_path in essential_files
+                    }
+                )
+            )
+        else:
+            # Config files share one batched request; everything else is generated per file
+            batch_paths = [path for category, path in essential_files if category == "config"]
+            if len(batch_paths) < 2:
+                batch_paths = []
+            individual = [(c, path) for c, path in essential_files if path not in batch_paths]
+
+            batched, *individual_contents = await asyncio.gather(
+                _generate_config_batch(
+                    enrichment.enhanced_title, scaffolding.tech_stack, batch_paths
+                ),
+                *(generate(category, file_path) for category, file_path in individual),
+            )
+            generated = dict(zip((path for _c, path in individual), individual_contents))
+            generated.update(batched)
+
+        # Fall back to per-file generation for anything a batch didn't return
+        missing = [(c, path) for c, path in essential_files if path not in generated]
+        if missing:
+            contents = await asyncio.gather(
+                *(generate(category, file_path) for category, file_path in missing)
             )
+            generated.update(zip((path for _c, path in missing), contents))
 
-            if content:
-                written = await _write_single_file(project_dir, file_path, content)
-                if written:
-                    artifacts.append(file_path)
+        outputs = [
+            (file_path, generated[file_path])
+            for _category, file_path in essential_files
+            if generated.get(file_path)
+        ]
+        # The blueprint is always written as BLUEPRINT.md
+        outputs.append(("BLUEPRINT.md", scaffolding.blueprint_content))
 
-        # Write the blueprint as BLUEPRINT.md
-        blueprint_path = project_dir / "BLUEPRINT.md"
-        blueprint_path.write_text(scaffolding.blueprint_content)
-        artifacts.append("BLUEPRINT.md")
+        artifacts = await asyncio.to_thread(_write_outputs, project_dir, outputs)
 
         # Determine outcome based on essential files generated
         essential_count = len(essential_files)
-        actual_count = len(artifacts) - 1  # Exclude BLUEPRINT.md from count
+        actual_count = len(artifacts) - ("BLUEPRINT.md" in artifacts)
 
         if actual_count >= essential_count * 0.8:
             outcome = "success"
@@ -225,66 +327,62 @@ async def _build_existing_project(
     idea: Idea,
 ) -> BuildOutput:
     """Build patches and new files for an existing project."""
-    # Create output directories
+    # Create output directory (patches/ and new/ are created as files are written)
     project_dir = BUILD_OUTPUT_DIR / idea_id
-    patches_dir = project_dir / "patches"
-    new_files_dir = project_dir / "new"
-
     project_dir.mkdir(parents=True, exist_ok=True)
-    patches_dir.mkdir(parents=True, exist_ok=True)
-    new_files_dir.mkdir(parents=True, exist_ok=True)
 
-    artifacts: list[str] = []
     project_name = idea.project_source.location.split("/")[-1] if idea.project_source else "project"
 
     try:
-        # Generate patches for file modifications
-        for modification in scaffolding.file_modifications:
-            patch_content = await _generate_patch(
-                project_name,
-                enrichment.enhanced_title,
-                enrichment.enhanced_description,
-                scaffolding.tech_stack,
-                modification,
-            )
-
-            if patch_content:
-                # Write patch file
-                safe_filename = modification.file_path.replace("/", "_").replace("\\", "_")
-                patch_path = patches_dir / f"{safe_filename}.patch"
-                patch_path.write_text(patch_content)
-                artifacts.append(f"patches/{safe_filename}.patch")
-                logger.debug(f"Generated patch for: {modification.file_path}")
-
-        # Generate new files
-        for new_file in scaffolding.new_files:
-            content = await _generate_integration_file(
-                project_name,
-                enrichment.enhanced_title,
-                enrichment.enhanced_description,
-                scaffolding.tech_stack,
-                new_file,
-            )
+        # Generate patches and new files concurrently (bounded), then write them in order
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_GENERATIONS)
+
+        async def generate_patch(modification: FileModification) -> str | None:
+            async with semaphore:
+                return await _generate_patch(
+                    project_name,
+                    enrichment.enhanced_title,
+                    enrichment.enhanced_description,
+                    scaffolding.tech_stack,
+                    modification,
+                )
+
+        async def generate_new_file(new_file: NewFileSpec) -> str | None:
+            async with semaphore:
+                return await _generate_integration_file(
+                    project_name,
+                    enrichment.enhanced_title,
+                    enrichment.enhanced_description,
+                    scaffolding.tech_stack,
+                    new_file,
+                )
+
+        patch_contents, new_file_contents = await asyncio.gather(
+            asyncio.gather(*(generate_patch(m) for m in scaffolding.file_modifications)),
+            asyncio.gather(*(generate_new_file(f) for f in scaffolding.new_files)),
+        )
 
-            if content:
-                written = await _write_single_file(new_files_dir, new_file.file_path, content)
-                if written:
-                    artifacts.append(f"new/{new_file.file_path}")
-                    logger.debug(f"Generated new file: {new_file.file_path}")
+        outputs: list[tuple[str, str]] = [
+            (f"patches/{_patch_filename(modification.file_path)}.patch", patch_content)
+            for modification, patch_content in zip(scaffolding.file_modifications, patch_contents)
+            if patch_content
+        ]
+        outputs.extend(
+            (f"new/{new_file.file_path}", content)
+            for new_file, content in zip(scaffolding.new_files, new_file_contents)
+            if content
+        )
 
-        # Write the blueprint as BLUEPRINT.md
-        blueprint_path = project_dir / "BLUEPRINT.md"
-        blueprint_path.write_text(scaffolding.blueprint_content)
-        artifacts.append("BLUEPRINT.md")
+        # The blueprint is always written as BLUEPRINT.md
+        outputs.append(("BLUEPRINT.md", scaffolding.blueprint_content))
 
         # Write a manifest of preserved files
         if scaffolding.preserved_files:
-            manifest_content = "# Preserved Files\n\nThese files should NOT be modified:\n\n"
-            for f in scaffolding.preserved_files:
-                manifest_content += f"- {f}\n"
-            manifest_path = project_dir / "PRESERVED_FILES.md"
-            manifest_path.write_text(manifest_content)
-            artifacts.append("PRESERVED_FILES.md")
+            manifest_content = "".join(
+                ["# Preserved Files\n\nThese files should NOT be modified:\n\n"]
+                + [f"- {f}\n" for f in scaffolding.preserved_files]
+            )
+            outputs.append(("PRESERVED_FILES.md", manifest_content))
 
         # Write application instructions
         instructions = _generate_application_instructions(
@@ -293,13 +391,13 @@ async def _build_existing_project(
             scaffolding.new_files,
             scaffolding.preserved_files,
         )
-        instructions_path = project_dir / "APPLY_CHANGES.md"
-        instructions_path.write_text(instructions)
-        artifacts.append("APPLY_CHANGES.md")
+        outputs.append(("APPLY_CHANGES.md", instructions))
 
-        # Determine outcome
+        artifacts = await asyncio.to_thread(_write_outputs, project_dir, outputs)
+
+        # Determine outcome (generated patches/new files that made it to disk)
         total_expected = len(scaffolding.file_modifications) + len(scaffolding.new_files)
-        actual_count = len(artifacts) - 3  # Exclude BLUEPRINT.md, PRESERVED_FILES.md, APPLY_CHANGES.md
+        actual_count = sum(1 for path in artifacts if path.startswith(("patches/", "new/")))
 
         if total_expected == 0:
             outcome = "success"  # No changes expected
@@ -343,6 +441,9 @@ def _select_essential_files(
     Returns list of (category, file_path) tuples.
     """
     selected: list[tuple[str, str]] = []
+    config_files = frozenset(project_structure.get("config", ()))
+    src_files = project_structure.get("src", [])
+    docs_files = frozenset(project_structure.get("docs", ()))
 
     # Detect primary language from tech stack
     tech_lower = " ".join(tech_stack).lower()
@@ -362,7 +463,7 @@ def _select_essential_files(
         config_priority = ["package.json", "tsconfig.json", ".env.example", "Dockerfile"]
 
     for cf in config_priority:
-        if cf in project_structure.get("config", []):
+        if cf in config_files:
             selected.append(("config", cf))
             if len(selected) >= max_files:
                 return selected
@@ -377,76 +478,169 @@ def _select_essential_files(
     else:  # TypeScript/JavaScript default
         src_priority_patterns = ["app.ts", "index.ts", "main.ts", "server.ts"]
 
-    src_files = project_structure.get("src", [])
-    for pattern in src_priority_patterns:
-        for sf in src_files:
-            if sf.endswith(pattern):
-                selected.append(("src", sf))
-                if len(selected) >= max_files:
-                    return selected
-                break
+    # One pass: first file matching each pattern, then emit in pattern priority order
+    patterns = tuple(src_priority_patterns)
+    first_match: dict[int, str] = {}
+    for sf in src_files:
+        rank = next((i for i, pattern in enumerate(patterns) if sf.endswith(pattern)), None)
+        if rank is not None:
+            first_match.setdefault(rank, sf)
+
+    selected_src: set[str] = set()
+    for rank in sorted(first_match):
+        sf = first_match[rank]
+        selected.append(("src", sf))
+        selected_src.add(sf)
+        if len(selected) >= max_files:
+            return selected
 
     # Add a few more src files
     for sf in src_files[:3]:
-        if ("src", sf) not in selected:
+        if sf not in selected_src:
             selected.append(("src", sf))
+            selected_src.add(sf)
             if len(selected) >= max_files:
                 return selected
 
     # README
-    if "docs/README.md" in project_structure.get("docs", []):
+    if "docs/README.md" in docs_files:
         selected.append(("docs", "docs/README.md"))
-    elif "README.md" in project_structure.get("docs", []):
+    elif "README.md" in docs_files:
         selected.append(("docs", "README.md"))
 
     return selected
 
 
-async def _generate_single_file(
-    title: str,
-    description: str,
-    tech_stack: list[str],
-    file_path: str,
-    is_config: bool = False,
-) -> str | None:
-    """Generate a single file's content using Claude."""
+def _system_blocks(*blocks: str) -> list[dict]:
+    """System prompt text blocks."""
+    return [{"type": "text", "text": block} for block in blocks]
+
+
+def _request_params(prompt: str, max_tokens: int, system: list[dict] | None) -> dict:
+    """Messages API parameters shared by live, streamed and batched requests."""
+    params: dict = {
+        "model": BUILD_MODEL,
+        "max_tokens": max_tokens,
+        "messages": [{"role": "user", "content": prompt}],
+    }
+    if system:
+        params["system"] = system
+    return params
+
+
+async def _create_message(
+    prompt: str, max_tokens: int = 4096, system: list[dict] | None = None
+) -> anthropic.types.Message:
+    """Send a single-prompt request through the shared adaptive rate limiter."""
+    raw = await get_anthropic_limiter().call(
+        _client().messages.with_raw_response.create,
+        **_request_params(prompt, max_tokens, system),
+    )
+    message = raw.parse()
+    # parse() is a coroutine on newer SDK releases and sync on older ones
+    if inspect.isawaitable(message):
+        message = await message
+    return message
+
+
+async def _generate_text(
+    prompt: str,
+    max_tokens: int = 4096,
+    stream: bool = False,
+    system: list[dict] | None = None,
+) -> str:
+    """Get the response text for a prompt, reusing a cached response when present.
+
+    Retried builds send identical prompts, so they're served from llm_cache
+    instead of paying for the same generation again. Cache errors never fail
+    the build; they just fall through to a live request.
+    """
+    cache_key, prompt_hash = _llm_cache.cache_key(
+        BUILD_MODEL,
+        prompt,
+        max_tokens=max_tokens,
+        system="".join(block["text"] for block in system or ()),
+    )
+    cached = await _llm_cache.get_cached(cache_key)
+    if cached is not None:
+        return cached
+
+    if stream:
+        # Long source files stream so output starts flowing before the ceiling is reached
+        text = await stream_text(_client(), **_request_params(prompt, max_tokens, system))
+    else:
+        message = await _create_message(prompt, max_tokens=max_tokens, system=system)
+        text = message.content[0].text
+
+    await _llm_cache.set_cached(cache_key, BUILD_MODEL, prompt_hash, text)
+    return text
+
+
+@functools.lru_cache(maxsize=32)
+def _file_system_blocks(
+    title: str, description: str, tech_stack: tuple[str, ...], is_config: bool
+) -> list[dict]:
+    """System blocks for a build's file prompts.
+
+    Every file in a build shares the same project context, so it's formatted
+    once per build instead of once per file. Callers must not mutate the result.
+    """
     if is_config:
-        prompt = CONFIG_FILE_PROMPT.format(
+        context = CONFIG_FILE_CONTEXT.format(
             title=title,
             tech_stack=", ".join(tech_stack),
             tech_stack_primary=tech_stack[0] if tech_stack else "Node.js",
-            file_path=file_path,
-        )
-    else:
-        prompt = SINGLE_FILE_PROMPT.format(
-            title=title,
-            description=description,
-            tech_stack=", ".join(tech_stack),
-            file_path=file_path,
         )
+        return _system_blocks(CONFIG_FILE_INSTRUCTIONS, context)
+    context = SINGLE_FILE_CONTEXT.format(
+        title=title,
+        description=description,
+        tech_stack=", ".join(tech_stack),
+    )
+    return _system_blocks(SINGLE_FILE_INSTRUCTIONS, context)
 
-    try:
-        message = client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=4096,
-            messages=[
-                {"role": "user", "content": prompt}
-            ],
-        )
 
-        response_text = message.content[0].text.strip()
+def _token_budget(category: str) -> int:
+    """Output token ceiling for a project_structure category (src for anything else)."""
+    return TOKEN_BUDGETS.get(category, TOKEN_BUDGETS["src"])
 
-        # Clean up response if wrapped in markdown code blocks
-        if response_text.startswith("```"):
-            first_newline = response_text.find("\n")
-            if first_newline > 0:
-                response_text = response_text[first_newline + 1:]
-            else:
-                response_text = response_text[3:]
-        if response_text.endswith("```"):
-            response_text = response_text[:-3]
 
-        return response_text.strip()
+def _single_file_prompt(
+    title: str,
+    description: str,
+    tech_stack: list[str],
+    file_path: str,
+    category: str = "src",
+) -> tuple[list[dict], str]:
+    """Build the (system blocks, user prompt) pair for one new-project file."""
+    is_config = category == "config"
+    system = _file_system_blocks(title, description, tuple(tech_stack), is_config)
+    template = CONFIG_FILE_PROMPT if is_config else SINGLE_FILE_PROMPT
+    return system, template.format(file_path=file_path)
+
+
+async def _generate_single_file(
+    title: str,
+    description: str,
+    tech_stack: list[str],
+    file_path: str,
+    category: str = "src",
+) -> str | None:
+    """Generate a single file's content using Claude.
+
+    category is the project_structure key the file came from, and picks both
+    the prompt and the output token budget.
+    """
+    system, prompt = _single_file_prompt(title, description, tech_stack, file_path, category)
+
+    try:
+        text = await _generate_text(
+            prompt,
+            max_tokens=_token_budget(category),
+            stream=category != "config",
+            system=system,
+        )
+        return strip_codefence(text)
 
     except anthropic.APIError as e:
         logger.error(f"Anthropic API error for {file_path}: {e}")
@@ -456,6 +650,87 @@ async def _generate_single_file(
         return None
 
 
+async def _generate_files_via_batch_api(
+    prompts: dict[str, tuple[list[dict], str, int]],
+) -> dict[str, str]:
+    """Generate files through one Anthropic Message Batch.
+
+    Args:
+        prompts: File path -> (system blocks, user prompt, max tokens)
+
+    Returns:
+        File path -> content for every request that succeeded. Anything
+        missing (errors, expiry, or a batch that outlives BATCH_MAX_WAIT)
+        is left to the caller's per-file fallback.
+    """
+    # custom_id only allows [a-zA-Z0-9_-], so file paths are mapped to indices
+    paths = list(prompts)
+    responses = await run_message_batch(
+        _client(),
+        [
+            {
+                "custom_id": f"file-{i}",
+                "params": _request_params(prompts[path][1], prompts[path][2], prompts[path][0]),
+            }
+            for i, path in enumerate(paths)
+        ],
+        poll_interval=BATCH_POLL_INTERVAL,
+        max_wait=BATCH_MAX_WAIT,
+    )
+    return {
+        paths[int(custom_id.removeprefix("file-"))]: strip_codefence(text)
+        for custom_id, text in responses.items()
+    }
+
+
+async def _generate_config_batch(
+    title: str,
+    tech_stack: list[str],
+    file_paths: list[str],
+) -> dict[str, str]:
+    """Generate several config files in one Claude request.
+
+    Returns a mapping of file path to content for the files the response
+    included; callers fall back to per-file generation for the rest.
+    """
+    if not file_paths:
+        return {}
+
+    prompt = CONFIG_BATCH_PROMPT.format(
+        title=title,
+        tech_stack=", ".join(tech_stack),
+        tech_stack_primary=tech_stack[0] if tech_stack else "Node.js",
+        file_list="\n".join(f"- {file_path}" for file_path in file_paths),
+    )
+
+    try:
+        max_tokens = min(8192, TOKEN_BUDGETS["config"] * len(file_paths))
+        cache_key, prompt_hash = _llm_cache.cache_key(BUILD_MODEL, prompt, max_tokens=max_tokens)
+        cached = await _llm_cache.get_cached(cache_key)
+        if cached is not None:
+            text = cached
+        else:
+            message = await _create_message(prompt, max_tokens=max_tokens)
+            text = message.content[0].text
+
+        files = orjson.loads(strip_codefence(text))
+        # Only cache replies that parsed, so a truncated batch isn't replayed
+        if cached is None:
+            await _llm_cache.set_cached(cache_key, BUILD_MODEL, prompt_hash, text)
+        return {
+            file_path: content.strip()
+            for file_path, content in files.items()
+            if file_path in file_paths and isinstance(content, str)
+        }
+
+    except anthropic.APIError as e:
+        logger.error(f"Anthropic API error for config batch: {e}")
+        return {}
+    except Exception as e:
+        logger.error(f"Config batch generation failed: {e}")
+        return {}
+
+
 async def _generate_patch(
     project_name: str,
     title: str,
@@ -476,23 +751,8 @@ async def _generate_patch(
     )
 
     try:
-        message = client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=4096,
-            messages=[{"role": "user", "content": prompt}],
-        )
-
-        response_text = message.content[0].text.strip()
-
-        # Clean up if wrapped in code blocks
-        if response_text.startswith("```"):
-            first_newline = response_text.find("\n")
-            if first_newline > 0:
-                response_text = response_text[first_newline + 1:]
-        if response_text.endswith("```"):
-            response_text = response_text[:-3]
-
-        return response_text.strip()
+        text = await _generate_text(prompt, max_tokens=TOKEN_BUDGETS["src"], stream=True)
+        return strip_codefence(text)
 
     except anthropic.APIError as e:
         logger.error(f"Anthropic API error for patch {modification.file_path}: {e}")
@@ -521,23 +781,8 @@ async def _generate_integration_file(
     )
 
     try:
-        message = client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=4096,
-            messages=[{"role": "user", "content": prompt}],
-        )
-
-        response_text = message.content[0].text.strip()
-
-        # Clean up if wrapped in code blocks
-        if response_text.startswith("```"):
-            first_newline = response_text.find("\n")
-            if first_newline > 0:
-                response_text = response_text[first_newline + 1:]
-        if response_text.endswith("```"):
-            response_text = response_text[:-3]
-
-        return response_text.strip()
+        text = await _generate_text(prompt, max_tokens=TOKEN_BUDGETS["src"], stream=True)
+        return strip_codefence(text)
 
     except anthropic.APIError as e:
         logger.error(f"Anthropic API error for new file {new_file.file_path}: {e}")
@@ -547,17 +792,49 @@ async def _generate_integration_file(
         return None
 
 
-async def _write_single_file(project_dir: Path, file_path: str, content: str) -> bool:
-    """Write a single generated file to disk."""
-    try:
-        full_path = project_dir / file_path
-        full_path.parent.mkdir(parents=True, exist_ok=True)
-        full_path.write_text(content)
-        logger.debug(f"Wrote file: {file_path}")
-        return True
-    except Exception as e:
-        logger.warning(f"Failed to write file {file_path}: {e}")
-        return False
+def _patch_filename(file_path: str) -> str:
+    """Flatten a project path into the patch file name used under patches/."""
+    return file_path.replace("/", "_").replace("\\", "_")
+
+
+def _write_outputs(project_dir: Path, outputs: list[tuple[str, str]]) -> list[str]:
+    """Write build outputs under project_dir (blocking; run via to_thread).
+
+    All files are written in one worker-thread hop. With BUILD_OUTPUT_TAR set
+    they're packed into a single uncompressed project.tar instead, so slow or
+    network-backed output directories take one write rather than one per file.
+
+    Returns the relative paths that were written.
+    """
+    if BUILD_OUTPUT_TAR:
+        buffer = io.BytesIO()
+        mtime = int(time.time())
+        with tarfile.open(fileobj=buffer, mode="w") as tar:
+            for rel_path, content in outputs:
+                data = content.encode()
+                info = tarfile.TarInfo(rel_path)
+                info.size = len(data)
+                info.mtime = mtime
+                tar.addfile(info, io.BytesIO(data))
+        (project_dir / BUILD_TAR_NAME).write_bytes(buffer.getvalue())
+        logger.debug(f"Wrote {len(outputs)} files to {BUILD_TAR_NAME}")
+        return [rel_path for rel_path, _content in outputs]
+
+    written: list[str] = []
+    for rel_path, content in outputs:
+        try:
+            _write_text_with_parents(project_dir / rel_path, content)
+            written.append(rel_path)
+            logger.debug(f"Wrote file: {rel_path}")
+        except Exception as e:
+            logger.warning(f"Failed to write file {rel_path}: {e}")
+    return written
+
+
+def _write_text_with_parents(path: Path, content: str) -> None:
+    """Create parent directories and write the file (blocking; run via to_thread)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
 
 
 def _generate_application_instructions(
@@ -567,7 +844,8 @@ def _generate_application_instructions(
     preserved_files: list[str],
 ) -> str:
     """Generate instructions for applying changes to the existing project."""
-    instructions = f"""# How to Apply Changes to {project_name}
+    parts: list[str] = [
+        f"""# How to Apply Changes to {project_name}
 
 This document explains how to apply the generated changes to your existing project.
 
@@ -591,35 +869,38 @@ cd /path/to/{project_name}
 
 # Apply each patch (review first!)
 """
+    ]
 
-    for mod in modifications:
-        safe_filename = mod.file_path.replace("/", "_").replace("\\", "_")
-        instructions += f"git apply /path/to/output/patches/{safe_filename}.patch\n"
+    parts.extend(
+        f"git apply /path/to/output/patches/{_patch_filename(mod.file_path)}.patch\n"
+        for mod in modifications
+    )
 
-    instructions += """```
+    parts.append("""```
 
 ## Step 3: Add New Files
 
 Copy new files from the `new/` directory to your project:
 
 ```bash
-"""
+""")
 
-    for nf in new_files:
-        instructions += f"cp /path/to/output/new/{nf.file_path} /path/to/{project_name}/{nf.file_path}\n"
+    parts.extend(
+        f"cp /path/to/output/new/{nf.file_path} /path/to/{project_name}/{nf.file_path}\n"
+        for nf in new_files
+    )
 
-    instructions += """```
+    parts.append("""```
 
 ## Step 4: Preserved Files
 
 The following files were identified as critical and should NOT be modified:
 
-"""
+""")
 
-    for pf in preserved_files:
-        instructions += f"- `{pf}`\n"
+    parts.extend(f"- `{pf}`\n" for pf in preserved_files)
 
-    instructions += """
+    parts.append("""
 
 ## Step 5: Test
 
@@ -634,6 +915,6 @@ After applying changes:
 - Patches are in unified diff format and can be applied with `git apply` or `patch`
 - If patches fail to apply cleanly, manually review and integrate the changes
 - New files may need import adjustments based on your exact project structure
-"""
+""")
 
-    return instructions
+    return "".join(parts)
@@ -4,28 +4,37 @@ Takes raw idea input and produces enhanced description,
 problem statement, and market context.
 """
 
-import json
 import logging
-import os
-from pathlib import Path
 
 import google.generativeai as genai
-from dotenv import load_dotenv
+import orjson
 
+from ..core.env import GOOGLE_API_KEY
 from ..core.models import EnrichmentOutput, Idea, ProjectAnalysisResult, ProjectMode
+from . import _llm_cache
+from ._codefence import strip_codefence
+from ._semantic_cache import get_semantic_cache
 
-# Load shared env first, then local can override
-shared_env = Path.home() / ".env.shared"
-if shared_env.exists():
-    load_dotenv(shared_env)
-load_dotenv()
 logger = logging.getLogger(__name__)
 
 # Configure Gemini
-genai.configure(api_key=os.getenv("GOOGLE_API_KEY", ""))
+genai.configure(api_key=GOOGLE_API_KEY)
 
-ENRICHMENT_PROMPT = """You are an expert product analyst and innovation strategist.
-Analyze this idea and provide structured enrichment data.
+ENRICHMENT_MODEL = "gemini-2.0-flash"
+
+# Shared model handle, created on first use
+_model: genai.GenerativeModel | None = None
+
+
+def get_enrichment_model() -> genai.GenerativeModel:
+    """Get the shared Gemini model used for enrichment (lazy initialization)."""
+    global _model
+    if _model is None:
+        _model = genai.GenerativeModel(ENRICHMENT_MODEL)
+    return _model
+
+
+ENRICHMENT_PROMPT = """You are an expert product analyst. Enrich this idea.
 
 IDEA TITLE: {title}
 
@@ -34,32 +43,18 @@ IDEA DESCRIPTION:
 
 TAGS: {tags}
 
-Your task is to enhance this idea with deeper analysis. Provide a JSON response with this exact structure:
-
-{{
-  "enhanced_title": "<improved, more specific title>",
-  "enhanced_description": "<2-3 paragraph comprehensive description of what this idea entails>",
-  "problem_statement": "<clear articulation of the problem this solves>",
-  "potential_solutions": [
-    "<approach 1>",
-    "<approach 2>",
-    "<approach 3>"
-  ],
-  "market_context": "<analysis of market opportunity, competitors, and positioning>"
-}}
-
-Be specific and analytical. Focus on:
-1. Clarifying the core value proposition
-2. Identifying the target user/customer
-3. Articulating the problem clearly
-4. Suggesting concrete implementation approaches
-5. Understanding the competitive landscape
-
-Return ONLY valid JSON, no markdown code blocks or explanation.
+Return ONLY valid JSON, no markdown code blocks:
+{{"enhanced_title": "<more specific title>",
+"enhanced_description": "<2-3 paragraphs>",
+"problem_statement": "<problem it solves>",
+"potential_solutions": ["<approach 1>", "<approach 2>", "<approach 3>"],
+"market_context": "<opportunity, competitors, positioning>"}}
+
+Be specific: value proposition, target user, concrete approaches, competitive landscape.
 """
 
-EXISTING_PROJECT_ENRICHMENT_PROMPT = """You are an expert product analyst and innovation strategist.
-Analyze this enhancement/completion idea for an EXISTING project.
+EXISTING_PROJECT_ENRICHMENT_PROMPT = """You are an expert product analyst.
+Enrich this enhancement/completion idea for an EXISTING project.
 
 IDEA TITLE: {title}
 
@@ -68,38 +63,26 @@ IDEA DESCRIPTION (User's Goals):
 
 TAGS: {tags}
 
-EXISTING PROJECT CONTEXT:
-- Project Name: {project_name}
+EXISTING PROJECT:
+- Name: {project_name}
 - Tech Stack: {tech_stack}
-- Architecture Patterns: {patterns}
-- Detected Entry Points: {entry_points}
+- Patterns: {patterns}
+- Entry Points: {entry_points}
 
 {mode_specific_context}
 
 README Summary:
 {readme_summary}
 
-Your task is to enhance this idea with context-aware analysis. Provide a JSON response with this exact structure:
-
-{{
-  "enhanced_title": "<improved title that references the existing project>",
-  "enhanced_description": "<2-3 paragraph description of what this enhancement/completion entails, referencing existing architecture>",
-  "problem_statement": "<clear articulation of the problem this solves, in context of the existing project>",
-  "potential_solutions": [
-    "<approach 1 that integrates with existing patterns>",
-    "<approach 2 that builds on existing architecture>",
-    "<approach 3 alternative approach>"
-  ],
-  "market_context": "<value this enhancement adds to the project, competitive positioning>"
-}}
-
-Be specific and reference the existing project context. Focus on:
-1. How this enhancement fits into the existing architecture
-2. What existing patterns to follow
-3. Integration points with current code
-4. Maintaining consistency with the project's style
-
-Return ONLY valid JSON, no markdown code blocks or explanation.
+Return ONLY valid JSON, no markdown code blocks:
+{{"enhanced_title": "<title referencing the project>",
+"enhanced_description": "<2-3 paragraphs referencing existing architecture>",
+"problem_statement": "<problem it solves in this project>",
+"potential_solutions": ["<approach using existing patterns>",
+"<approach building on the architecture>", "<alternative>"],
+"market_context": "<value added, positioning>"}}
+
+Reference the existing architecture, patterns to follow, integration points, and code style.
 """
 
 
@@ -158,10 +141,9 @@ async def enrich_idea(
     """
     logger.info(f"Starting enrichment for idea: {idea.id}")
 
-    model = genai.GenerativeModel("gemini-2.0-flash")
-
     # Build prompt based on mode
-    if analysis and idea.mode != ProjectMode.NEW:
+    is_existing = analysis is not None and idea.mode != ProjectMode.NEW
+    if is_existing:
         # Existing project: use context-aware prompt
         prompt = _build_existing_project_prompt(idea, analysis)
     else:
@@ -173,20 +155,31 @@ async def enrich_idea(
         )
 
     try:
-        response = await model.generate_content_async(prompt)
-        response_text = response.text.strip()
+        cache_key, prompt_hash = _llm_cache.cache_key(ENRICHMENT_MODEL, prompt)
+        cached = await _llm_cache.get_cached(cache_key)
+        vector = None
+        if cached is not None:
+            response_text = cached
+        else:
+            # Near-duplicate new-project ideas reuse an earlier enrichment from
+            # the same submitter. Existing-project prompts depend on their
+            # analysis, so they don't.
+            if not is_existing:
+                similar, vector = await get_semantic_cache().lookup(
+                    f"{idea.title}\n{idea.raw_content}", idea.submitted_by
+                )
+                if similar is not None:
+                    logger.info(f"Enrichment reused from a similar idea: {idea.id}")
+                    return similar
+
+            response = await get_enrichment_model().generate_content_async(prompt)
+            response_text = response.text.strip()
 
         # Clean up response if wrapped in markdown
-        if response_text.startswith("```json"):
-            response_text = response_text[7:]
-        if response_text.startswith("```"):
-            response_text = response_text[3:]
-        if response_text.endswith("```"):
-            response_text = response_text[:-3]
-        response_text = response_text.strip()
+        response_text = strip_codefence(response_text)
 
         # Parse JSON response
-        data = json.loads(response_text)
+        data = orjson.loads(response_text)
 
         output = EnrichmentOutput(
             enhanced_title=data["enhanced_title"],
@@ -196,10 +189,17 @@ async def enrich_idea(
             market_context=data["market_context"],
         )
 
+        # Only cache responses that produced a valid output, so a malformed or
+        # incomplete reply isn't replayed
+        if cached is None:
+            await _llm_cache.set_cached(cache_key, ENRICHMENT_MODEL, prompt_hash, response_text)
+        if vector is not None:
+            get_semantic_cache().add(vector, output, idea.submitted_by)
+
         logger.info(f"Enrichment completed for idea: {idea.id}")
         return output
 
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         logger.error(f"Failed to parse enrichment response: {e}")
         raise ValueError(f"Invalid enrichment response format: {e}")
     except KeyError as e:
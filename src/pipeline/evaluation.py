@@ -5,6 +5,7 @@ using Jobs-to-be-Done and disruption theory frameworks.
 """
 
 import logging
+import re
 
 from ..core.models import (
     CapabilitiesFit,
@@ -15,9 +16,38 @@ from ..core.models import (
     Recommendation,
 )
 from ..mcp.bridge import ChristensenAnalyzer, MCPToolResult
+from . import _llm_cache
 
 logger = logging.getLogger(__name__)
 
+# Cache namespace for Christensen MCP analyses (stands in for a model name)
+EVALUATION_CACHE_MODEL = "christensen-mcp"
+
+# Keyword matchers for free-text MCP fields. Matching is by substring (so
+# "developing" counts as "develop"), with each word list compiled into one
+# alternation that's scanned in a single pass.
+_STRONG_FIT_RE = re.compile("strong|high")
+_MISSING_FIT_RE = re.compile("missing|low|none")
+_DEVELOP_RE = re.compile("develop|build|proceed|yes|approve")
+_REJECT_RE = re.compile("reject|no|skip|abandon")
+_DEFER_RE = re.compile("defer|wait|later|pause")
+
+SCENARIO_TEMPLATE = """
+IDEA: {title}
+
+DESCRIPTION:
+{description}
+
+PROBLEM STATEMENT:
+{problem_statement}
+
+POTENTIAL APPROACHES:
+{approaches}
+
+MARKET CONTEXT:
+{market_context}
+"""
+
 
 async def evaluate_idea(idea: Idea, enrichment: EnrichmentResult) -> EvaluationOutput:
     """Run evaluation stage on an enriched idea.
@@ -38,29 +68,34 @@ async def evaluate_idea(idea: Idea, enrichment: EnrichmentResult) -> EvaluationO
     logger.info(f"Starting evaluation for idea: {idea.id}")
 
     # Build evaluation context from enrichment
-    scenario = f"""
-IDEA: {enrichment.enhanced_title}
-
-DESCRIPTION:
-{enrichment.enhanced_description}
-
-PROBLEM STATEMENT:
-{enrichment.problem_statement}
-
-POTENTIAL APPROACHES:
-{chr(10).join(f"- {s}" for s in enrichment.potential_solutions)}
+    scenario = SCENARIO_TEMPLATE.format(
+        title=enrichment.enhanced_title,
+        description=enrichment.enhanced_description,
+        problem_statement=enrichment.problem_statement,
+        approaches="\n".join(["- " + s for s in enrichment.potential_solutions]),
+        market_context=enrichment.market_context,
+    )
 
-MARKET CONTEXT:
-{enrichment.market_context}
-"""
+    context = f"Original idea: {idea.raw_content}"
+    constraints = idea.tags if idea.tags else None
 
     try:
+        # An unchanged scenario (e.g. a refine cycle that didn't alter the
+        # enrichment) reuses the earlier analysis
+        cache_key, prompt_hash = _llm_cache.cache_key(
+            EVALUATION_CACHE_MODEL, scenario, context=context, constraints=constraints
+        )
+        cached = await _llm_cache.get_cached(cache_key)
+        if cached is not None:
+            logger.info(f"Evaluation reused from cache for idea: {idea.id}")
+            return EvaluationOutput.model_validate_json(cached)
+
         async with ChristensenAnalyzer() as analyzer:
             # Call Christensen MCP for analysis
             result = await analyzer.analyze_decision(
                 scenario=scenario,
-                context=f"Original idea: {idea.raw_content}",
-                constraints=idea.tags if idea.tags else None,
+                context=context,
+                constraints=constraints,
             )
 
             if not result.success:
@@ -68,8 +103,12 @@ MARKET CONTEXT:
 
             # Parse the Christensen response
             output = _parse_christensen_response(result)
-            logger.info(f"Evaluation completed for idea: {idea.id}")
-            return output
+
+        await _llm_cache.set_cached(
+            cache_key, EVALUATION_CACHE_MODEL, prompt_hash, output.model_dump_json()
+        )
+        logger.info(f"Evaluation completed for idea: {idea.id}")
+        return output
 
     except Exception as e:
         logger.error(f"Evaluation failed: {e}")
@@ -156,9 +195,9 @@ def _map_capabilities_fit(value: str) -> CapabilitiesFit:
     """Map string value to CapabilitiesFit enum."""
     value_lower = value.lower() if isinstance(value, str) else "developing"
 
-    if "strong" in value_lower or "high" in value_lower:
+    if _STRONG_FIT_RE.search(value_lower):
         return CapabilitiesFit.STRONG
-    elif "missing" in value_lower or "low" in value_lower or "none" in value_lower:
+    elif _MISSING_FIT_RE.search(value_lower):
         return CapabilitiesFit.MISSING
     else:
         return CapabilitiesFit.DEVELOPING
@@ -168,11 +207,11 @@ def _map_recommendation(value: str) -> Recommendation:
     """Map string value to Recommendation enum."""
     value_lower = value.lower() if isinstance(value, str) else "refine"
 
-    if any(w in value_lower for w in ["develop", "build", "proceed", "yes", "approve"]):
+    if _DEVELOP_RE.search(value_lower):
         return Recommendation.DEVELOP
-    elif any(w in value_lower for w in ["reject", "no", "skip", "abandon"]):
+    elif _REJECT_RE.search(value_lower):
         return Recommendation.REJECT
-    elif any(w in value_lower for w in ["defer", "wait", "later", "pause"]):
+    elif _DEFER_RE.search(value_lower):
         return Recommendation.DEFER
     else:
         return Recommendation.REFINE
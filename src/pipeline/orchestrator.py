@@ -3,10 +3,14 @@
 Coordinates stage execution, state transitions, and HIL gates.
 """
 
+import asyncio
 import logging
+import re
+import time
+from collections.abc import Callable, Coroutine
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Callable
+from typing import Any
 
 from ..core.models import (
     BuildResult,
@@ -23,8 +27,13 @@ from ..core.models import (
 from ..core.state_machine import state_machine
 from ..db.repository import Repository
 from ..integrations.s3_storage import get_s3_service
-from ..notifications.service import NotificationContext, NotificationService, get_notification_service
-from .building import build_project, BUILD_OUTPUT_DIR
+from ..mcp.bridge import get_christensen_bridge
+from ..notifications.service import (
+    NotificationContext,
+    NotificationService,
+    get_notification_service,
+)
+from .building import BUILD_OUTPUT_DIR, build_project
 from .enrichment import enrich_idea
 from .evaluation import evaluate_idea
 from .project_analysis import analyze_project
@@ -32,6 +41,68 @@ from .scaffolding import scaffold_idea
 
 logger = logging.getLogger(__name__)
 
+# Ideas run through the pipeline at once by run_full_pipelines; each stage's
+# own provider limits (e.g. the adaptive Anthropic limiter) still apply
+MAX_CONCURRENT_PIPELINES = 4
+
+# Process-wide caps on calls to downstream services. Module-level because the
+# API creates an orchestrator per request.
+MAX_CONCURRENT_NOTIFICATIONS = 8
+MAX_CONCURRENT_S3_UPLOADS = 4
+_notification_slots = asyncio.Semaphore(MAX_CONCURRENT_NOTIFICATIONS)
+_s3_upload_slots = asyncio.Semaphore(MAX_CONCURRENT_S3_UPLOADS)
+
+# Strong refs to fire-and-forget tasks so they aren't garbage collected
+# mid-run; module-level so they outlive the orchestrator that spawned them
+_background_tasks: set[asyncio.Task] = set()
+
+# Stage results loaded for a HIL gate notification, kept so the approval that
+# follows can skip re-reading them: idea_id -> (loaded_at, results), oldest first
+GATE_CONTEXT_TTL_SECONDS = 15 * 60
+GATE_CONTEXT_MAX_ENTRIES = 256
+_gate_context: dict[
+    str,
+    tuple[float, tuple[EnrichmentResult, EvaluationResult, ScaffoldingResult | None]],
+] = {}
+
+
+def _store_gate_context(
+    idea_id: str,
+    results: tuple[EnrichmentResult, EvaluationResult, ScaffoldingResult | None],
+) -> None:
+    """Cache an idea's gate results, evicting expired entries and the oldest past the cap."""
+    now = time.monotonic()
+    # Re-inserting at the end keeps the dict ordered by age
+    _gate_context.pop(idea_id, None)
+    while _gate_context:
+        oldest_id, (loaded_at, _) = next(iter(_gate_context.items()))
+        if (
+            now - loaded_at <= GATE_CONTEXT_TTL_SECONDS
+            and len(_gate_context) < GATE_CONTEXT_MAX_ENTRIES
+        ):
+            break
+        del _gate_context[oldest_id]
+    _gate_context[idea_id] = (now, results)
+
+
+def _take_gate_context(
+    idea_id: str,
+) -> tuple[EnrichmentResult, EvaluationResult, ScaffoldingResult | None] | None:
+    """Pop an idea's cached gate results, or None if missing or expired."""
+    entry = _gate_context.pop(idea_id, None)
+    if entry is None or time.monotonic() - entry[0] > GATE_CONTEXT_TTL_SECONDS:
+        return None
+    return entry[1]
+
+
+# Characters replaced with "_" in zip names (anything but letters, digits, space, "-", "_")
+_UNSAFE_TITLE_CHARS = re.compile(r"[^\w -]")
+
+
+def _sanitize_title(title: str, limit: int = 50) -> str:
+    """Make a title safe for file and object names, truncated to limit characters."""
+    return _UNSAFE_TITLE_CHARS.sub("_", title)[:limit]
+
 
 @dataclass
 class PipelineResult:
@@ -52,6 +123,31 @@ class PipelineOrchestrator:
         self.repo = repository
         self.state_machine = state_machine
         self.notification_service = get_notification_service()
+        # continue_pipeline: (stage, status) -> handler for the next step
+        self._continue_dispatch: dict[
+            tuple[Stage, Status], Callable[[Idea], Coroutine[Any, Any, PipelineResult]]
+        ] = {
+            (Stage.PROJECT_ANALYSIS, Status.COMPLETED): self._start_enrichment_with_analysis,
+            (Stage.ENRICHMENT, Status.COMPLETED): self._start_evaluation,
+            (Stage.EVALUATION, Status.COMPLETED): self._handle_post_evaluation_gate,
+            (Stage.HUMAN_REVIEW, Status.AWAITING_REVIEW): self._handle_awaiting_review,
+            (Stage.SCAFFOLDING, Status.COMPLETED): self._handle_post_scaffolding_gate,
+            (Stage.BUILDING, Status.COMPLETED): self._complete_pipeline,
+        }
+
+    def _spawn_background(self, coro: Coroutine[Any, Any, None]) -> None:
+        """Run a best-effort coroutine alongside the current stage."""
+        task = asyncio.create_task(coro)
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+
+    async def _warm_evaluation(self) -> None:
+        """Start the Christensen MCP server so evaluation doesn't wait on its spawn."""
+        try:
+            await get_christensen_bridge()
+        except Exception as e:
+            # Evaluation retries the spawn itself; this is only a head start
+            logger.warning(f"Christensen MCP warm-up failed: {e}")
 
     async def _send_hil_notification(self, idea: Idea, gate: int) -> None:
         """Send notifications for a HIL gate.
@@ -61,36 +157,34 @@ class PipelineOrchestrator:
             gate: The gate number (1 = post-evaluation, 2 = post-scaffolding)
         """
         try:
-            # Gather context for notification
-            enrichment = await self.repo.get_enrichment(idea.id)
-            evaluation = await self.repo.get_evaluation(idea.id)
-            scaffolding = await self.repo.get_scaffolding(idea.id) if gate == 2 else None
-
-            # Build summaries
-            enrichment_summary = None
-            if enrichment:
-                enrichment_summary = (
-                    f"Title: {enrichment.enhanced_title}\n"
-                    f"Problem: {enrichment.problem_statement}\n"
-                    f"Description: {enrichment.enhanced_description[:200]}..."
-                )
-
-            evaluation_summary = None
-            if evaluation:
-                evaluation_summary = (
-                    f"Score: {evaluation.overall_score}/100\n"
-                    f"Recommendation: {evaluation.recommendation.value.upper()}\n"
-                    f"Rationale: {evaluation.recommendation_rationale}"
-                )
-
-            scaffolding_summary = None
-            if scaffolding:
-                tech_stack = ", ".join(scaffolding.tech_stack[:5])
-                scaffolding_summary = (
-                    f"Tech Stack: {tech_stack}\n"
-                    f"Estimated Hours: {scaffolding.estimated_hours or 'N/A'}\n"
-                    f"Blueprint preview: {scaffolding.blueprint_content[:200]}..."
-                )
+            # Gather context for notification (independent reads, issued together).
+            # A failed read just leaves its summary out.
+            fetched = await asyncio.gather(
+                self.repo.get_enrichment(idea.id),
+                self.repo.get_evaluation(idea.id),
+                self.repo.get_scaffolding(idea.id) if gate == 2 else asyncio.sleep(0, result=None),
+                return_exceptions=True,
+            )
+            for error in fetched:
+                if isinstance(error, Exception):
+                    logger.warning(f"HIL gate {gate} context fetch failed: {error}")
+            enrichment, evaluation, scaffolding = (
+                None if isinstance(item, Exception) else item for item in fetched
+            )
+            if enrichment and evaluation and (gate == 1 or scaffolding):
+                # Skip the cache if a review was applied while the results loaded,
+                # so the entry apply_review dropped isn't written back
+                current = await self.repo.get_idea(idea.id)
+                if current and (current.current_stage, current.current_status) == (
+                    Stage.HUMAN_REVIEW,
+                    Status.AWAITING_REVIEW,
+                ):
+                    _store_gate_context(idea.id, (enrichment, evaluation, scaffolding))
+
+            # Summaries are formatted once per result object
+            enrichment_summary = enrichment.summary if enrichment else None
+            evaluation_summary = evaluation.summary if evaluation else None
+            scaffolding_summary = scaffolding.summary if scaffolding else None
 
             # Determine stage for notification
             stage = "evaluation" if gate == 1 else "scaffolding"
@@ -104,7 +198,8 @@ class PipelineOrchestrator:
                 scaffolding_summary=scaffolding_summary,
             )
 
-            result = await self.notification_service.notify_hil_gate(context)
+            async with _notification_slots:
+                result = await self.notification_service.notify_hil_gate(context)
             logger.info(
                 f"HIL Gate {gate} notification result: "
                 f"email={result.email_sent}, slack={result.slack_sent}"
@@ -146,10 +241,22 @@ class PipelineOrchestrator:
         if not result.success:
             return PipelineResult(success=False, idea=idea, message=result.error)
 
-        # Update state
-        idea = await self.repo.update_idea_state(
-            idea_id, target_stage, Status.PROCESSING, triggered_by="pipeline"
+        # Update state, provided no concurrent start got there first
+        updated = await self.repo.cas_update_stage(
+            idea_id,
+            idea.current_stage,
+            idea.current_status,
+            target_stage,
+            Status.PROCESSING,
+            triggered_by="pipeline",
         )
+        if not updated:
+            return PipelineResult(
+                success=False,
+                idea=idea,
+                message=f"Idea no longer in INPUT stage: {idea_id}",
+            )
+        idea = updated
 
         # Run appropriate stage
         if target_stage == Stage.PROJECT_ANALYSIS:
@@ -168,17 +275,20 @@ class PipelineOrchestrator:
         """
         logger.info(f"Running enrichment for idea: {idea.id}")
 
+        # Evaluation only depends on enrichment, so bring up its MCP server now
+        # and overlap the node process spawn/handshake with the Gemini call
+        self._spawn_background(self._warm_evaluation())
+
         try:
             # Execute enrichment (with optional analysis context)
             output = await enrich_idea(idea, analysis)
 
-            # Save result
-            await self.repo.save_enrichment(idea.id, output)
-
-            # Transition to completed
-            idea = await self.repo.update_idea_state(
-                idea.id, Stage.ENRICHMENT, Status.COMPLETED, triggered_by="pipeline"
-            )
+            # Save result and transition to completed in one transaction
+            async with self.repo.transaction():
+                await self.repo.save_enrichment(idea.id, output)
+                idea = await self.repo.update_idea_state(
+                    idea.id, Stage.ENRICHMENT, Status.COMPLETED, triggered_by="pipeline"
+                )
 
             logger.info(f"Enrichment completed for idea: {idea.id}")
             return PipelineResult(
@@ -239,13 +349,12 @@ class PipelineOrchestrator:
             # Execute project analysis
             output = await analyze_project(idea)
 
-            # Save result
-            await self.repo.save_project_analysis(idea.id, output)
-
-            # Transition to completed
-            idea = await self.repo.update_idea_state(
-                idea.id, Stage.PROJECT_ANALYSIS, Status.COMPLETED, triggered_by="pipeline"
-            )
+            # Save result and transition to completed in one transaction
+            async with self.repo.transaction():
+                await self.repo.save_project_analysis(idea.id, output)
+                idea = await self.repo.update_idea_state(
+                    idea.id, Stage.PROJECT_ANALYSIS, Status.COMPLETED, triggered_by="pipeline"
+                )
 
             logger.info(f"Project analysis completed for idea: {idea.id}")
             return PipelineResult(
@@ -272,94 +381,83 @@ class PipelineOrchestrator:
                 message=f"Project analysis failed: {e}",
             )
 
-    async def continue_pipeline(self, idea_id: str) -> PipelineResult:
+    async def continue_pipeline(self, idea_id: str | Idea) -> PipelineResult:
         """Continue the pipeline to the next stage.
 
         Automatically advances through stages until a HIL gate is reached.
+        Accepts an already-loaded Idea (e.g. the one a stage just returned)
+        to skip re-reading it.
         """
-        idea = await self.repo.get_idea(idea_id)
-        if not idea:
-            return PipelineResult(success=False, message=f"Idea not found: {idea_id}")
-
-        # Check current state and advance
-        if (
-            idea.current_stage == Stage.PROJECT_ANALYSIS
-            and idea.current_status == Status.COMPLETED
-        ):
-            # After project analysis, start enrichment with analysis context
-            return await self._start_enrichment_with_analysis(idea)
-
-        elif idea.current_stage == Stage.ENRICHMENT and idea.current_status == Status.COMPLETED:
-            return await self._start_evaluation(idea)
-
-        elif idea.current_stage == Stage.EVALUATION and idea.current_status == Status.COMPLETED:
-            # HIL gate 1 - requires human review after evaluation
-            idea = await self.repo.update_idea_state(
-                idea.id, Stage.HUMAN_REVIEW, Status.AWAITING_REVIEW, triggered_by="pipeline"
-            )
-
-            # Send notifications for HIL gate 1
-            await self._send_hil_notification(idea, gate=1)
+        if isinstance(idea_id, Idea):
+            idea = idea_id
+        else:
+            idea = await self.repo.get_idea(idea_id)
+            if not idea:
+                return PipelineResult(success=False, message=f"Idea not found: {idea_id}")
 
+        handler = self._continue_dispatch.get((idea.current_stage, idea.current_status))
+        if handler is None:
             return PipelineResult(
-                success=True,
+                success=False,
                 idea=idea,
-                stage=Stage.HUMAN_REVIEW,
-                status=Status.AWAITING_REVIEW,
-                message="Evaluation complete. Awaiting human review.",
-                requires_review=True,
+                message=f"Cannot continue from state: ({idea.current_stage.value}, {idea.current_status.value})",
             )
+        return await handler(idea)
 
-        elif (
-            idea.current_stage == Stage.HUMAN_REVIEW
-            and idea.current_status == Status.AWAITING_REVIEW
-        ):
-            return PipelineResult(
-                success=True,
-                idea=idea,
-                stage=Stage.HUMAN_REVIEW,
-                status=Status.AWAITING_REVIEW,
-                message="Awaiting human review decision.",
-                requires_review=True,
-            )
+    async def _open_review_gate(self, idea: Idea, gate: int, message: str) -> PipelineResult:
+        """Move an idea into HUMAN_REVIEW and notify reviewers in the background."""
+        idea = await self.repo.update_idea_state(
+            idea.id, Stage.HUMAN_REVIEW, Status.AWAITING_REVIEW, triggered_by="pipeline"
+        )
 
-        elif idea.current_stage == Stage.SCAFFOLDING and idea.current_status == Status.COMPLETED:
-            # HIL gate 2 - requires human review before building
-            idea = await self.repo.update_idea_state(
-                idea.id, Stage.HUMAN_REVIEW, Status.AWAITING_REVIEW, triggered_by="pipeline"
-            )
+        # Send notifications without holding up the caller;
+        # _send_hil_notification logs its own failures
+        self._spawn_background(self._send_hil_notification(idea, gate=gate))
 
-            # Send notifications for HIL gate 2
-            await self._send_hil_notification(idea, gate=2)
+        return PipelineResult(
+            success=True,
+            idea=idea,
+            stage=Stage.HUMAN_REVIEW,
+            status=Status.AWAITING_REVIEW,
+            message=message,
+            requires_review=True,
+        )
 
-            return PipelineResult(
-                success=True,
-                idea=idea,
-                stage=Stage.HUMAN_REVIEW,
-                status=Status.AWAITING_REVIEW,
-                message="Scaffolding complete. Awaiting human review before building.",
-                requires_review=True,
-            )
+    async def _handle_post_evaluation_gate(self, idea: Idea) -> PipelineResult:
+        """HIL gate 1 - requires human review after evaluation."""
+        return await self._open_review_gate(
+            idea, gate=1, message="Evaluation complete. Awaiting human review."
+        )
 
-        elif idea.current_stage == Stage.BUILDING and idea.current_status == Status.COMPLETED:
-            # Transition to completed
-            idea = await self.repo.update_idea_state(
-                idea.id, Stage.COMPLETED, Status.COMPLETED, triggered_by="pipeline"
-            )
-            return PipelineResult(
-                success=True,
-                idea=idea,
-                stage=Stage.COMPLETED,
-                status=Status.COMPLETED,
-                message="Pipeline completed successfully!",
-            )
+    async def _handle_post_scaffolding_gate(self, idea: Idea) -> PipelineResult:
+        """HIL gate 2 - requires human review before building."""
+        return await self._open_review_gate(
+            idea, gate=2, message="Scaffolding complete. Awaiting human review before building."
+        )
 
-        else:
-            return PipelineResult(
-                success=False,
-                idea=idea,
-                message=f"Cannot continue from state: ({idea.current_stage.value}, {idea.current_status.value})",
-            )
+    async def _handle_awaiting_review(self, idea: Idea) -> PipelineResult:
+        """Already at a HIL gate; nothing to do until a review arrives."""
+        return PipelineResult(
+            success=True,
+            idea=idea,
+            stage=Stage.HUMAN_REVIEW,
+            status=Status.AWAITING_REVIEW,
+            message="Awaiting human review decision.",
+            requires_review=True,
+        )
+
+    async def _complete_pipeline(self, idea: Idea) -> PipelineResult:
+        """Mark a built idea as completed."""
+        idea = await self.repo.update_idea_state(
+            idea.id, Stage.COMPLETED, Status.COMPLETED, triggered_by="pipeline"
+        )
+        return PipelineResult(
+            success=True,
+            idea=idea,
+            stage=Stage.COMPLETED,
+            status=Status.COMPLETED,
+            message="Pipeline completed successfully!",
+        )
 
     async def _start_evaluation(self, idea: Idea) -> PipelineResult:
         """Start the evaluation stage."""
@@ -396,13 +494,12 @@ class PipelineOrchestrator:
             # Execute evaluation
             output = await evaluate_idea(idea, enrichment)
 
-            # Save result
-            await self.repo.save_evaluation(idea.id, output)
-
-            # Transition to completed
-            idea = await self.repo.update_idea_state(
-                idea.id, Stage.EVALUATION, Status.COMPLETED, triggered_by="pipeline"
-            )
+            # Save result and transition to completed in one transaction
+            async with self.repo.transaction():
+                await self.repo.save_evaluation(idea.id, output)
+                idea = await self.repo.update_idea_state(
+                    idea.id, Stage.EVALUATION, Status.COMPLETED, triggered_by="pipeline"
+                )
 
             logger.info(f"Evaluation completed for idea: {idea.id}")
             return PipelineResult(
@@ -458,11 +555,6 @@ class PipelineOrchestrator:
                 message=f"Idea not in HUMAN_REVIEW stage: {idea.current_stage.value}",
             )
 
-        # Save the review
-        await self.repo.save_review(
-            idea_id, idea.current_stage, decision, rationale, reviewer
-        )
-
         # Apply the decision through state machine
         transition = self.state_machine.apply_review_decision(
             idea.current_stage, decision
@@ -473,20 +565,36 @@ class PipelineOrchestrator:
 
         # For approval, determine which stage to advance to
         if decision == ReviewDecision.APPROVE:
-            # Check if we have scaffolding result to determine which HIL gate
-            scaffolding = await self.repo.get_scaffolding(idea_id)
-            if scaffolding:
+            # The approved stage records its own transition when it starts
+            await self.repo.save_review(
+                idea_id, idea.current_stage, decision, rationale, reviewer
+            )
+
+            # A scaffolding result means this is the second HIL gate
+            if await self.repo.has_scaffolding(idea_id):
                 # Second HIL gate (post-scaffolding) - advance to building
                 return await self._start_building(idea)
             else:
                 # First HIL gate (post-evaluation) - advance to scaffolding
                 return await self._start_scaffolding(idea)
 
-        # Update state for non-approval decisions
-        idea = await self.repo.update_idea_state(
-            idea_id, transition.new_stage, transition.new_status, triggered_by=reviewer
+        # Save the review and the resulting state in one commit
+        idea = await self.repo.apply_review_atomic(
+            idea_id,
+            idea.current_stage,
+            decision,
+            rationale,
+            reviewer,
+            new_stage=transition.new_stage,
+            new_status=transition.new_status,
         )
 
+        # Non-approvals' stage results may change before the next gate, and
+        # reaching that gate again must notify the reviewer again. Dropped after
+        # the state change, so a notification still loading can't re-cache them.
+        _gate_context.pop(idea_id, None)
+        self.notification_service.forget(idea_id)
+
         # Determine message for non-approval decisions
         if decision == ReviewDecision.REFINE:
             message = "Sent back for refinement. Restarting enrichment."
@@ -505,9 +613,24 @@ class PipelineOrchestrator:
 
     async def _start_scaffolding(self, idea: Idea) -> PipelineResult:
         """Start the scaffolding stage."""
-        # Get enrichment and evaluation results
-        enrichment = await self.repo.get_enrichment(idea.id)
-        evaluation = await self.repo.get_evaluation(idea.id)
+        # Get enrichment and evaluation results (plus analysis for existing projects),
+        # reusing what the HIL gate notification loaded when available
+        gate_context = _take_gate_context(idea.id)
+        if gate_context:
+            enrichment, evaluation, _ = gate_context
+            analysis = (
+                await self.repo.get_project_analysis(idea.id)
+                if idea.mode != ProjectMode.NEW
+                else None
+            )
+        else:
+            enrichment, evaluation, analysis = await asyncio.gather(
+                self.repo.get_enrichment(idea.id),
+                self.repo.get_evaluation(idea.id),
+                self.repo.get_project_analysis(idea.id)
+                if idea.mode != ProjectMode.NEW
+                else asyncio.sleep(0, result=None),
+            )
 
         if not enrichment or not evaluation:
             return PipelineResult(
@@ -516,11 +639,6 @@ class PipelineOrchestrator:
                 message="Cannot scaffold: missing enrichment or evaluation results",
             )
 
-        # Get analysis for existing projects
-        analysis = None
-        if idea.mode != ProjectMode.NEW:
-            analysis = await self.repo.get_project_analysis(idea.id)
-
         # Transition to scaffolding processing
         result = self.state_machine.transition(
             idea.current_stage, idea.current_status, Stage.SCAFFOLDING, Status.PROCESSING
@@ -556,13 +674,12 @@ class PipelineOrchestrator:
             # Execute scaffolding (with optional analysis context)
             output = await scaffold_idea(idea, enrichment, evaluation, analysis)
 
-            # Save result
-            await self.repo.save_scaffolding(idea.id, output)
-
-            # Transition to completed
-            idea = await self.repo.update_idea_state(
-                idea.id, Stage.SCAFFOLDING, Status.COMPLETED, triggered_by="pipeline"
-            )
+            # Save result and transition to completed in one transaction
+            async with self.repo.transaction():
+                await self.repo.save_scaffolding(idea.id, output)
+                idea = await self.repo.update_idea_state(
+                    idea.id, Stage.SCAFFOLDING, Status.COMPLETED, triggered_by="pipeline"
+                )
 
             logger.info(f"Scaffolding completed for idea: {idea.id}")
             return PipelineResult(
@@ -591,9 +708,16 @@ class PipelineOrchestrator:
 
     async def _start_building(self, idea: Idea) -> PipelineResult:
         """Start the building stage."""
-        # Get enrichment and scaffolding results
-        enrichment = await self.repo.get_enrichment(idea.id)
-        scaffolding = await self.repo.get_scaffolding(idea.id)
+        # Get enrichment and scaffolding results, reusing what the HIL gate
+        # notification loaded when available
+        gate_context = _take_gate_context(idea.id)
+        if gate_context and gate_context[2]:
+            enrichment, _, scaffolding = gate_context
+        else:
+            enrichment, scaffolding = await asyncio.gather(
+                self.repo.get_enrichment(idea.id),
+                self.repo.get_scaffolding(idea.id),
+            )
 
         if not enrichment or not scaffolding:
             return PipelineResult(
@@ -624,21 +748,23 @@ class PipelineOrchestrator:
     ) -> PipelineResult:
         """Run the building stage."""
         logger.info(f"Running building for idea: {idea.id}")
+        # Wall-clock start is persisted with the build; the monotonic clock times it
         started_at = datetime.utcnow()
+        started_ns = time.monotonic_ns()
 
         try:
             # Execute building (pass idea for mode detection)
             output = await build_project(idea.id, enrichment, scaffolding, idea)
 
-            # Save result
+            # Save the result before uploading, so no write is held open while
+            # the build is zipped and sent to S3
             await self.repo.save_build(idea.id, output, started_at)
 
-            # Upload to S3 if build succeeded
+            # Upload to S3 if build succeeded (records the storage info when done)
             download_url = None
             if output.outcome in ("success", "partial"):
-                download_url = await self._upload_to_s3(idea, enrichment)
+                download_url = await self._upload_to_s3(idea, enrichment, output.artifacts)
 
-            # Transition to completed
             idea = await self.repo.update_idea_state(
                 idea.id, Stage.BUILDING, Status.COMPLETED, triggered_by="pipeline"
             )
@@ -647,7 +773,8 @@ class PipelineOrchestrator:
             if download_url:
                 message += f" - Download: {download_url}"
 
-            logger.info(f"Building completed for idea: {idea.id}")
+            elapsed = (time.monotonic_ns() - started_ns) / 1e9
+            logger.info(f"Building completed for idea: {idea.id} in {elapsed:.1f}s")
             return PipelineResult(
                 success=True,
                 idea=idea,
@@ -657,7 +784,8 @@ class PipelineOrchestrator:
             )
 
         except Exception as e:
-            logger.error(f"Building failed for idea {idea.id}: {e}")
+            elapsed = (time.monotonic_ns() - started_ns) / 1e9
+            logger.error(f"Building failed for idea {idea.id} after {elapsed:.1f}s: {e}")
 
             # Transition to failed
             await self.repo.update_idea_state(
@@ -672,27 +800,35 @@ class PipelineOrchestrator:
                 message=f"Building failed: {e}",
             )
 
-    async def _upload_to_s3(self, idea: Idea, enrichment: EnrichmentResult) -> str | None:
+    async def _upload_to_s3(
+        self, idea: Idea, enrichment: EnrichmentResult, artifacts: list[str]
+    ) -> str | None:
         """Upload build output to S3.
 
-        Returns the presigned download URL or None if upload failed.
+        Returns the presigned download URL, or None if there was nothing to
+        upload or the upload failed.
         """
+        if not artifacts:
+            logger.info(f"No build artifacts to upload for idea: {idea.id}")
+            return None
+
         try:
             s3_service = get_s3_service()
 
-            # Get project directory
+            # Get project directory (its existence is checked in the upload thread)
             project_dir = BUILD_OUTPUT_DIR / idea.id
-            if not project_dir.exists():
-                logger.warning(f"Project directory not found for upload: {project_dir}")
-                return None
 
             # Create zip name from title
-            safe_title = "".join(c if c.isalnum() or c in " -_" else "_" for c in enrichment.enhanced_title)
-            safe_title = safe_title[:50]  # Limit length
+            safe_title = _sanitize_title(enrichment.enhanced_title)
             zip_name = f"{safe_title}-{idea.id[:8]}"
 
-            # Upload as zip to S3
-            result = s3_service.upload_directory_as_zip(project_dir, zip_name)
+            # Upload as zip to S3 (zipping and upload run in a worker thread)
+            try:
+                async with _s3_upload_slots:
+                    result = await s3_service.upload_directory_as_zip_async(project_dir, zip_name)
+            except NotADirectoryError:
+                logger.warning(f"Project directory not found for upload: {project_dir}")
+                return None
             download_url = result["download_url"]
             s3_key = result["key"]
 
@@ -716,8 +852,37 @@ class PipelineOrchestrator:
         if not result.success:
             return result
 
-        # Continue until we hit a gate or failure
+        # Chain the known stage sequence directly with the in-memory idea:
+        # (project analysis →) enrichment → evaluation
+        if result.success and result.stage == Stage.PROJECT_ANALYSIS:
+            result = await self._start_enrichment_with_analysis(result.idea)
+        if result.success and result.stage == Stage.ENRICHMENT:
+            result = await self._start_evaluation(result.idea)
+
+        # Anything else (the HIL gate, unexpected states) goes through the
+        # generic dispatch. Successful stages return the idea in its new
+        # state, so hand that on instead of re-reading it each hop.
         while result.success and not result.requires_review:
-            result = await self.continue_pipeline(idea_id)
+            result = await self.continue_pipeline(result.idea or idea_id)
 
         return result
+
+    async def run_full_pipelines(
+        self, idea_ids: list[str], max_concurrency: int = MAX_CONCURRENT_PIPELINES
+    ) -> list[PipelineResult]:
+        """Run several ideas' pipelines concurrently (bounded), each to its next HIL gate.
+
+        Results are returned in idea_ids order; an idea that raises gets a
+        failed PipelineResult instead of aborting the others.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run_one(idea_id: str) -> PipelineResult:
+            async with semaphore:
+                try:
+                    return await self.run_full_pipeline(idea_id)
+                except Exception as e:
+                    logger.error(f"Pipeline failed for idea {idea_id}: {e}")
+                    return PipelineResult(success=False, message=f"Pipeline failed: {e}")
+
+        return list(await asyncio.gather(*(run_one(idea_id) for idea_id in idea_ids)))
@@ -4,14 +4,16 @@ Analyzes existing projects to understand structure, tech stack,
 and identify gaps (COMPLETE mode) or opportunities (ENHANCE mode).
 """
 
-import json
+import asyncio
+import inspect
 import logging
 import os
-import subprocess
+from array import array
+from collections import defaultdict
+from dataclasses import dataclass, field
 from pathlib import Path
 
-import anthropic
-from dotenv import load_dotenv
+import orjson
 
 from ..core.models import (
     ArchitecturePattern,
@@ -24,36 +26,75 @@ from ..core.models import (
     ProjectSource,
     SourceType,
 )
+from . import _llm_cache
+from ._anthropic import get_anthropic_client
+from ._codefence import strip_codefence
+from ._ratelimit import get_anthropic_limiter
 
-# Load shared env first, then local can override
-shared_env = Path.home() / ".env.shared"
-if shared_env.exists():
-    load_dotenv(shared_env)
-load_dotenv()
 logger = logging.getLogger(__name__)
 
-# Configure Anthropic client
-client = anthropic.Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY", ""))
+# Cache namespace for analyses of a cloned repo at a given commit
+ANALYSIS_CACHE_MODEL = "project-analysis"
 
 # Temp directory for cloned repos
 CLONE_DIR = Path(__file__).parent.parent.parent / "temp" / "clones"
 
 # File extensions to analyze
-CODE_EXTENSIONS = {
+CODE_EXTENSIONS = frozenset({
     ".py", ".ts", ".tsx", ".js", ".jsx", ".java", ".go", ".rs",
     ".c", ".cpp", ".h", ".hpp", ".cs", ".rb", ".php", ".swift",
     ".kt", ".scala", ".sql", ".sh", ".bash", ".yaml", ".yml",
     ".json", ".toml", ".md", ".html", ".css", ".scss",
-}
+})
 
 # Files to prioritize for analysis
-PRIORITY_FILES = {
+PRIORITY_FILES = frozenset({
     "README.md", "BLUEPRINT.md", "package.json", "requirements.txt",
     "Cargo.toml", "go.mod", "pyproject.toml", "setup.py",
     "Dockerfile", "docker-compose.yml", "Makefile",
     "tsconfig.json", ".env.example", "main.py", "app.py",
     "index.ts", "index.js", "main.ts", "main.js", "server.py",
-}
+})
+
+# Project docs placed ahead of everything else in the prompt
+DOC_FILES = frozenset({"README.md", "BLUEPRINT.md"})
+
+# Token budget shared by all key files in the analysis prompt. Tokens are
+# estimated from length; a tokenizer round-trip per file isn't worth it here.
+KEY_FILES_TOKEN_BUDGET = 60000
+CHARS_PER_TOKEN = 4
+
+# Directories (and names) skipped while scanning a project
+IGNORED_DIRS = frozenset({
+    "node_modules", ".git", "__pycache__", ".venv", "venv",
+    "dist", "build", ".next", ".cache", "coverage",
+    "target", ".idea", ".vscode",
+})
+
+
+@dataclass(slots=True)
+class FileIndex:
+    """Files found in a project scan, stored as parallel arrays.
+
+    paths[i] lives in directory dirs[dir_ids[i]]. Files of one directory are
+    contiguous, in scan order.
+    """
+
+    paths: list[str] = field(default_factory=list)
+    dir_ids: array = field(default_factory=lambda: array("i"))
+    dirs: list[str] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+
+def file_tree_as_dict(index: FileIndex) -> dict[str, list[str]]:
+    """Group a FileIndex's paths by directory name."""
+    file_tree: dict[str, list[str]] = {}
+    for path, dir_id in zip(index.paths, index.dir_ids):
+        file_tree.setdefault(index.dirs[dir_id], []).append(path)
+    return file_tree
+
 
 COMPLETION_ANALYSIS_PROMPT = """You are an expert code analyst. Analyze this existing project to identify what needs to be completed.
 
@@ -179,11 +220,15 @@ Return ONLY valid JSON, no markdown code blocks.
 """
 
 
-async def analyze_project(idea: Idea) -> ProjectAnalysisOutput:
+async def analyze_project(idea: Idea, force_refresh: bool = False) -> ProjectAnalysisOutput:
     """Analyze an existing project.
 
+    Analyses of git sources are cached by commit, mode and goals, so re-running
+    against an unchanged repo skips the scan and the Claude call.
+
     Args:
         idea: The idea with project_source configured
+        force_refresh: Ignore any cached analysis for this commit
 
     Returns:
         ProjectAnalysisOutput with analysis results
@@ -191,6 +236,33 @@ async def analyze_project(idea: Idea) -> ProjectAnalysisOutput:
     Raises:
         ValueError: If analysis fails
     """
+    (output,) = await _analyze(idea, (idea.mode,), force_refresh)
+    return output
+
+
+async def analyze_project_both(
+    idea: Idea, force_refresh: bool = False
+) -> tuple[ProjectAnalysisOutput, ProjectAnalysisOutput]:
+    """Analyze an existing project in both COMPLETE and ENHANCE modes.
+
+    The project is scanned once and both Claude calls run concurrently.
+
+    Returns:
+        (complete, enhance) analysis results
+
+    Raises:
+        ValueError: If analysis fails
+    """
+    complete, enhance = await _analyze(
+        idea, (ProjectMode.EXISTING_COMPLETE, ProjectMode.EXISTING_ENHANCE), force_refresh
+    )
+    return complete, enhance
+
+
+async def _analyze(
+    idea: Idea, modes: tuple[ProjectMode, ...], force_refresh: bool
+) -> list[ProjectAnalysisOutput]:
+    """Run the analysis for each mode, sharing one scan of the project."""
     if not idea.project_source:
         raise ValueError("project_source required for project analysis")
 
@@ -200,36 +272,95 @@ async def analyze_project(idea: Idea) -> ProjectAnalysisOutput:
     project_path = await _get_project_path(idea.project_source)
     logger.info(f"Analyzing project at: {project_path}")
 
-    # Scan project files
-    file_tree = _scan_project_files(project_path)
-    total_files = sum(len(files) for files in file_tree.values())
+    outputs: list[ProjectAnalysisOutput | None] = [None] * len(modes)
+    cache_keys: list[tuple[str, str] | None] = [None] * len(modes)
+    if idea.project_source.source_type == SourceType.GIT_URL:
+        commit = await _run_git("-C", str(project_path), "rev-parse", "HEAD")
+        for i, mode in enumerate(modes):
+            cache_keys[i] = _llm_cache.cache_key(
+                ANALYSIS_CACHE_MODEL,
+                idea.raw_content,  # User's goals
+                location=idea.project_source.location,
+                subdirectory=idea.project_source.subdirectory,
+                commit=commit,
+                mode=mode.value,
+            )
+            cached = None if force_refresh else await _llm_cache.get_cached(cache_keys[i][0])
+            if cached is not None:
+                logger.info(f"Project analysis reused for commit {commit[:12]}: {idea.id}")
+                outputs[i] = ProjectAnalysisOutput.model_validate_json(cached)
+
+    pending = [i for i, output in enumerate(outputs) if output is None]
+    if pending:
+        project_name, file_index, key_files_content, total_files = await _gather_context(
+            project_path
+        )
+
+        # Run Claude analysis for each mode still missing
+        results = await asyncio.gather(*(
+            _run_analysis(
+                modes[i],
+                project_name,
+                idea.raw_content,  # User's goals
+                file_index,
+                key_files_content,
+                total_files,
+            )
+            for i in pending
+        ))
+
+        for i, output in zip(pending, results):
+            outputs[i] = output
+            if cache_keys[i] is not None:
+                cache_key, prompt_hash = cache_keys[i]
+                await _llm_cache.set_cached(
+                    cache_key, ANALYSIS_CACHE_MODEL, prompt_hash, output.model_dump_json()
+                )
+
+    logger.info(f"Project analysis completed for idea: {idea.id}")
+    return outputs
+
+
+async def _gather_context(
+    project_path: Path,
+) -> tuple[str, FileIndex, dict[str, str], int]:
+    """Scan the project and read its key files.
+
+    Returns:
+        (project_name, file_index, key_files_content, total_files)
+    """
+    # Scan project files (filesystem walk runs off the event loop)
+    file_index = await asyncio.to_thread(_scan_project_files, project_path)
+    total_files = len(file_index)
     logger.info(f"Found {total_files} files in project")
 
     # Read key files
-    key_files_content = _read_key_files(project_path, file_tree)
+    key_files_content = await _read_key_files(project_path, file_index)
 
     # Infer project name from directory
-    project_name = project_path.name
-
-    # Run Claude analysis based on mode
-    output = await _run_analysis(
-        idea.mode,
-        project_name,
-        idea.raw_content,  # User's goals
-        file_tree,
-        key_files_content,
-        total_files,
-    )
+    return project_path.name, file_index, key_files_content, total_files
 
-    logger.info(f"Project analysis completed for idea: {idea.id}")
-    return output
+
+async def _run_git(*args: str) -> str:
+    """Run a git command without blocking the event loop. Returns its stdout."""
+    proc = await asyncio.create_subprocess_exec(
+        "git",
+        *args,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    stdout, stderr = await proc.communicate()
+    if proc.returncode:
+        error = stderr.decode(errors="replace").strip()
+        raise ValueError(f"git {' '.join(args)} failed ({proc.returncode}): {error}")
+    return stdout.decode(errors="replace").strip()
 
 
 async def _get_project_path(source: ProjectSource) -> Path:
     """Get local path to project, cloning if necessary."""
     if source.source_type == SourceType.LOCAL_PATH:
         path = Path(source.location).expanduser().resolve()
-        if not path.exists():
+        if not await asyncio.to_thread(path.exists):
             raise ValueError(f"Local path does not exist: {source.location}")
         return path
 
@@ -238,24 +369,21 @@ async def _get_project_path(source: ProjectSource) -> Path:
         repo_name = source.location.split("/")[-1].replace(".git", "")
         clone_path = CLONE_DIR / repo_name
 
-        CLONE_DIR.mkdir(parents=True, exist_ok=True)
+        await asyncio.to_thread(CLONE_DIR.mkdir, parents=True, exist_ok=True)
 
-        if clone_path.exists():
-            # Pull latest
+        # Analysis only needs the current tree, so clones are shallow and
+        # updates fetch just the new tip rather than pulling history
+        if await asyncio.to_thread(clone_path.exists):
             logger.info(f"Updating existing clone: {clone_path}")
-            subprocess.run(
-                ["git", "-C", str(clone_path), "pull"],
-                check=True,
-                capture_output=True,
+            await _run_git(
+                "-C", str(clone_path), "fetch", "--depth=1", "origin", source.branch or "HEAD"
             )
+            await _run_git("-C", str(clone_path), "reset", "--hard", "FETCH_HEAD")
         else:
-            # Clone
             logger.info(f"Cloning repository: {source.location}")
             branch_args = ["-b", source.branch] if source.branch else []
-            subprocess.run(
-                ["git", "clone", *branch_args, source.location, str(clone_path)],
-                check=True,
-                capture_output=True,
+            await _run_git(
+                "clone", "--depth=1", *branch_args, source.location, str(clone_path)
             )
 
         if source.subdirectory:
@@ -265,110 +393,128 @@ async def _get_project_path(source: ProjectSource) -> Path:
     raise ValueError(f"Unknown source type: {source.source_type}")
 
 
-def _scan_project_files(project_path: Path) -> dict[str, list[str]]:
-    """Scan project and categorize files by directory."""
-    file_tree: dict[str, list[str]] = {}
+def _scan_project_files(project_path: Path) -> FileIndex:
+    """Scan project and index files by directory.
 
-    for file_path in project_path.rglob("*"):
-        if not file_path.is_file():
+    Walks with os.scandir and never descends into ignored directories, so
+    e.g. node_modules costs one directory entry rather than a full traversal.
+    """
+    index = FileIndex()
+
+    # (absolute directory, path relative to the project or "" for the root)
+    stack = [(str(project_path), "")]
+    while stack:
+        directory, rel_dir = stack.pop()
+        try:
+            entries = list(os.scandir(directory))
+        except OSError as e:
+            logger.warning(f"Could not scan {directory}: {e}")
             continue
 
-        # Skip common directories to ignore
-        parts = file_path.parts
-        if any(
-            part in {
-                "node_modules", ".git", "__pycache__", ".venv", "venv",
-                "dist", "build", ".next", ".cache", "coverage",
-                "target", ".idea", ".vscode",
-            }
-            for part in parts
-        ):
-            continue
+        files = []
+        subdirs = []
+        for entry in entries:
+            if entry.name in IGNORED_DIRS:
+                continue
+            rel_path = os.path.join(rel_dir, entry.name) if rel_dir else entry.name
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append((entry.path, rel_path))
+            elif entry.is_file():
+                files.append(rel_path)
 
-        # Get relative path
-        rel_path = file_path.relative_to(project_path)
-        parent = str(rel_path.parent) if rel_path.parent != Path(".") else "root"
+        if files:
+            index.dir_ids.extend([len(index.dirs)] * len(files))
+            index.dirs.append(rel_dir or "root")
+            index.paths.extend(files)
+        # Reversed so directories are visited in scandir order, as rglob did
+        stack.extend(reversed(subdirs))
 
-        if parent not in file_tree:
-            file_tree[parent] = []
-        file_tree[parent].append(str(rel_path))
+    return index
 
-    return file_tree
 
+async def _read_key_files(project_path: Path, file_index: FileIndex) -> dict[str, str]:
+    """Read content of key files for analysis.
 
-def _read_key_files(
-    project_path: Path, file_tree: dict[str, list[str]]
-) -> dict[str, str]:
-    """Read content of key files for analysis."""
+    Priority files come first, then other source files. Reads are issued
+    concurrently in worker threads, a window at a time, until max_files
+    usable files are collected.
+    """
     key_files: dict[str, str] = {}
-    files_read = 0
     max_files = 20  # Limit to avoid token explosion
     max_file_size = 50000  # 50KB per file
 
-    # First, read priority files
-    for dir_name, files in file_tree.items():
-        for file_path in files:
-            if files_read >= max_files:
-                break
-
-            file_name = Path(file_path).name
-            if file_name in PRIORITY_FILES:
-                full_path = project_path / file_path
-                try:
-                    content = full_path.read_text(encoding="utf-8", errors="ignore")
-                    if len(content) <= max_file_size:
-                        key_files[file_path] = content
-                        files_read += 1
-                except Exception as e:
-                    logger.warning(f"Could not read {file_path}: {e}")
-
-        if files_read >= max_files:
-            break
-
-    # Then, read additional source files with code extensions
-    for dir_name, files in file_tree.items():
-        for file_path in files:
-            if files_read >= max_files:
-                break
-            if file_path in key_files:
-                continue
-
-            suffix = Path(file_path).suffix
-            if suffix in CODE_EXTENSIONS:
-                full_path = project_path / file_path
-                try:
-                    content = full_path.read_text(encoding="utf-8", errors="ignore")
-                    if len(content) <= max_file_size:
-                        key_files[file_path] = content
-                        files_read += 1
-                except Exception as e:
-                    logger.warning(f"Could not read {file_path}: {e}")
-
-        if files_read >= max_files:
-            break
+    # One pass over the tree, bucketing each path at most once
+    priority: list[str] = []
+    code: list[str] = []
+    for file_path in file_index.paths:
+        if os.path.basename(file_path) in PRIORITY_FILES:
+            priority.append(file_path)
+        elif os.path.splitext(file_path)[1] in CODE_EXTENSIONS:
+            code.append(file_path)
+    candidates = priority + code
+
+    def read(file_path: str) -> str:
+        # Read one character past the limit, so oversized files are detected
+        # without reading them whole
+        with open(project_path / file_path, encoding="utf-8", errors="ignore") as f:
+            return f.read(max_file_size + 1)
+
+    position = 0
+    while len(key_files) < max_files and position < len(candidates):
+        window = candidates[position : position + max_files - len(key_files)]
+        position += len(window)
+        contents = await asyncio.gather(
+            *(asyncio.to_thread(read, file_path) for file_path in window),
+            return_exceptions=True,
+        )
+        for file_path, content in zip(window, contents):
+            if isinstance(content, Exception):
+                logger.warning(f"Could not read {file_path}: {content}")
+            elif len(content) <= max_file_size:
+                key_files[file_path] = content
 
     return key_files
 
 
-def _format_file_tree(file_tree: dict[str, list[str]]) -> str:
+def _format_file_tree(file_index: FileIndex) -> str:
     """Format file tree for prompt."""
+    groups: defaultdict[int, list[str]] = defaultdict(list)
+    for path, dir_id in zip(file_index.paths, file_index.dir_ids):
+        groups[dir_id].append(path)
+
     lines = []
-    for dir_name, files in sorted(file_tree.items()):
-        lines.append(f"{dir_name}/")
+    for dir_id, files in sorted(groups.items(), key=lambda item: file_index.dirs[item[0]]):
+        lines.append(f"{file_index.dirs[dir_id]}/")
         for f in sorted(files)[:20]:  # Limit files per directory
-            lines.append(f"  {Path(f).name}")
+            lines.append(f"  {os.path.basename(f)}")
         if len(files) > 20:
             lines.append(f"  ... and {len(files) - 20} more files")
     return "\n".join(lines)
 
 
 def _format_key_files(key_files: dict[str, str]) -> str:
-    """Format key files content for prompt."""
+    """Format key files content for prompt.
+
+    Files share one token budget, READMEs and blueprints first, then other
+    priority files, then source. The file that crosses the budget is
+    truncated and the rest are omitted.
+    """
+    def rank(path: str) -> int:
+        name = os.path.basename(path)
+        if name in DOC_FILES:
+            return 0
+        return 1 if name in PRIORITY_FILES else 2
+
     parts = []
-    for path, content in key_files.items():
-        # Truncate very long files
-        if len(content) > 10000:
-            content = content[:10000] + "\n... [truncated]"
+    budget = KEY_FILES_TOKEN_BUDGET * CHARS_PER_TOKEN
+    ordered = sorted(key_files.items(), key=lambda item: rank(item[0]))
+    for index, (path, content) in enumerate(ordered):
+        if budget <= 0:
+            parts.append(f"[... {len(ordered) - index} files omitted ...]")
+            break
+        if len(content) > budget:
+            content = content[:budget] + "\n... [truncated]"
+        budget -= len(content)
         parts.append(f"=== {path} ===\n{content}")
     return "\n\n".join(parts)
 
@@ -377,7 +523,7 @@ async def _run_analysis(
     mode: ProjectMode,
     project_name: str,
     goals: str,
-    file_tree: dict[str, list[str]],
+    file_index: FileIndex,
     key_files_content: dict[str, str],
     total_files: int,
 ) -> ProjectAnalysisOutput:
@@ -388,7 +534,7 @@ async def _run_analysis(
     else:  # EXISTING_ENHANCE
         prompt_template = ENHANCEMENT_ANALYSIS_PROMPT
 
-    file_tree_str = _format_file_tree(file_tree)
+    file_tree_str = _format_file_tree(file_index)
     key_files_str = _format_key_files(key_files_content)
 
     prompt = prompt_template.format(
@@ -399,25 +545,21 @@ async def _run_analysis(
     )
 
     try:
-        message = client.messages.create(
+        # Share the adaptive limiter with the build stage, so concurrent
+        # pipelines back off together instead of each retrying into 429s
+        raw = await get_anthropic_limiter().call(
+            get_anthropic_client().messages.with_raw_response.create,
             model="claude-sonnet-4-20250514",
             max_tokens=8192,
             messages=[{"role": "user", "content": prompt}],
         )
+        message = raw.parse()
+        # parse() is a coroutine on newer SDK releases and sync on older ones
+        if inspect.isawaitable(message):
+            message = await message
 
-        response_text = message.content[0].text.strip()
-
-        # Clean up response if wrapped in markdown
-        if response_text.startswith("```json"):
-            response_text = response_text[7:]
-        if response_text.startswith("```"):
-            response_text = response_text[3:]
-        if response_text.endswith("```"):
-            response_text = response_text[:-3]
-        response_text = response_text.strip()
-
-        # Parse JSON response
-        data = json.loads(response_text)
+        # Clean up response if wrapped in markdown, then parse JSON
+        data = orjson.loads(strip_codefence(message.content[0].text))
 
         # Build models from parsed data
         patterns = [
@@ -446,7 +588,7 @@ async def _run_analysis(
             constraints=data.get("constraints", []),
         )
 
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         logger.error(f"Failed to parse analysis response: {e}")
         raise ValueError(f"Invalid analysis response format: {e}")
     except KeyError as e:
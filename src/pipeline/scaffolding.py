@@ -7,14 +7,17 @@ For existing projects, generates diff-based blueprints with
 file modifications and new file specifications.
 """
 
-import json
+import asyncio
 import logging
-import os
-from pathlib import Path
+import re
+from collections import defaultdict
+from typing import Any
 
 import anthropic
-from dotenv import load_dotenv
+import orjson
+from pydantic import TypeAdapter
 
+from ..core.env import SCAFFOLD_SINGLE_CALL, SCAFFOLD_STRUCTURE_MODEL, SCAFFOLD_TECH_STACK_MODEL
 from ..core.models import (
     EnrichmentResult,
     EvaluationResult,
@@ -25,16 +28,73 @@ from ..core.models import (
     ProjectMode,
     ScaffoldingOutput,
 )
+from . import _llm_cache
+from ._anthropic import get_anthropic_client_view, run_message_batch, stream_text
+from ._codefence import strip_codefence
+from ._ratelimit import get_anthropic_limiter
 
-# Load shared env first, then local can override
-shared_env = Path.home() / ".env.shared"
-if shared_env.exists():
-    load_dotenv(shared_env)
-load_dotenv()
 logger = logging.getLogger(__name__)
 
-# Initialize Anthropic client
-client = anthropic.Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY", ""))
+SCAFFOLDING_MODEL = "claude-sonnet-4-20250514"
+# The tech stack decision and structure skeleton are short, stereotyped
+# answers, so they run on a smaller, faster model
+TECH_STACK_DECISION_MODEL = SCAFFOLD_TECH_STACK_MODEL
+STRUCTURE_MODEL = SCAFFOLD_STRUCTURE_MODEL
+# Fixing a malformed JSON reply is mechanical, so it goes to the small model too
+JSON_REPAIR_MODEL = SCAFFOLD_STRUCTURE_MODEL
+
+JSON_REPAIR_SYSTEM = (
+    "You repair malformed JSON. Rewrite the user's text as valid JSON with the same "
+    "keys and values, dropping any prose around it. Respond with the JSON only, "
+    "no code fences."
+)
+
+# Top-level directory -> project_structure category for an existing project's
+# new files; anything else is filed under "config"
+STRUCTURE_BUCKETS = (
+    ("src/", "src"),
+    ("tests/", "tests"),
+    ("test/", "tests"),
+    ("docs/", "docs"),
+    ("doc/", "docs"),
+)
+
+# Keyword -> tech stack rules for _heuristic_tech_stack, after the mappings in
+# TECH_STACK_DECISION_PROMPT: (primary language, base stack, framework names).
+# Names match case-sensitively, so prose like "react to" or "click" doesn't count,
+# and only inside the blueprint's tech stack section, so a sentence that merely
+# starts with "Click" or "React" doesn't either.
+_TECH_STACK_KEYWORDS = (
+    ("Python", ["Python 3.11+", "pytest"], (
+        "FastAPI", "Django", "Flask", "Click", "Typer", "argparse", "pandas", "Airflow",
+    )),
+    ("TypeScript", ["TypeScript", "Node.js"], (
+        "Next.js", "React", "Express", "Fastify", "Commander", "yargs", "NestJS",
+    )),
+    ("Go", ["Go"], ("Golang", "Cobra")),
+    ("Rust", ["Rust", "Cargo"], ("Rust", "Tokio", "Axum")),
+    ("C#", ["C#", ".NET"], ("Unity", "ASP.NET", "C#")),
+)
+_TECH_STACK_ALIASES = {"Golang": "Go"}
+_TECH_STACK_RULES = tuple(
+    (
+        language,
+        base,
+        re.compile(r"(?<![\w.#])(" + "|".join(map(re.escape, names)) + r")(?![\w#])"),
+    )
+    for language, base, names in _TECH_STACK_KEYWORDS
+)
+_TECH_STACK_HEADING = re.compile(r"^(#{1,6})[ \t][^\n]*\btech(?:nology)? stack", re.I | re.M)
+_MARKDOWN_HEADING = re.compile(r"^(#{1,6})[ \t]", re.M)
+
+# Validate a change spec's lists in one call each
+_FILE_MODIFICATIONS = TypeAdapter(list[FileModification])
+_NEW_FILES = TypeAdapter(list[NewFileSpec])
+
+# Message Batches polling for scaffold_ideas_batch: how often to check, and
+# how long to wait before cancelling and falling back to live requests
+BATCH_POLL_INTERVAL = 20.0
+BATCH_MAX_WAIT = 3600.0
 
 TECH_STACK_DECISION_PROMPT = """You are a senior software architect. Based on the project blueprint below, decide on the optimal tech stack.
 
@@ -84,37 +144,76 @@ Write a concise markdown blueprint (500-800 words) covering:
 Return ONLY the markdown content, no code blocks wrapping it.
 """
 
-STRUCTURE_PROMPT = """For a {tech_primary} project called "{title}", generate a JSON project structure.
+STRUCTURE_PROMPT = """For a {tech_primary} project called "{title}", generate the project structure and record it with the emit_structure tool.
 
 DECIDED TECH STACK: {tech_stack}
 
-Return ONLY valid JSON with this exact format. Use file extensions appropriate for the tech stack:
+Use paths relative to the project root (e.g. "src/main.py", "tests/test_main.py") and file extensions appropriate for the tech stack:
 - Python: .py files, pyproject.toml, pytest
 - TypeScript: .ts files, package.json, tsconfig.json
 - Go: .go files, go.mod
 - Rust: .rs files, Cargo.toml
 - C#: .cs files, .csproj
 
-Example for Python:
-{{
-  "src": ["src/main.py", "src/config.py"],
-  "tests": ["tests/test_main.py"],
-  "docs": ["docs/README.md"],
-  "config": ["pyproject.toml", ".env.example"],
-  "estimated_hours": 40
-}}
+Keep the file lists short (5-8 files per category max).
+"""
+
+# Four short file lists and an hour estimate are ~250 tokens; the cap leaves
+# room for 8 long paths per category while keeping a runaway reply small
+STRUCTURE_MAX_TOKENS = 512
+
+# Structured output for STRUCTURE_PROMPT: the model fills in the tool input,
+# so the response needs no fence stripping or JSON parsing
+_FILE_LIST = {"type": "array", "items": {"type": "string"}}
+STRUCTURE_TOOL = {
+    "name": "emit_structure",
+    "description": "Record the project's files by category and the estimated build time.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "src": {**_FILE_LIST, "description": "Source files, e.g. src/main.py"},
+            "tests": {**_FILE_LIST, "description": "Test files, e.g. tests/test_main.py"},
+            "docs": {**_FILE_LIST, "description": "Documentation, e.g. docs/README.md"},
+            "config": {**_FILE_LIST, "description": "Config files, e.g. pyproject.toml"},
+            "estimated_hours": {"type": "integer", "description": "Estimated hours to build"},
+        },
+        "required": ["src", "tests", "docs", "config", "estimated_hours"],
+    },
+}
+
+COMBINED_SCAFFOLD_PROMPT = """You are an expert software architect. Plan a new project:
+
+**{title}**
+
+{description}
+
+Problem: {problem_statement}
+
+{tech_stack_instruction}
+
+Answer all three tasks in one JSON object:
+1. "blueprint": a concise markdown blueprint (500-800 words) covering architecture overview, key components, tech stack choices and implementation phases
+2. "tech_stack": the primary language, the full tech stack, and a 1-2 sentence reasoning
+3. "structure": the project's files, with extensions appropriate for the tech stack (5-8 files per category max), and the estimated hours
 
-Example for TypeScript:
+Return ONLY valid JSON with this exact format:
 {{
-  "src": ["src/app.ts", "src/config/index.ts"],
-  "tests": ["tests/app.test.ts"],
-  "docs": ["docs/README.md"],
-  "config": ["package.json", "tsconfig.json"],
-  "estimated_hours": 40
+  "blueprint": "# Project\\n\\n## Architecture overview\\n...",
+  "tech_stack": {{
+    "primary_language": "Python",
+    "tech_stack": ["Python 3.11+", "pytest", "Poetry", "Click"],
+    "reasoning": "Brief explanation of why this stack fits the requirements"
+  }},
+  "structure": {{
+    "src": ["src/main.py", "src/config.py"],
+    "tests": ["tests/test_main.py"],
+    "docs": ["docs/README.md"],
+    "config": ["pyproject.toml", ".env.example"],
+    "estimated_hours": 40
+  }}
 }}
 
-Keep the file lists short (5-8 files per category max).
-Return ONLY the JSON, no explanation.
+Respond concisely; no prose outside the JSON and no markdown code blocks wrapping it.
 """
 
 EXISTING_PROJECT_BLUEPRINT_PROMPT = """You are an expert software architect. Create an enhancement/completion blueprint for an EXISTING project.
@@ -191,6 +290,9 @@ async def scaffold_idea(
         Uses two separate API calls for reliability:
         1. Generate blueprint (plain text)
         2. Generate structure (JSON)
+        With SCAFFOLD_SINGLE_CALL=1 both (and the tech stack decision) come
+        from one combined call, falling back to separate calls if it fails
+        to parse.
 
     For EXISTING projects:
         Uses context-aware prompts to generate:
@@ -228,31 +330,65 @@ async def _scaffold_new_project(
     idea: Idea, enrichment: EnrichmentResult
 ) -> ScaffoldingOutput:
     """Generate scaffold for a new project."""
-    # Step 1: Generate blueprint (plain markdown)
-    blueprint = await _generate_blueprint(enrichment)
-
-    # Step 2: Decide tech stack (Option B) or use user override (Option C fallback)
-    if idea.preferred_tech_stack:
-        # User specified tech stack - use it directly
-        tech_stack_decision = {
-            "primary_language": idea.preferred_tech_stack[0] if idea.preferred_tech_stack else "Python",
-            "tech_stack": idea.preferred_tech_stack,
-            "reasoning": "User-specified tech stack override",
-        }
-        logger.info(f"Using user-specified tech stack: {idea.preferred_tech_stack}")
+    tech_stack_decision = _user_tech_stack_decision(idea)
+
+    combined = None
+    if SCAFFOLD_SINGLE_CALL:
+        combined = await _generate_combined_scaffold(enrichment, tech_stack_decision)
+
+    if combined is not None:
+        blueprint, tech_stack_decision, structure_data = combined
+    elif tech_stack_decision is not None:
+        # The structure doesn't depend on the blueprint, so generate both at once
+        blueprint, structure_data = await asyncio.gather(
+            _generate_blueprint(enrichment),
+            _generate_structure(
+                enrichment.enhanced_title,
+                tech_stack_decision["primary_language"],
+                tech_stack_decision["tech_stack"],
+            ),
+        )
     else:
-        # AI decides based on blueprint analysis
-        tech_stack_decision = await _decide_tech_stack(blueprint)
-        logger.info(f"AI decided tech stack: {tech_stack_decision['tech_stack']} - {tech_stack_decision['reasoning']}")
-
-    # Step 3: Generate structure using the decided tech stack
-    structure_data = await _generate_structure(
-        enrichment.enhanced_title,
-        tech_stack_decision["primary_language"],
-        tech_stack_decision["tech_stack"],
-    )
+        # Step 1: Generate blueprint (plain markdown)
+        blueprint = await _generate_blueprint(enrichment)
+
+        # Step 2: Decide tech stack from the blueprint - by keyword when it's
+        # unambiguous, otherwise by AI analysis (Option B)
+        tech_stack_decision = _heuristic_tech_stack(blueprint)
+        if tech_stack_decision is None:
+            tech_stack_decision = await _decide_tech_stack(blueprint)
+        logger.info(f"Decided tech stack: {tech_stack_decision['tech_stack']} - {tech_stack_decision['reasoning']}")
+
+        # Step 3: Generate structure using the decided tech stack
+        structure_data = await _generate_structure(
+            enrichment.enhanced_title,
+            tech_stack_decision["primary_language"],
+            tech_stack_decision["tech_stack"],
+        )
 
-    output = ScaffoldingOutput(
+    output = _new_project_output(blueprint, tech_stack_decision, structure_data)
+
+    logger.info(f"New project scaffolding completed for idea: {idea.id}")
+    return output
+
+
+def _user_tech_stack_decision(idea: Idea) -> dict | None:
+    """Tech stack decision from the user's override (Option C), if they gave one."""
+    if not idea.preferred_tech_stack:
+        return None
+    logger.info(f"Using user-specified tech stack: {idea.preferred_tech_stack}")
+    return {
+        "primary_language": idea.preferred_tech_stack[0],
+        "tech_stack": idea.preferred_tech_stack,
+        "reasoning": "User-specified tech stack override",
+    }
+
+
+def _new_project_output(
+    blueprint: str, tech_stack_decision: dict, structure_data: dict
+) -> ScaffoldingOutput:
+    """Assemble a new project's scaffold from its generated parts."""
+    return ScaffoldingOutput(
         blueprint_content=blueprint,
         project_structure=structure_data.get("project_structure", {
             "src": ["src/main.py"],
@@ -264,9 +400,6 @@ async def _scaffold_new_project(
         estimated_hours=structure_data.get("estimated_hours"),
     )
 
-    logger.info(f"New project scaffolding completed for idea: {idea.id}")
-    return output
-
 
 async def _scaffold_existing_project(
     idea: Idea,
@@ -274,41 +407,45 @@ async def _scaffold_existing_project(
     analysis: ProjectAnalysisResult,
 ) -> ScaffoldingOutput:
     """Generate scaffold for an existing project (diff-based)."""
-    # Step 1: Generate integration-focused blueprint
-    blueprint = await _generate_existing_project_blueprint(idea, enrichment, analysis)
+    # Integration-focused blueprint and JSON change specification. Both
+    # depend only on the idea and its analysis, so they run concurrently.
+    blueprint, change_spec = await asyncio.gather(
+        _generate_existing_project_blueprint(idea, enrichment, analysis),
+        _generate_existing_project_structure(idea, enrichment, analysis),
+    )
 
-    # Step 2: Generate change specification (JSON)
-    change_spec = await _generate_existing_project_structure(idea, enrichment, analysis)
+    output = _existing_project_output(blueprint, change_spec, analysis)
 
-    # Build file modifications list
-    file_modifications = [
-        FileModification(**mod)
-        for mod in change_spec.get("file_modifications", [])
-    ]
+    logger.info(f"Existing project scaffolding completed for idea: {idea.id}")
+    return output
 
-    # Build new files list
-    new_files = [
-        NewFileSpec(**spec)
-        for spec in change_spec.get("new_files", [])
-    ]
+
+def _existing_project_output(
+    blueprint: str, change_spec: dict, analysis: ProjectAnalysisResult
+) -> ScaffoldingOutput:
+    """Assemble an existing project's scaffold from its blueprint and change spec."""
+    # Build file modifications and new files lists
+    file_modifications = _FILE_MODIFICATIONS.validate_python(
+        change_spec.get("file_modifications", [])
+    )
+    new_files = _NEW_FILES.validate_python(change_spec.get("new_files", []))
 
     # Get preserved files
     preserved_files = change_spec.get("preserved_files", [])
 
     # Build project structure from new files
-    project_structure = {"src": [], "tests": [], "docs": [], "config": []}
+    buckets: defaultdict[str, list[str]] = defaultdict(list)
     for new_file in new_files:
         path = new_file.file_path
-        if path.startswith("src/"):
-            project_structure["src"].append(path)
-        elif path.startswith("test"):
-            project_structure["tests"].append(path)
-        elif path.startswith("doc"):
-            project_structure["docs"].append(path)
-        else:
-            project_structure["config"].append(path)
+        bucket = next(
+            (bucket for prefix, bucket in STRUCTURE_BUCKETS if path.startswith(prefix)), "config"
+        )
+        buckets[bucket].append(path)
+    project_structure = {
+        category: buckets.get(category, []) for category in ("src", "tests", "docs", "config")
+    }
 
-    output = ScaffoldingOutput(
+    return ScaffoldingOutput(
         blueprint_content=blueprint,
         project_structure=project_structure,
         tech_stack=change_spec.get("tech_stack", analysis.detected_tech_stack),
@@ -318,8 +455,94 @@ async def _scaffold_existing_project(
         preserved_files=preserved_files,
     )
 
-    logger.info(f"Existing project scaffolding completed for idea: {idea.id}")
-    return output
+
+def _client() -> anthropic.AsyncAnthropic:
+    """Shared client with scaffolding's retry and timeout settings.
+
+    with_options() copies share the shared client's connection pool.
+    """
+    return get_anthropic_client_view(max_retries=5, timeout=120.0, connect=10.0)
+
+
+async def _create_text(
+    prompt: str, max_tokens: int, model: str = SCAFFOLDING_MODEL, system: str | None = None
+) -> str:
+    """Send a single-prompt request through the shared adaptive rate limiter."""
+    kwargs = {"system": system} if system else {}
+    message = await get_anthropic_limiter().call(
+        _client().messages.create,
+        model=model,
+        max_tokens=max_tokens,
+        messages=[{"role": "user", "content": prompt}],
+        **kwargs,
+    )
+    return message.content[0].text
+
+
+async def _loads_or_repair(response_text: str, max_tokens: int) -> Any:
+    """Parse a JSON reply, giving the model one chance to repair it if it's malformed.
+
+    Raises:
+        orjson.JSONDecodeError: The original parse error, if the repair request
+            fails or its reply still doesn't parse
+    """
+    try:
+        return orjson.loads(response_text)
+    except orjson.JSONDecodeError as e:
+        decode_error = e
+    logger.warning(f"Malformed JSON reply ({decode_error}), requesting a repair")
+
+    try:
+        repaired = await _create_text(
+            f"Fix this to be valid JSON:\n{response_text}",
+            max_tokens=max_tokens,
+            model=JSON_REPAIR_MODEL,
+            system=JSON_REPAIR_SYSTEM,
+        )
+    except Exception as e:
+        # Callers fall back on a parse error; a failed repair mustn't turn into
+        # a different (stage-failing) error
+        logger.warning(f"JSON repair request failed: {e}")
+        raise decode_error from e
+    return orjson.loads(strip_codefence(repaired))
+
+
+async def _create_tool_input(
+    prompt: str, tool: dict, max_tokens: int, model: str = SCAFFOLDING_MODEL
+) -> dict:
+    """Have the model answer by calling the given tool, and return the tool input."""
+    message = await get_anthropic_limiter().call(
+        _client().messages.create,
+        model=model,
+        max_tokens=max_tokens,
+        tools=[tool],
+        tool_choice={"type": "tool", "name": tool["name"]},
+        messages=[{"role": "user", "content": prompt}],
+    )
+    # A reply cut off at max_tokens carries partial (or no) tool input
+    if message.stop_reason == "max_tokens":
+        raise ValueError(f"{tool['name']} call truncated at {max_tokens} tokens")
+    for block in message.content:
+        if block.type == "tool_use":
+            missing = set(tool["input_schema"].get("required", ())) - block.input.keys()
+            if missing:
+                raise ValueError(f"{tool['name']} call missing {sorted(missing)}")
+            return block.input
+    raise ValueError(f"No {tool['name']} call in response (stop_reason={message.stop_reason})")
+
+
+async def _stream_text(prompt: str, max_tokens: int) -> str:
+    """Stream a single-prompt response and return its full text.
+
+    Used for the long markdown blueprints, so output starts flowing at once
+    instead of the connection idling until the whole response is ready.
+    """
+    return await stream_text(
+        _client(),
+        model=SCAFFOLDING_MODEL,
+        max_tokens=max_tokens,
+        messages=[{"role": "user", "content": prompt}],
+    )
 
 
 async def _generate_blueprint(enrichment: EnrichmentResult) -> str:
@@ -330,50 +553,98 @@ async def _generate_blueprint(enrichment: EnrichmentResult) -> str:
         problem_statement=enrichment.problem_statement,
     )
 
-    message = client.messages.create(
-        model="claude-sonnet-4-20250514",
-        max_tokens=2048,
-        messages=[{"role": "user", "content": prompt}],
-    )
+    # Re-runs with identical enrichment replay the earlier blueprint
+    cache_key, prompt_hash = _llm_cache.cache_key(SCAFFOLDING_MODEL, prompt, max_tokens=2048)
+    cached = await _llm_cache.get_cached(cache_key)
+    if cached is not None:
+        return cached
+
+    blueprint = (await _stream_text(prompt, max_tokens=2048)).strip()
+    await _llm_cache.set_cached(cache_key, SCAFFOLDING_MODEL, prompt_hash, blueprint)
+    return blueprint
 
-    return message.content[0].text.strip()
+
+def _heuristic_tech_stack(blueprint: str) -> dict | None:
+    """Decide tech stack from framework/tool keywords in the blueprint's tech stack section.
+
+    Returns:
+        The decision when the keywords point to exactly one language, or None
+        (no tech stack section, no hits, or hits for several languages) to
+        defer to _decide_tech_stack.
+    """
+    section = _tech_stack_section(blueprint)
+    if section is None:
+        return None
+
+    matches = []
+    for primary_language, base_stack, pattern in _TECH_STACK_RULES:
+        # dict.fromkeys dedupes while keeping first-mention order
+        names = list(dict.fromkeys(
+            _TECH_STACK_ALIASES.get(name, name) for name in pattern.findall(section)
+        ))
+        if names:
+            matches.append((primary_language, base_stack, names))
+    if len(matches) != 1:
+        return None
+
+    ((primary_language, base_stack, names),) = matches
+    return {
+        "primary_language": primary_language,
+        "tech_stack": base_stack + [name for name in names if name not in base_stack],
+        "reasoning": f"Blueprint names {', '.join(names)}",
+    }
+
+
+def _tech_stack_section(blueprint: str) -> str | None:
+    """The blueprint's "Tech stack" markdown section, heading included, if it has one."""
+    heading = _TECH_STACK_HEADING.search(blueprint)
+    if heading is None:
+        return None
+    level = len(heading.group(1))
+    # The section runs to the next heading at the same or a higher level
+    for match in _MARKDOWN_HEADING.finditer(blueprint, heading.end()):
+        if len(match.group(1)) <= level:
+            return blueprint[heading.start():match.start()]
+    return blueprint[heading.start():]
 
 
 async def _decide_tech_stack(blueprint: str) -> dict:
     """Decide tech stack based on blueprint analysis.
 
-    This is the explicit tech stack decision phase (Option B).
-    Cost: ~$0.003-0.005 per call (~2-3% additional pipeline time).
+    This is the explicit tech stack decision phase (Option B). It runs on
+    TECH_STACK_DECISION_MODEL, a small model, so it adds little time or cost.
 
     Returns:
         Dict with primary_language, tech_stack list, and reasoning.
     """
     prompt = TECH_STACK_DECISION_PROMPT.format(blueprint=blueprint)
 
-    message = client.messages.create(
-        model="claude-sonnet-4-20250514",
-        max_tokens=256,  # Short response expected
-        messages=[{"role": "user", "content": prompt}],
-    )
-
-    response_text = message.content[0].text.strip()
+    cache_key, prompt_hash = _llm_cache.cache_key(TECH_STACK_DECISION_MODEL, prompt, max_tokens=256)
+    cached = await _llm_cache.get_cached(cache_key)
+    if cached is not None:
+        response_text = cached
+    else:
+        # Short response expected
+        response_text = await _create_text(
+            prompt, max_tokens=256, model=TECH_STACK_DECISION_MODEL
+        )
 
     # Clean up if wrapped in code blocks
-    if response_text.startswith("```"):
-        first_newline = response_text.find("\n")
-        if first_newline > 0:
-            response_text = response_text[first_newline + 1:]
-    if response_text.endswith("```"):
-        response_text = response_text[:-3]
+    response_text = strip_codefence(response_text)
 
     try:
-        decision = json.loads(response_text.strip())
+        decision = await _loads_or_repair(response_text, max_tokens=256)
+        # Only cache decisions that parsed, so the fallback isn't replayed
+        if cached is None:
+            await _llm_cache.set_cached(
+                cache_key, TECH_STACK_DECISION_MODEL, prompt_hash, orjson.dumps(decision).decode()
+            )
         return {
             "primary_language": decision.get("primary_language", "Python"),
             "tech_stack": decision.get("tech_stack", ["Python"]),
             "reasoning": decision.get("reasoning", "Default fallback"),
         }
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         logger.warning(f"Failed to parse tech stack decision: {e}. Using Python fallback.")
         return {
             "primary_language": "Python",
@@ -400,25 +671,25 @@ async def _generate_structure(
         tech_stack=", ".join(tech_stack),
     )
 
-    message = client.messages.create(
-        model="claude-sonnet-4-20250514",
-        max_tokens=1024,
-        messages=[{"role": "user", "content": prompt}],
+    cache_key, prompt_hash = _llm_cache.cache_key(
+        STRUCTURE_MODEL, prompt, max_tokens=STRUCTURE_MAX_TOKENS, tool=STRUCTURE_TOOL["name"]
     )
+    cached = await _llm_cache.get_cached(cache_key)
+    if cached is not None:
+        data = orjson.loads(cached)
+    else:
+        data = await _create_tool_input(
+            prompt, STRUCTURE_TOOL, max_tokens=STRUCTURE_MAX_TOKENS, model=STRUCTURE_MODEL
+        )
+        await _llm_cache.set_cached(
+            cache_key, STRUCTURE_MODEL, prompt_hash, orjson.dumps(data).decode()
+        )
 
-    response_text = message.content[0].text.strip()
-
-    # Clean up if wrapped in code blocks
-    if response_text.startswith("```"):
-        first_newline = response_text.find("\n")
-        if first_newline > 0:
-            response_text = response_text[first_newline + 1:]
-    if response_text.endswith("```"):
-        response_text = response_text[:-3]
+    return _normalize_structure(data)
 
-    data = json.loads(response_text.strip())
 
-    # Normalize structure
+def _normalize_structure(data: dict) -> dict:
+    """Normalize a structure response into project_structure + estimated_hours."""
     return {
         "project_structure": {
             "src": data.get("src", []),
@@ -430,12 +701,98 @@ async def _generate_structure(
     }
 
 
+async def _generate_combined_scaffold(
+    enrichment: EnrichmentResult, tech_stack_decision: dict | None
+) -> tuple[str, dict, dict] | None:
+    """Generate blueprint, tech stack decision and structure in a single call.
+
+    Args:
+        enrichment: The enrichment result
+        tech_stack_decision: User-specified decision to plan around, or None
+            to let the model decide
+
+    Returns:
+        (blueprint, tech_stack_decision, structure_data), or None if the
+        response couldn't be parsed (callers fall back to separate calls)
+    """
+    prompt = _combined_scaffold_prompt(enrichment, tech_stack_decision)
+
+    cache_key, prompt_hash = _llm_cache.cache_key(SCAFFOLDING_MODEL, prompt, max_tokens=4096)
+    cached = await _llm_cache.get_cached(cache_key)
+    if cached is not None:
+        response_text = cached
+    else:
+        response_text = strip_codefence(await _create_text(prompt, max_tokens=4096))
+
+    combined = _parse_combined_scaffold(response_text, tech_stack_decision)
+
+    # Only cache responses that parsed, so a malformed reply isn't replayed
+    if combined is not None and cached is None:
+        await _llm_cache.set_cached(cache_key, SCAFFOLDING_MODEL, prompt_hash, response_text)
+
+    return combined
+
+
+def _combined_scaffold_prompt(
+    enrichment: EnrichmentResult, tech_stack_decision: dict | None
+) -> str:
+    """Render the single-call scaffold prompt."""
+    if tech_stack_decision is not None:
+        tech_stack_instruction = (
+            f"Use this tech stack: {', '.join(tech_stack_decision['tech_stack'])}"
+        )
+    else:
+        tech_stack_instruction = (
+            "Choose the optimal tech stack for the project type, requirements and platform."
+        )
+
+    return COMBINED_SCAFFOLD_PROMPT.format(
+        title=enrichment.enhanced_title,
+        description=enrichment.enhanced_description,
+        problem_statement=enrichment.problem_statement,
+        tech_stack_instruction=tech_stack_instruction,
+    )
+
+
+def _parse_combined_scaffold(
+    response_text: str, tech_stack_decision: dict | None
+) -> tuple[str, dict, dict] | None:
+    """Parse a single-call scaffold response, or return None if it's unusable."""
+    try:
+        data = orjson.loads(response_text)
+        blueprint = data["blueprint"].strip()
+        if tech_stack_decision is None:
+            decision = data["tech_stack"]
+            tech_stack_decision = {
+                "primary_language": decision.get("primary_language", "Python"),
+                "tech_stack": decision.get("tech_stack", ["Python"]),
+                "reasoning": decision.get("reasoning", "Default fallback"),
+            }
+            logger.info(f"AI decided tech stack: {tech_stack_decision['tech_stack']} - {tech_stack_decision['reasoning']}")
+        structure_data = _normalize_structure(data["structure"])
+    except (orjson.JSONDecodeError, KeyError, TypeError, AttributeError) as e:
+        logger.warning(f"Failed to parse single-call scaffold: {e}. Using separate calls.")
+        return None
+
+    return blueprint, tech_stack_decision, structure_data
+
+
 async def _generate_existing_project_blueprint(
     idea: Idea,
     enrichment: EnrichmentResult,
     analysis: ProjectAnalysisResult,
 ) -> str:
     """Generate integration-focused blueprint for existing project."""
+    prompt = _existing_project_blueprint_prompt(idea, enrichment, analysis)
+    return (await _stream_text(prompt, max_tokens=2048)).strip()
+
+
+def _existing_project_blueprint_prompt(
+    idea: Idea,
+    enrichment: EnrichmentResult,
+    analysis: ProjectAnalysisResult,
+) -> str:
+    """Render the integration-focused blueprint prompt."""
     # Format patterns
     patterns = ", ".join(p.pattern_name for p in analysis.detected_patterns) or "None detected"
 
@@ -457,7 +814,7 @@ Completeness Score: {analysis.completeness_score or 'N/A'}"""
 {opps_list}
 Architecture Quality: {analysis.architecture_quality_score or 'N/A'}"""
 
-    prompt = EXISTING_PROJECT_BLUEPRINT_PROMPT.format(
+    return EXISTING_PROJECT_BLUEPRINT_PROMPT.format(
         project_name=analysis.project_name,
         title=enrichment.enhanced_title,
         description=enrichment.enhanced_description,
@@ -467,14 +824,6 @@ Architecture Quality: {analysis.architecture_quality_score or 'N/A'}"""
         mode_specific_context=mode_context,
     )
 
-    message = client.messages.create(
-        model="claude-sonnet-4-20250514",
-        max_tokens=2048,
-        messages=[{"role": "user", "content": prompt}],
-    )
-
-    return message.content[0].text.strip()
-
 
 async def _generate_existing_project_structure(
     idea: Idea,
@@ -482,13 +831,27 @@ async def _generate_existing_project_structure(
     analysis: ProjectAnalysisResult,
 ) -> dict:
     """Generate change specification for existing project."""
+    prompt = _existing_project_structure_prompt(enrichment, analysis)
+
+    response_text = await _create_text(prompt, max_tokens=2048)
+
+    # Clean up if wrapped in code blocks
+    response_text = strip_codefence(response_text)
+
+    return await _loads_or_repair(response_text, max_tokens=2048)
+
+
+def _existing_project_structure_prompt(
+    enrichment: EnrichmentResult, analysis: ProjectAnalysisResult
+) -> str:
+    """Render the change specification prompt."""
     # Format existing structure from key files
     existing_structure = "\n".join(
         f"  - {f.path}: {f.purpose}"
         for f in analysis.key_files[:10]
     )
 
-    prompt = EXISTING_PROJECT_STRUCTURE_PROMPT.format(
+    return EXISTING_PROJECT_STRUCTURE_PROMPT.format(
         tech_primary=", ".join(analysis.detected_tech_stack[:3]) or "Unknown",
         project_name=analysis.project_name,
         title=enrichment.enhanced_title,
@@ -496,20 +859,97 @@ async def _generate_existing_project_structure(
         existing_structure=existing_structure,
     )
 
-    message = client.messages.create(
-        model="claude-sonnet-4-20250514",
-        max_tokens=2048,
-        messages=[{"role": "user", "content": prompt}],
-    )
 
-    response_text = message.content[0].text.strip()
+async def scaffold_ideas_batch(
+    items: list[tuple[Idea, EnrichmentResult, EvaluationResult, ProjectAnalysisResult | None]],
+) -> list[ScaffoldingOutput]:
+    """Scaffold many ideas through one Anthropic Message Batch.
 
-    # Clean up if wrapped in code blocks
-    if response_text.startswith("```"):
-        first_newline = response_text.find("\n")
-        if first_newline > 0:
-            response_text = response_text[first_newline + 1:]
-    if response_text.endswith("```"):
-        response_text = response_text[:-3]
-
-    return json.loads(response_text.strip())
+    For non-interactive bulk runs: batched requests cost half as much but
+    can take minutes to hours. New projects use the single-call scaffold
+    prompt and existing projects their blueprint and change-spec prompts,
+    all in one submission. Ideas whose results don't come back usable are
+    scaffolded live with scaffold_idea.
+
+    Args:
+        items: (idea, enrichment, evaluation, analysis) per idea, as for scaffold_idea
+
+    Returns:
+        ScaffoldingOutput per item, in order
+
+    Raises:
+        ValueError: If a live fallback fails
+    """
+    decisions = [_user_tech_stack_decision(idea) for idea, *_ in items]
+
+    prompts: dict[str, tuple[str, int]] = {}
+    for i, (idea, enrichment, _evaluation, analysis) in enumerate(items):
+        if idea.mode == ProjectMode.NEW or not analysis:
+            prompts[f"new-{i}"] = (_combined_scaffold_prompt(enrichment, decisions[i]), 4096)
+        else:
+            prompts[f"blueprint-{i}"] = (
+                _existing_project_blueprint_prompt(idea, enrichment, analysis), 2048
+            )
+            prompts[f"changes-{i}"] = (
+                _existing_project_structure_prompt(enrichment, analysis), 2048
+            )
+
+    responses = await _run_message_batch(prompts)
+
+    outputs: list[ScaffoldingOutput | None] = []
+    for i, (idea, _enrichment, _evaluation, analysis) in enumerate(items):
+        output = None
+        if f"new-{i}" in responses:
+            combined = _parse_combined_scaffold(
+                strip_codefence(responses[f"new-{i}"]), decisions[i]
+            )
+            if combined is not None:
+                output = _new_project_output(*combined)
+        elif f"blueprint-{i}" in responses and f"changes-{i}" in responses:
+            try:
+                change_spec = orjson.loads(strip_codefence(responses[f"changes-{i}"]))
+                output = _existing_project_output(
+                    responses[f"blueprint-{i}"].strip(), change_spec, analysis
+                )
+            except (ValueError, TypeError, AttributeError) as e:
+                logger.warning(f"Unusable batched change spec for idea {idea.id}: {e}")
+        outputs.append(output)
+
+    # Anything the batch didn't produce is scaffolded live
+    fallback = [i for i, output in enumerate(outputs) if output is None]
+    if fallback:
+        logger.info(f"Scaffolding {len(fallback)} of {len(items)} ideas with live requests")
+        live = await asyncio.gather(*(scaffold_idea(*items[i]) for i in fallback))
+        for i, output in zip(fallback, live):
+            outputs[i] = output
+
+    return outputs
+
+
+async def _run_message_batch(prompts: dict[str, tuple[str, int]]) -> dict[str, str]:
+    """Submit single-prompt requests as one Message Batch and wait for the results.
+
+    Args:
+        prompts: custom_id -> (prompt, max_tokens)
+
+    Returns:
+        custom_id -> response text for every request that succeeded. Anything
+        missing (errors, expiry, or a batch that outlives BATCH_MAX_WAIT) is
+        left to the caller's fallback.
+    """
+    return await run_message_batch(
+        _client(),
+        [
+            {
+                "custom_id": custom_id,
+                "params": {
+                    "model": SCAFFOLDING_MODEL,
+                    "max_tokens": max_tokens,
+                    "messages": [{"role": "user", "content": prompt}],
+                },
+            }
+            for custom_id, (prompt, max_tokens) in prompts.items()
+        ],
+        poll_interval=BATCH_POLL_INTERVAL,
+        max_wait=BATCH_MAX_WAIT,
+    )
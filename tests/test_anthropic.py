@@ -0,0 +1,90 @@
+"""Tests for the shared Anthropic request helpers."""
+
+from types import SimpleNamespace
+
+from src.pipeline import _anthropic
+
+
+class FakeBatches:
+    """Message Batches endpoint that ends after a set number of polls."""
+
+    def __init__(self, results: dict[str, str | None], polls: int = 1) -> None:
+        self.results_by_id = results
+        self.polls = polls
+        self.submitted: list[dict] = []
+        self.cancelled: list[str] = []
+
+    async def create(self, requests: list[dict]) -> SimpleNamespace:
+        self.submitted = requests
+        return SimpleNamespace(id="batch-1", processing_status="in_progress")
+
+    async def retrieve(self, batch_id: str) -> SimpleNamespace:
+        self.polls -= 1
+        status = "ended" if self.polls <= 0 else "in_progress"
+        return SimpleNamespace(id=batch_id, processing_status=status)
+
+    async def cancel(self, batch_id: str) -> None:
+        self.cancelled.append(batch_id)
+
+    async def results(self, batch_id: str):
+        async def entries():
+            for custom_id, text in self.results_by_id.items():
+                if text is None:
+                    errored = SimpleNamespace(type="errored")
+                    yield SimpleNamespace(custom_id=custom_id, result=errored)
+                    continue
+                message = SimpleNamespace(content=[SimpleNamespace(text=text)])
+                yield SimpleNamespace(
+                    custom_id=custom_id,
+                    result=SimpleNamespace(type="succeeded", message=message),
+                )
+
+        return entries()
+
+
+def _client(batches: FakeBatches) -> SimpleNamespace:
+    return SimpleNamespace(messages=SimpleNamespace(batches=batches))
+
+
+def _request(custom_id: str) -> dict:
+    return {"custom_id": custom_id, "params": {"model": "m", "max_tokens": 1, "messages": []}}
+
+
+async def test_run_message_batch_returns_succeeded_texts():
+    batches = FakeBatches({"a": "first", "b": None, "c": "third"}, polls=2)
+    requests = [_request("a"), _request("b"), _request("c")]
+
+    responses = await _anthropic.run_message_batch(
+        _client(batches), requests, poll_interval=0, max_wait=60
+    )
+
+    assert responses == {"a": "first", "c": "third"}
+    assert [r["custom_id"] for r in batches.submitted] == ["a", "b", "c"]
+    assert not batches.cancelled
+
+
+async def test_run_message_batch_cancels_after_max_wait():
+    batches = FakeBatches({"a": "first"}, polls=1000)
+
+    responses = await _anthropic.run_message_batch(
+        _client(batches), [_request("a")], poll_interval=0, max_wait=0
+    )
+
+    assert responses == {}
+    assert batches.cancelled == ["batch-1"]
+
+
+async def test_run_message_batch_skips_empty_submissions():
+    batches = FakeBatches({})
+
+    assert await _anthropic.run_message_batch(_client(batches), [], 0, 0) == {}
+    assert batches.submitted == []
+
+
+async def test_run_message_batch_errors_leave_everything_to_fallback():
+    async def create(requests):
+        raise RuntimeError("boom")
+
+    client = SimpleNamespace(messages=SimpleNamespace(batches=SimpleNamespace(create=create)))
+
+    assert await _anthropic.run_message_batch(client, [_request("a")], 0, 60) == {}
@@ -0,0 +1,76 @@
+"""Tests for the MCP bridge's background response reader."""
+
+import asyncio
+from types import SimpleNamespace
+
+import orjson
+import pytest
+
+from src.mcp.bridge import MCPToolBridge
+
+# Small enough that a few hundred bytes is an "oversized" response
+STREAM_LIMIT = 64
+
+
+def _bridge(*lines: bytes) -> MCPToolBridge:
+    """A bridge whose server has written the given lines and closed stdout."""
+    stdout = asyncio.StreamReader(limit=STREAM_LIMIT)
+    for line in lines:
+        stdout.feed_data(line)
+    stdout.feed_eof()
+    bridge = MCPToolBridge("/nonexistent")
+    bridge.process = SimpleNamespace(stdout=stdout)
+    return bridge
+
+
+def _pending(bridge: MCPToolBridge, *request_ids: int) -> list[asyncio.Future]:
+    loop = asyncio.get_running_loop()
+    futures = [loop.create_future() for _ in request_ids]
+    bridge._pending.update(zip(request_ids, futures))
+    return futures
+
+
+def _response(request_id: int, **result) -> bytes:
+    return orjson.dumps({"jsonrpc": "2.0", "id": request_id, "result": result}) + b"\n"
+
+
+async def test_responses_are_dispatched_by_id():
+    bridge = _bridge(
+        _response(2, value="second"),
+        b"server log line, not JSON-RPC\n",
+        _response(1, value="first"),
+    )
+    first, second = _pending(bridge, 1, 2)
+
+    await bridge._read_loop()
+
+    assert first.result()["result"] == {"value": "first"}
+    assert second.result()["result"] == {"value": "second"}
+    assert bridge._pending == {}
+
+
+async def test_closed_stdout_fails_requests_still_waiting():
+    bridge = _bridge(_response(1, value="first"))
+    first, unanswered = _pending(bridge, 1, 2)
+
+    await bridge._read_loop()
+
+    assert first.result()["result"] == {"value": "first"}
+    with pytest.raises(RuntimeError, match="No response"):
+        unanswered.result()
+
+
+@pytest.mark.parametrize("id_first", [True, False])
+async def test_oversized_response_fails_only_its_request(id_first):
+    big = {"text": "x" * (STREAM_LIMIT * 10)}
+    fields = {"id": 1, "result": big} if id_first else {"result": big, "id": 1}
+    oversized = orjson.dumps({"jsonrpc": "2.0", **fields}) + b"\n"
+    bridge = _bridge(oversized, _response(2, value="after"))
+    too_big, after = _pending(bridge, 1, 2)
+
+    await bridge._read_loop()
+
+    with pytest.raises(RuntimeError, match="exceeded"):
+        too_big.result()
+    # The reader resynchronizes on the next line
+    assert after.result()["result"] == {"value": "after"}
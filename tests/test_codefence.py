@@ -0,0 +1,25 @@
+"""Tests for markdown code-fence stripping."""
+
+import pytest
+
+from src.pipeline._codefence import strip_codefence
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ('```json\n{"a": 1}\n```', '{"a": 1}'),
+        ('```\n{"a": 1}\n```', '{"a": 1}'),
+        ('  \n```python\nprint(1)\n```\n  ', "print(1)"),
+        # Cut off at max_tokens: no closing fence
+        ('```json\n{"a": 1', '{"a": 1'),
+        # Not fenced: only surrounding whitespace goes
+        ('  {"a": 1}\n', '{"a": 1}'),
+        # A fence inside the text isn't a wrapper
+        ("Intro\n```\ncode\n```", "Intro\n```\ncode\n```"),
+        # Inner fences of a fenced markdown file are kept
+        ("```md\n# Title\n```sh\nls\n```\n```", "# Title\n```sh\nls\n```"),
+    ],
+)
+def test_strip_codefence(text, expected):
+    assert strip_codefence(text) == expected
@@ -0,0 +1,30 @@
+"""Tests for running several ideas' pipelines at once."""
+
+import asyncio
+
+from src.pipeline.orchestrator import PipelineOrchestrator, PipelineResult
+
+
+async def test_run_full_pipelines_is_bounded_and_isolates_failures(monkeypatch):
+    in_flight = peak = 0
+
+    async def run_full_pipeline(self, idea_id):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if idea_id == "bad":
+            raise RuntimeError("stage crashed")
+        return PipelineResult(success=True, message=idea_id)
+
+    monkeypatch.setattr(PipelineOrchestrator, "run_full_pipeline", run_full_pipeline)
+    orchestrator = PipelineOrchestrator(repository=None)
+
+    idea_ids = ["a", "b", "bad", "c", "d"]
+    results = await orchestrator.run_full_pipelines(idea_ids, max_concurrency=2)
+
+    assert peak == 2
+    assert [r.success for r in results] == [True, True, False, True, True]
+    assert [r.message for r in results if r.success] == ["a", "b", "c", "d"]
+    assert "stage crashed" in results[2].message
@@ -0,0 +1,130 @@
+"""Tests for the adaptive Anthropic concurrency limiter."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import anthropic
+import httpx
+import pytest
+
+from src.pipeline._ratelimit import AdaptiveSemaphore
+
+
+def _rate_limit_error(retry_after: str | None = None) -> anthropic.RateLimitError:
+    headers = {"retry-after": retry_after} if retry_after is not None else {}
+    response = httpx.Response(
+        429, headers=headers, request=httpx.Request("POST", "https://api.anthropic.com")
+    )
+    return anthropic.RateLimitError("rate limited", response=response, body=None)
+
+
+async def test_limit_grows_additively_on_fast_successes():
+    limiter = AdaptiveSemaphore(initial_limit=2, max_limit=3)
+
+    async def ok():
+        return "ok"
+
+    # +1/limit per success: 2 -> 2.5 -> 2.9 -> 3
+    assert await limiter.call(ok) == "ok"
+    await limiter.call(ok)
+    assert limiter.limit == 2
+    await limiter.call(ok)
+    assert limiter.limit == 3
+
+    for _ in range(10):
+        await limiter.call(ok)
+    assert limiter.limit == 3
+
+
+async def test_limit_halves_on_throttling_but_not_below_min():
+    limiter = AdaptiveSemaphore(initial_limit=8, min_limit=2)
+
+    async def throttled():
+        raise _rate_limit_error()
+
+    with pytest.raises(anthropic.RateLimitError):
+        await limiter.call(throttled)
+    assert limiter.limit == 4
+
+    for _ in range(3):
+        with pytest.raises(anthropic.RateLimitError):
+            await limiter.call(throttled)
+    assert limiter.limit == 2
+
+
+async def test_other_errors_leave_the_limit_alone():
+    limiter = AdaptiveSemaphore(initial_limit=4)
+
+    async def broken():
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        await limiter.call(broken)
+    assert limiter.limit == 4
+
+
+async def test_concurrent_calls_are_capped_at_the_limit():
+    limiter = AdaptiveSemaphore(initial_limit=2, max_limit=2)
+    in_flight = peak = 0
+
+    async def slow():
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+
+    await asyncio.gather(*(limiter.call(slow) for _ in range(6)))
+    assert peak == 2
+
+
+async def test_retry_after_pauses_new_calls(monkeypatch):
+    limiter = AdaptiveSemaphore()
+    sleeps = []
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+
+    async def throttled():
+        raise _rate_limit_error(retry_after="5")
+
+    async def ok():
+        return "ok"
+
+    with pytest.raises(anthropic.RateLimitError):
+        await limiter.call(throttled)
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+    await limiter.call(ok)
+
+    assert len(sleeps) == 1
+    assert 4 < sleeps[0] <= 5
+
+
+async def test_observe_headers_pauses_when_few_requests_remain(monkeypatch):
+    limiter = AdaptiveSemaphore()
+    reset = (datetime.now(timezone.utc) + timedelta(seconds=30)).isoformat()
+    sleeps = []
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+
+    async def ok():
+        return "ok"
+
+    # Plenty left: no pause
+    limiter.observe_headers({
+        "anthropic-ratelimit-requests-remaining": "500",
+        "anthropic-ratelimit-requests-limit": "1000",
+        "anthropic-ratelimit-requests-reset": reset,
+    })
+    # Under 10% of the window left: pause until it resets
+    limiter.observe_headers({
+        "anthropic-ratelimit-requests-remaining": "50",
+        "anthropic-ratelimit-requests-limit": "1000",
+        "anthropic-ratelimit-requests-reset": reset,
+    })
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+    await limiter.call(ok)
+
+    assert len(sleeps) == 1
+    assert 25 < sleeps[0] <= 30
@@ -0,0 +1,137 @@
+"""Tests for Repository transactions and result round-trips."""
+
+import asyncio
+
+import pytest
+
+from src.core.models import (
+    ArchitecturePattern,
+    CompletionGap,
+    FileAnalysis,
+    FileModification,
+    IdeaInput,
+    NewFileSpec,
+    ProjectAnalysisOutput,
+    ReviewDecision,
+    ScaffoldingOutput,
+    Stage,
+    Status,
+)
+from src.db.repository import Repository
+
+
+@pytest.fixture
+async def repo(tmp_path):
+    repository = Repository(tmp_path / "test.db")
+    await repository.connect()
+    yield repository
+    await repository.close()
+
+
+@pytest.fixture
+async def idea(repo):
+    return await repo.create_idea(IdeaInput(title="Test idea", raw_content="An idea for tests"))
+
+
+async def test_transaction_commits_all_writes_together(repo, idea):
+    async with repo.transaction():
+        await repo.save_review(idea.id, Stage.HUMAN_REVIEW, ReviewDecision.DEFER)
+        await repo.update_idea_state(idea.id, Stage.ENRICHMENT, Status.PROCESSING)
+
+    assert len(await repo.get_reviews(idea.id)) == 1
+    assert (await repo.get_idea(idea.id)).current_stage == Stage.ENRICHMENT
+
+
+async def test_transaction_rolls_back_when_the_block_raises(repo, idea):
+    with pytest.raises(RuntimeError):
+        async with repo.transaction():
+            await repo.save_review(idea.id, Stage.HUMAN_REVIEW, ReviewDecision.REJECT)
+            await repo.update_idea_state(idea.id, Stage.ENRICHMENT, Status.PROCESSING)
+            raise RuntimeError("boom")
+
+    assert await repo.get_reviews(idea.id) == []
+    assert (await repo.get_idea(idea.id)).current_stage == idea.current_stage
+
+    # The connection is usable again afterwards
+    await repo.save_review(idea.id, Stage.HUMAN_REVIEW, ReviewDecision.DEFER)
+    assert len(await repo.get_reviews(idea.id)) == 1
+
+
+async def test_other_tasks_writes_wait_for_the_transaction(repo, idea):
+    order = []
+
+    async def other_write():
+        await repo.update_idea_state(idea.id, Stage.EVALUATION, Status.PROCESSING)
+        order.append("other")
+
+    async with repo.transaction():
+        task = asyncio.create_task(other_write())
+        await asyncio.sleep(0.05)
+        await repo.update_idea_state(idea.id, Stage.ENRICHMENT, Status.PROCESSING)
+        order.append("transaction")
+    await task
+
+    assert order == ["transaction", "other"]
+    assert (await repo.get_idea(idea.id)).current_stage == Stage.EVALUATION
+
+
+@pytest.mark.parametrize(
+    "output",
+    [
+        ProjectAnalysisOutput(project_name="proj", detected_tech_stack=["Python"], total_files=3),
+        ProjectAnalysisOutput(
+            project_name="proj",
+            detected_tech_stack=["Python", "FastAPI"],
+            detected_patterns=[ArchitecturePattern(pattern_name="MVC", confidence=0.8)],
+            total_files=12,
+            key_files=[FileAnalysis(path="app.py", language="python", purpose="entry point")],
+            entry_points=["app.py"],
+            completion_gaps=[
+                CompletionGap(
+                    gap_type="broken_test",
+                    description="Failing tests",
+                    location="tests/",
+                    priority="high",
+                    estimated_effort="medium",
+                )
+            ],
+            completeness_score=0.6,
+            readme_summary="A project",
+        ),
+    ],
+)
+async def test_project_analysis_round_trips(repo, idea, output):
+    saved = await repo.save_project_analysis(idea.id, output)
+
+    assert await repo.get_project_analysis(idea.id) == saved
+    assert await repo.get_project_analysis("missing") is None
+
+
+@pytest.mark.parametrize(
+    "output",
+    [
+        ScaffoldingOutput(
+            blueprint_content="# Blueprint",
+            project_structure={"src": ["main.py"], "tests": []},
+            tech_stack=["Python"],
+            estimated_hours=4,
+        ),
+        ScaffoldingOutput(
+            blueprint_content="# Changes",
+            project_structure={"src": ["new.py"]},
+            tech_stack=["TypeScript"],
+            file_modifications=[
+                FileModification(
+                    file_path="app.ts", modification_type="patch", content="diff", rationale="r"
+                )
+            ],
+            new_files=[NewFileSpec(file_path="new.ts", purpose="helper")],
+            preserved_files=["legacy.ts"],
+        ),
+    ],
+)
+async def test_scaffolding_round_trips(repo, idea, output):
+    saved = await repo.save_scaffolding(idea.id, output)
+
+    assert await repo.get_scaffolding(idea.id) == saved
+    assert await repo.get_scaffolding("missing") is None
@@ -0,0 +1,78 @@
+"""Tests for the streaming multipart writer behind zip uploads."""
+
+import io
+import zipfile
+
+from src.integrations.s3_storage import _PartUploader
+
+
+class FakeS3:
+    """Records upload_part bodies in order."""
+
+    def __init__(self) -> None:
+        self.bodies: list[bytes] = []
+
+    def upload_part(self, Bucket, Key, PartNumber, UploadId, Body):
+        assert (Bucket, Key, UploadId) == ("bucket", "builds/a.zip", "upload-1")
+        assert PartNumber == len(self.bodies) + 1
+        self.bodies.append(Body)
+        return {"ETag": f'"etag-{PartNumber}"'}
+
+
+def _uploader(client: FakeS3, part_size: int) -> _PartUploader:
+    return _PartUploader(client, "bucket", "builds/a.zip", "upload-1", part_size)
+
+
+def test_writes_are_shipped_in_part_size_chunks():
+    client = FakeS3()
+    uploader = _uploader(client, part_size=4)
+
+    assert uploader.write(b"abc") == 3
+    assert client.bodies == []
+    uploader.write(b"defghij")
+    assert client.bodies == [b"abcd", b"efgh"]
+    assert uploader.tell() == 10
+
+    uploader.flush_final()
+    assert client.bodies == [b"abcd", b"efgh", b"ij"]
+    assert uploader.parts == [
+        {"PartNumber": 1, "ETag": '"etag-1"'},
+        {"PartNumber": 2, "ETag": '"etag-2"'},
+        {"PartNumber": 3, "ETag": '"etag-3"'},
+    ]
+
+
+def test_flush_final_skips_an_empty_trailing_part():
+    client = FakeS3()
+    uploader = _uploader(client, part_size=4)
+
+    uploader.write(b"abcd")
+    uploader.flush_final()
+
+    assert client.bodies == [b"abcd"]
+
+
+def test_flush_final_uploads_one_part_for_an_empty_stream():
+    # CompleteMultipartUpload needs at least one part
+    client = FakeS3()
+    uploader = _uploader(client, part_size=4)
+
+    uploader.flush_final()
+
+    assert client.bodies == [b""]
+
+
+def test_zip_written_through_the_uploader_is_valid():
+    client = FakeS3()
+    uploader = _uploader(client, part_size=64)
+
+    with zipfile.ZipFile(uploader, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("src/main.py", "print('hello')\n" * 50)
+        zf.writestr("README.md", "# Project\n")
+    uploader.flush_final()
+
+    assert len(client.bodies) > 1
+    with zipfile.ZipFile(io.BytesIO(b"".join(client.bodies))) as zf:
+        assert zf.testzip() is None
+        assert zf.read("README.md") == b"# Project\n"
+        assert zf.read("src/main.py") == b"print('hello')\n" * 50
@@ -0,0 +1,124 @@
+"""Tests for the scaffolding stage's local (no-network) logic."""
+
+from datetime import datetime
+
+import orjson
+import pytest
+
+from src.core.models import EnrichmentResult, Idea, ProjectMode, Stage, Status
+from src.pipeline import scaffolding
+
+NOW = datetime(2026, 1, 1)
+
+BLUEPRINT = """# Project
+
+## Architecture overview
+Click the button to start. React quickly to events; Unity of design matters.
+
+## Tech Stack Choices
+{stack}
+
+## Implementation phases
+Ship the {later} version later.
+"""
+
+
+def _idea(idea_id: str, tech_stack: list[str] | None = None) -> Idea:
+    return Idea(
+        id=idea_id,
+        title="Test idea",
+        raw_content="An idea used by the tests",
+        tags=[],
+        current_stage=Stage.SCAFFOLDING,
+        current_status=Status.PROCESSING,
+        submitted_at=NOW,
+        updated_at=NOW,
+        mode=ProjectMode.NEW,
+        preferred_tech_stack=tech_stack,
+    )
+
+
+def _enrichment(idea_id: str) -> EnrichmentResult:
+    return EnrichmentResult(
+        idea_id=idea_id,
+        enhanced_title="Test idea",
+        enhanced_description="An idea used by the tests",
+        problem_statement="Testing",
+        potential_solutions=[],
+        market_context="None",
+        enriched_at=NOW,
+        enriched_by="test",
+    )
+
+
+async def test_scaffold_ideas_batch_falls_back_to_live_for_missing_results(monkeypatch):
+    combined = orjson.dumps({
+        "blueprint": "# Blueprint",
+        "tech_stack": {"primary_language": "Go", "tech_stack": ["Go"], "reasoning": "r"},
+        "structure": {"src": ["main.go"], "estimated_hours": 6},
+    }).decode()
+    submitted = {}
+
+    async def run_message_batch(client, requests, poll_interval, max_wait):
+        submitted.update((r["custom_id"], r["params"]) for r in requests)
+        # The second idea's request errored, so it isn't in the results
+        return {"new-0": combined}
+
+    live = []
+
+    async def scaffold_idea(idea, enrichment, evaluation, analysis=None):
+        live.append(idea.id)
+        return "live output"
+
+    monkeypatch.setattr(scaffolding, "_client", lambda: None)
+    monkeypatch.setattr(scaffolding, "run_message_batch", run_message_batch)
+    monkeypatch.setattr(scaffolding, "scaffold_idea", scaffold_idea)
+
+    items = [
+        (_idea("a"), _enrichment("a"), None, None),
+        (_idea("b", ["Rust"]), _enrichment("b"), None, None),
+    ]
+    outputs = await scaffolding.scaffold_ideas_batch(items)
+
+    assert list(submitted) == ["new-0", "new-1"]
+    assert submitted["new-0"]["model"] == scaffolding.SCAFFOLDING_MODEL
+    assert outputs[0].blueprint_content == "# Blueprint"
+    assert outputs[0].tech_stack == ["Go"]
+    assert outputs[0].project_structure["src"] == ["main.go"]
+    assert outputs[0].estimated_hours == 6
+    assert outputs[1] == "live output"
+    assert live == ["b"]
+
+
+def test_heuristic_tech_stack_reads_the_tech_stack_section():
+    blueprint = BLUEPRINT.format(stack="- FastAPI for the API\n- pandas for reports", later="Go")
+
+    decision = scaffolding._heuristic_tech_stack(blueprint)
+
+    assert decision["primary_language"] == "Python"
+    assert decision["tech_stack"] == ["Python 3.11+", "pytest", "FastAPI", "pandas"]
+
+
+def test_heuristic_tech_stack_aliases_and_dedupes_names():
+    blueprint = BLUEPRINT.format(stack="Golang with Cobra; Golang again", later="Go")
+
+    decision = scaffolding._heuristic_tech_stack(blueprint)
+
+    assert decision["tech_stack"] == ["Go", "Cobra"]
+
+
+@pytest.mark.parametrize(
+    "blueprint",
+    [
+        # Only sentence-initial prose outside the section
+        BLUEPRINT.format(stack="To be decided.", later="Rust"),
+        # Frameworks from two languages
+        BLUEPRINT.format(stack="FastAPI backend, React frontend", later="Go"),
+        # Lower-case prose doesn't count
+        BLUEPRINT.format(stack="react to clicks quickly", later="Go"),
+        # No tech stack section at all
+        "# Project\n\nA FastAPI service.\n",
+    ],
+)
+def test_heuristic_tech_stack_defers_when_unclear(blueprint):
+    assert scaffolding._heuristic_tech_stack(blueprint) is None